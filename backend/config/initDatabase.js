@@ -205,6 +205,8 @@ async function initializeDatabaseSchema(db) {
             proj_pts REAL,
             sos_season REAL,
             sos_playoffs REAL,
+            scoring_format TEXT NOT NULL DEFAULT 'half',
+            player_id TEXT,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
           )
         `);
@@ -4,19 +4,25 @@
  */
 
 const logger = require('../utils/logger');
+const { ROS_RANKINGS } = require('../utils/constants');
 
 /**
- * Get ROS rankings
+ * Get ROS rankings for one scoring format (?format=standard|half|ppr)
  */
 async function getRankings(req, res, next) {
   try {
     const { allAsync, getAsync } = req.db;
+    const scoringFormat = req.query.format || ROS_RANKINGS.DEFAULT_SCORING_FORMAT;
 
     const [rows, lastUpdatedRow] = await Promise.all([
       allAsync(
-        'SELECT player_name, team, position, proj_pts, sos_season, sos_playoffs FROM ros_rankings ORDER BY player_name'
+        'SELECT player_name, player_id, team, position, proj_pts, sos_season, sos_playoffs FROM ros_rankings WHERE scoring_format = ? ORDER BY player_name',
+        [scoringFormat]
       ),
-      getAsync('SELECT MAX(updated_at) AS last_updated FROM ros_rankings')
+      getAsync(
+        'SELECT MAX(updated_at) AS last_updated FROM ros_rankings WHERE scoring_format = ?',
+        [scoringFormat]
+      )
     ]);
 
     const normalizeSqliteTimestamp = (value) => {
@@ -31,7 +37,7 @@ async function getRankings(req, res, next) {
     };
 
     const lastUpdated = normalizeSqliteTimestamp(lastUpdatedRow?.last_updated);
-    res.json({ rankings: rows, lastUpdated });
+    res.json({ rankings: rows, lastUpdated, scoringFormat });
   } catch (error) {
     logger.error('Error fetching ROS rankings', { error: error.message });
     next(error);
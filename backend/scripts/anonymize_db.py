@@ -1,10 +1,21 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import hmac
+import json
+import math
+import pathlib
+import re
 import sqlite3
-import shutil
-from faker import Faker
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from faker.providers.lorem.en_US import Provider as LoremProvider
+from faker.providers.person.en_US import Provider as PersonProvider
 import os
 import datetime
 
-def ensure_current_year_data(conn, cursor, fake):
+def ensure_current_year_data(conn, cursor, pseudonyms):
     """
     Ensures that data exists for the current year to make E2E tests pass.
     It copies the most recent year's league settings and team seasons.
@@ -27,7 +38,7 @@ def ensure_current_year_data(conn, cursor, fake):
         return
     last_year = last_year_row[0]
 
-    new_league_id = str(fake.random_number(digits=10, fix_len=True))
+    new_league_id = pseudonyms.value('digits:10', 'league_settings.league_id', current_year)
     
     try:
         cursor.execute("INSERT INTO league_settings (year, league_id, sync_status) VALUES (?, ?, ?)", 
@@ -73,113 +84,692 @@ def ensure_current_year_data(conn, cursor, fake):
     print(f"Copied {len(last_year_seasons)} team seasons from {last_season_year} to {current_year}.")
 
 
-def anonymize_db(db_path):
+# Bookkeeping tables that let an interrupted chunked run resume; all of
+# them are dropped once a run completes
+PROGRESS_TABLE = '_anonymize_progress'
+MAP_TABLE_PREFIX = '_anonymize_map_'
+# Map values still to replace are assigned this many at a time, in digest
+# order, so building a map of millions of values keeps memory flat
+MAP_BATCH = 10000
+# Chunk size --workers falls back to, so parallel runs never read a whole
+# table's rowids at once
+PARALLEL_CHUNK_SIZE = 10000
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'anonymize_rules.json')
+# Pages copied per online backup step; the source's read lock is let go
+# between steps (1024 pages is 4 MB at the default page size)
+SNAPSHOT_PAGES = 1024
+
+STRATEGIES = ('fake', 'hash', 'null', 'consistent-map', 'delete')
+# Column names that look like PII; a table column matching this without a
+# rule is reported so the rules file can be kept in step with the schema
+PII_COLUMN_RE = re.compile(r'email|passcode|password|phone|token|note|full_name|username|user_id|voter|manager_id|proposed_by')
+
+
+class Pool:
+    """
+    Every combination of one item from each part, e.g. a first and a last
+    name. Value ``i`` is rendered from the digits of ``i`` in the parts'
+    mixed radix, so a pool of millions is never materialized.
+    """
+
+    def __init__(self, render, *parts):
+        self.render = render
+        self.parts = parts
+        self.size = math.prod(len(part) for part in parts)
+
+    def __getitem__(self, index):
+        items = []
+        for part in reversed(self.parts):
+            index, digit = divmod(index, len(part))
+            items.append(part[digit])
+        return self.render(*reversed(items))
+
+
+FIRST_NAMES = tuple(PersonProvider.first_names)
+LAST_NAMES = tuple(PersonProvider.last_names)
+WORDS = tuple(LoremProvider.word_list)
+POOLS = {
+    'name': Pool('{} {}'.format, FIRST_NAMES, LAST_NAMES),
+    'user_name': Pool(
+        lambda first, last, n: f"{first}{last}{n:02d}".lower(), FIRST_NAMES, LAST_NAMES, range(100)
+    ),
+    'email': Pool(
+        lambda first, last, n: f"{first}.{last}{n:02d}@example.com".lower(),
+        FIRST_NAMES, LAST_NAMES, range(100),
+    ),
+    'word': Pool(str, WORDS),
+    'team_name': Pool(
+        lambda a, b, n: f"{a.capitalize()} {b.capitalize()} {n}", WORDS, WORDS, range(1, 100)
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_pool(kind):
+    """
+    The pool for a fake ``kind``: a POOLS key or "digits:N".
+    """
+    if kind.startswith('digits:'):
+        digits = int(kind.split(':', 1)[1])
+        return Pool(str, range(10 ** (digits - 1), 10 ** digits))
+    return POOLS[kind]
+
+
+def _check_fake_kind(kind, where):
+    digits = kind.split(':', 1)[1] if kind.startswith('digits:') else ''
+    if digits.isdigit() and int(digits) > 0:
+        return
+    if kind not in POOLS:
+        raise ValueError(f"{where}: unknown fake kind {kind!r}")
+
+
+class Pseudonymizer:
+    """
+    Keyed, deterministic replacements. An HMAC-SHA256 under ``key`` of a
+    context (the column or map) and the original value with its type picks
+    a slot in the kind's pool, so a value costs one HMAC and some integer
+    arithmetic, the same input and key always give the same output, and 1
+    and '1' are told apart.
+    """
+
+    def __init__(self, key):
+        self.key = key if isinstance(key, bytes) else key.encode()
+        self._mac = hmac.new(self.key, digestmod=hashlib.sha256)
+
+    def digest(self, context, value):
+        mac = self._mac.copy()
+        mac.update(f"{context}\0{type(value).__name__}\0{value}".encode())
+        return mac.digest()
+
+    def slot(self, digest, pool):
+        return int.from_bytes(digest[:8], 'big') % pool.size
+
+    def hash(self, value):
+        if value is None:
+            return None
+        return self.digest('hash', value).hex()[:16]
+
+    def value(self, kind, context, value):
+        """
+        Replacement for ``value`` from the ``kind`` pool; NULL stays NULL.
+        Different values may share a replacement unless the pool is as
+        large as the slot range, so identifiers go through assign().
+        """
+        if value is None:
+            return None
+        pool = get_pool(kind)
+        return pool[self.slot(self.digest(context, value), pool)]
+
+    def assign(self, kind, context, values, taken):
+        """
+        Collision-free replacements for ``values``, none of them in
+        ``taken`` (which is updated). Each value takes its HMAC slot and
+        only steps to the next slot when that one is taken; values are
+        placed in digest order, so the result depends on the key and the
+        set of values, not on the order rows are read.
+        """
+        pool = get_pool(kind)
+        if len(taken) + len(values) > pool.size:
+            raise ValueError(f"the {kind!r} pool has only {pool.size} values")
+        replacements = {}
+        for digest, value in sorted((self.digest(context, value), value) for value in values):
+            slot = self.slot(digest, pool)
+            while pool[slot] in taken:
+                slot = (slot + 1) % pool.size
+            replacements[value] = pool[slot]
+            taken.add(pool[slot])
+        return replacements
+
+
+def load_rules(path=DEFAULT_RULES):
+    """
+    Reads and validates a rules file mapping each table to "delete" or to
+    {column: rule}. A rule is a strategy name ("null", "hash") or an object
+    {"strategy": ..., "fake": kind, "map": name}; every consistent-map names
+    the map it shares, and one column per map says which fake kind fills it.
+    "hash" is a one-way digest keyed like every other replacement.
+    Returns {table: "delete" | {column: {"strategy": ..., ...}}}.
+    """
+    with open(path) as f:
+        raw = json.load(f)
+
+    rules = {}
+    map_kinds = {}
+    for table, table_rules in raw.items():
+        if table_rules == 'delete':
+            rules[table] = 'delete'
+            continue
+        if not isinstance(table_rules, dict):
+            raise ValueError(f"{table}: expected \"delete\" or an object of column rules")
+        rules[table] = {}
+        for column, rule in table_rules.items():
+            where = f"{table}.{column}"
+            rule = {'strategy': rule} if isinstance(rule, str) else dict(rule)
+            strategy = rule.get('strategy')
+            if strategy not in STRATEGIES or strategy == 'delete':
+                raise ValueError(f"{where}: unknown strategy {strategy!r}")
+            if strategy == 'fake':
+                _check_fake_kind(rule.get('fake', ''), where)
+            if strategy == 'consistent-map':
+                if not rule.get('map'):
+                    raise ValueError(f"{where}: consistent-map needs a \"map\" name")
+                if rule.get('fake'):
+                    _check_fake_kind(rule['fake'], where)
+                    map_kinds[rule['map']] = rule['fake']
+            rules[table][column] = rule
+
+    # Every column of a map carries its kind, so the map can be built
+    # even when the column that named the kind is missing from the schema
+    for table_rules in rules.values():
+        if table_rules == 'delete':
+            continue
+        for column, rule in table_rules.items():
+            if rule['strategy'] != 'consistent-map':
+                continue
+            if rule['map'] not in map_kinds:
+                raise ValueError(f"map {rule['map']!r} has no column giving its fake kind")
+            rule['fake'] = map_kinds[rule['map']]
+    return rules
+
+
+def table_columns(cursor, table):
+    """
+    Column names of ``table``, or an empty list when it does not exist.
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def plan_anonymization(cursor, rules):
+    """
+    Matches the rules against the live schema. Rules for missing tables or
+    columns are skipped, and PII-looking columns without a rule are
+    reported. Returns (deletes, updates, maps): tables to empty,
+    {table: {column: rule}} to rewrite, and {map: {"fake": kind,
+    "sources": [(table, column)]}} to build first.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = [name for (name,) in cursor.fetchall() if not name.startswith(('sqlite_', '_anonymize'))]
+
+    deletes, updates, maps = [], {}, {}
+    for table, table_rules in rules.items():
+        columns = table_columns(cursor, table)
+        if not columns:
+            print(f"  Table '{table}' does not exist, skipping.")
+            continue
+        if table_rules == 'delete':
+            deletes.append(table)
+            continue
+        for column, rule in table_rules.items():
+            if column not in columns:
+                print(f"  Column '{table}.{column}' does not exist, skipping.")
+                continue
+            updates.setdefault(table, {})[column] = rule
+            if rule['strategy'] == 'consistent-map':
+                spec = maps.setdefault(rule['map'], {'fake': rule['fake'], 'sources': []})
+                spec['sources'].append((table, column))
+
+    for table in tables:
+        if table in deletes:
+            continue
+        covered = updates.get(table, {})
+        for column in table_columns(cursor, table):
+            if column not in covered and PII_COLUMN_RE.search(column):
+                print(f"  [WARNING] '{table}.{column}' looks like PII but has no rule.")
+    return deletes, updates, maps
+
+
+def iter_rowid_chunks(cursor, table, chunk_size, after=0):
+    """
+    Yields ascending lists of at most ``chunk_size`` rowids from ``table``,
+    starting after rowid ``after``; everything at once without a chunk size.
+    """
+    limit = chunk_size or -1
+    while True:
+        cursor.execute(
+            f"SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?", (after, limit)
+        )
+        rowids = [rowid for (rowid,) in cursor.fetchall()]
+        if not rowids:
+            return
+        yield rowids
+        after = rowids[-1]
+
+
+def load_progress(cursor, step):
+    """
+    Returns (last_rowid, done) for a step of an earlier, interrupted run.
+    """
+    cursor.execute(f"SELECT last_rowid, done FROM {PROGRESS_TABLE} WHERE step = ?", (step,))
+    return cursor.fetchone() or (0, 0)
+
+
+def save_progress(cursor, step, last_rowid, done=False):
+    cursor.execute(f"""
+        INSERT INTO {PROGRESS_TABLE} (step, last_rowid, done) VALUES (?, ?, ?)
+        ON CONFLICT(step) DO UPDATE SET last_rowid = excluded.last_rowid, done = excluded.done
+    """, (step, last_rowid, int(done)))
+
+
+def rewrite_in_chunks(conn, table, chunk_size, apply_chunk, write_lock=None, commit=False):
+    """
+    Walks ``table`` by rowid, calling ``apply_chunk(cursor, rowids)`` and
+    recording a checkpoint under ``write_lock`` for each chunk. With a
+    chunk size (or ``commit``) every chunk is committed with its checkpoint,
+    so memory and journal size stay flat and a rerun resumes after the last
+    committed chunk. Returns the number of rows rewritten.
+    """
+    write_lock = write_lock or contextlib.nullcontext()
+    commit = commit or bool(chunk_size)
+    cursor = conn.cursor()
+    last_rowid, done = load_progress(cursor, table)
+    if done:
+        print(f"  '{table}' was finished by an earlier run, skipping.")
+        return 0
+    if last_rowid:
+        print(f"  Resuming '{table}' after rowid {last_rowid}.")
+
+    rewritten = 0
+    for rowids in iter_rowid_chunks(cursor, table, chunk_size, last_rowid):
+        with write_lock:
+            apply_chunk(cursor, rowids)
+            save_progress(cursor, table, rowids[-1])
+            if commit:
+                conn.commit()
+        rewritten += len(rowids)
+        last_rowid = rowids[-1]
+    with write_lock:
+        save_progress(cursor, table, last_rowid, done=True)
+        if commit:
+            conn.commit()
+    return rewritten
+
+
+def delete_in_chunks(conn, table, chunk_size, write_lock=None, commit=False):
+    """
+    Empties ``table``, ``chunk_size`` rows per committed transaction.
+    """
+    write_lock = write_lock or contextlib.nullcontext()
+    cursor = conn.cursor()
+    while True:
+        with write_lock:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} LIMIT ?)",
+                (chunk_size or -1,),
+            )
+            if commit or chunk_size:
+                conn.commit()
+        if not chunk_size or cursor.rowcount < chunk_size:
+            return
+
+
+class MapTaken:
+    """
+    The ``taken`` set assign() probes while filling a map table: every
+    original and replacement already in the table, looked up through its
+    indexes, plus the replacements of the batch not yet written back.
+    """
+
+    def __init__(self, cursor, map_table):
+        self.cursor = cursor
+        self.map_table = map_table
+        self.batch = set()
+
+    def __contains__(self, value):
+        if value in self.batch:
+            return True
+        # A replacement must not equal an original stored as a number either
+        number = int(value) if value.isdigit() else value
+        self.cursor.execute(
+            f"SELECT 1 FROM {self.map_table} WHERE new = ? OR old = ? OR old = ? LIMIT 1",
+            (value, value, number),
+        )
+        return self.cursor.fetchone() is not None
+
+    def __len__(self):
+        self.cursor.execute(f"SELECT COUNT(old) + COUNT(new) FROM {self.map_table}")
+        return self.cursor.fetchone()[0] + len(self.batch)
+
+    def add(self, value):
+        self.batch.add(value)
+
+
+def build_consistent_map(cursor, name, spec, pseudonyms, batch_size=MAP_BATCH):
+    """
+    Fills _anonymize_map_<name> with one replacement per distinct original
+    value found in any of the map's source columns. Replacements never
+    reuse an original or each other, so rewriting UNIQUE columns cannot
+    collide part way through. Originals are stored with their digest and
+    assigned ``batch_size`` at a time in digest order, which gives the
+    same map as assigning them all at once.
+    """
+    map_table = f"{MAP_TABLE_PREFIX}{name}"
+    context = f"map:{name}"
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {map_table} (old PRIMARY KEY, new UNIQUE, digest BLOB)")
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {map_table}_pending ON {map_table} (digest) WHERE new IS NULL"
+    )
+    for table, column in spec['sources']:
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {map_table} (old, digest)
+            SELECT DISTINCT {column}, anon_digest(?, {column}) FROM {table} WHERE {column} IS NOT NULL
+        """, (context,))
+
+    taken = MapTaken(cursor, map_table)
+    while True:
+        cursor.execute(
+            f"SELECT old FROM {map_table} WHERE new IS NULL ORDER BY digest LIMIT ?", (batch_size,)
+        )
+        pending = [old for (old,) in cursor.fetchall()]
+        if not pending:
+            break
+        replacements = pseudonyms.assign(spec['fake'], context, pending, taken)
+        cursor.executemany(
+            f"UPDATE {map_table} SET new = ? WHERE old = ?",
+            [(new, old) for old, new in replacements.items()],
+        )
+        taken.batch.clear()
+    cursor.execute(f"SELECT COUNT(*) FROM {map_table}")
+    return cursor.fetchone()[0]
+
+
+def rewrite_table(conn, table, columns, chunk_size, write_lock=None, commit=False):
+    """
+    Rewrites every rule-covered column of ``table`` with one UPDATE per
+    chunk: consistent-map columns look up their map's primary key, fake
+    and hash go through the anon_fake() and anon_hash() SQL functions and
+    null clears the column.
+    """
+    assignments = []
+    for column, rule in columns.items():
+        strategy = rule['strategy']
+        if strategy == 'null':
+            assignments.append(f"{column} = NULL")
+        elif strategy == 'hash':
+            assignments.append(f"{column} = anon_hash({column})")
+        elif strategy == 'consistent-map':
+            assignments.append(
+                f"{column} = COALESCE((SELECT m.new FROM {MAP_TABLE_PREFIX}{rule['map']} AS m "
+                f"WHERE m.old = {table}.{column}), {table}.{column})"
+            )
+        else:
+            assignments.append(f"{column} = anon_fake('{rule['fake']}', '{table}.{column}', {column})")
+    set_clause = ', '.join(assignments)
+
+    def apply_chunk(cursor, rowids):
+        cursor.execute(
+            f"UPDATE {table} SET {set_clause} WHERE rowid BETWEEN ? AND ?",
+            (rowids[0], rowids[-1]),
+        )
+
+    return rewrite_in_chunks(conn, table, chunk_size, apply_chunk, write_lock, commit)
+
+
+def connect(db_path, pseudonyms):
+    conn = sqlite3.connect(db_path, timeout=60, check_same_thread=False)
+    conn.create_function('anon_hash', 1, pseudonyms.hash, deterministic=True)
+    conn.create_function('anon_fake', 3, pseudonyms.value, deterministic=True)
+    conn.create_function('anon_digest', 2, pseudonyms.digest, deterministic=True)
+    return conn
+
+
+def anonymize_db(db_path, chunk_size=None, rules=None, workers=1, key=None):
     """
     Anonymizes a fantasy football database in-place by replacing PII with fake data.
+
+    Replacements are keyed pseudonyms (see Pseudonymizer): with the same
+    ``key`` the same source database always anonymizes to the same file,
+    byte for byte when run with one worker. Without a key a random one is
+    used and every run differs.
+
+    ``rules`` (default anonymize_rules.json, see load_rules) maps every
+    PII-bearing table and column to a strategy and is checked against the
+    live schema first. Consistent maps are built once, set-based, then each
+    table is rewritten by one UPDATE per chunk instead of one statement per
+    row.
+
+    Without ``chunk_size`` and with one worker everything runs in one
+    transaction. With ``chunk_size``, tables are walked by rowid that many
+    rows at a time and each chunk commits with a checkpoint, so memory stays
+    flat and an interrupted run picks up where it stopped when started
+    again. With ``workers`` > 1 tables are walked on their own connections,
+    but SQLite has a single writer, so every chunk is rewritten and
+    committed under one lock: only the rowid reads overlap, the writes
+    still run one after another. Parallel runs are always chunked, by
+    PARALLEL_CHUNK_SIZE unless ``chunk_size`` says otherwise. Returns True
+    once the changes are committed.
     """
-    fake = Faker()
     conn = None
-    
+    if workers > 1 and not chunk_size:
+        chunk_size = PARALLEL_CHUNK_SIZE
+
     try:
+        rules = load_rules(rules or DEFAULT_RULES)
+        if key is None:
+            print("No key given, using a random one: output will differ between runs.")
+        pseudonyms = Pseudonymizer(os.urandom(32) if key is None else key)
         print(f"Connecting to the database at {db_path}...")
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path, pseudonyms)
         cursor = conn.cursor()
         print("Database connection successful.")
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+                step TEXT PRIMARY KEY, last_rowid INTEGER NOT NULL, done INTEGER NOT NULL
+            )
+        """)
 
-        # --- Anonymize 'managers' table ---
-        print("Anonymizing 'managers' table...")
-        cursor.execute("SELECT id, name_id FROM managers")
-        managers = cursor.fetchall()
-        
-        name_id_map = {}
-        used_new_name_ids = set()
-
-        for manager_id, old_name_id in managers:
-            new_name_id = fake.user_name()
-            while new_name_id in used_new_name_ids:
-                new_name_id = fake.user_name()
-            used_new_name_ids.add(new_name_id)
-
-            name_id_map[old_name_id] = new_name_id
-
-            new_full_name = fake.name()
-            new_sleeper_username = fake.user_name()
-            new_sleeper_user_id = str(fake.random_number(digits=18, fix_len=True))
-            new_email = fake.email()
-            
-            cursor.execute("""
-                UPDATE managers
-                SET name_id = ?, full_name = ?, sleeper_username = ?,
-                    sleeper_user_id = ?, email = ?, passcode = NULL
-                WHERE id = ?
-            """, (new_name_id, new_full_name, new_sleeper_username, 
-                  new_sleeper_user_id, new_email, manager_id))
-
-        print("'managers' table anonymized.")
-
-        # --- Update 'team_seasons' with new name_ids ---
-        print("Updating 'name_id' in 'team_seasons' table...")
-        for old_name_id, new_name_id in name_id_map.items():
-            cursor.execute("UPDATE team_seasons SET name_id = ? WHERE name_id = ?", (new_name_id, old_name_id))
-        print("'team_seasons' name_ids updated.")
-
-        # --- Anonymize 'team_seasons' team names ---
-        print("Anonymizing 'team_seasons' team names...")
-        cursor.execute("SELECT id FROM team_seasons")
-        team_season_ids = cursor.fetchall()
-
-        for (season_id,) in team_season_ids:
-            new_team_name = f"{fake.word().capitalize()} {fake.word().capitalize()}"
-            cursor.execute("UPDATE team_seasons SET team_name = ? WHERE id = ?", (new_team_name, season_id))
-        
-        print("'team_seasons' team names anonymized.")
+        print("Planning anonymization from the rules...")
+        deletes, updates, maps = plan_anonymization(cursor, rules)
 
-        # --- Anonymize 'league_settings' table ---
-        print("Anonymizing 'league_settings' table...")
-        try:
-            cursor.execute("SELECT id FROM league_settings")
-            setting_ids = cursor.fetchall()
-            for (setting_id,) in setting_ids:
-                new_league_id = str(fake.random_number(digits=10, fix_len=True))
-                cursor.execute("UPDATE league_settings SET league_id = ? WHERE id = ?", (new_league_id, setting_id))
-            print("'league_settings' table anonymized.")
-        except sqlite3.OperationalError:
-            print("  Could not find 'league_settings' table, skipping.")
-        
-        # --- Clear sensitive tables ---
-        sensitive_tables = ['manager_emails', 'manager_credentials', 'previews', 'summaries']
-        for table in sensitive_tables:
-            try:
-                cursor.execute(f"DELETE FROM {table}")
-                print(f"Clearing '{table}' table...done.")
-            except sqlite3.OperationalError:
-                print(f"  Table '{table}' does not exist, skipping.")
+        # --- Build consistent maps before any source column is rewritten ---
+        for name, spec in maps.items():
+            step = f"map:{name}"
+            if load_progress(cursor, step)[1]:
+                print(f"  Map '{name}' was built by an earlier run, reusing it.")
+                continue
+            values = build_consistent_map(cursor, name, spec, pseudonyms)
+            save_progress(cursor, step, 0, done=True)
+            print(f"Built '{name}' map ({values} values).")
+        parallel = workers > 1
+        if chunk_size or parallel:
+            conn.commit()
+
+        # --- Rewrite and clear tables ---
+        def run_task(task_conn, kind, table, write_lock=None):
+            if kind == 'delete':
+                delete_in_chunks(task_conn, table, chunk_size, write_lock, commit=parallel)
+                return f"Clearing '{table}' table...done."
+            rows = rewrite_table(
+                task_conn, table, updates[table], chunk_size, write_lock, commit=parallel
+            )
+            return f"'{table}' table anonymized ({rows} rows)."
+
+        tasks = [('update', table) for table in updates] + [('delete', table) for table in deletes]
+        if not parallel:
+            for kind, table in tasks:
+                print(run_task(conn, kind, table))
+        else:
+            write_lock = threading.Lock()
+
+            def run_on_own_connection(kind, table):
+                task_conn = connect(db_path, pseudonyms)
+                try:
+                    return run_task(task_conn, kind, table, write_lock)
+                finally:
+                    task_conn.close()
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_on_own_connection, *task) for task in tasks]
+                for future in futures:
+                    print(future.result())
 
         # --- Ensure data for current year ---
-        ensure_current_year_data(conn, cursor, fake)
+        ensure_current_year_data(conn, cursor, pseudonyms)
 
+        for name in maps:
+            cursor.execute(f"DROP TABLE IF EXISTS {MAP_TABLE_PREFIX}{name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {PROGRESS_TABLE}")
         conn.commit()
         print("Database changes committed.")
+        return True
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
+        return False
     finally:
         if conn:
             conn.close()
             print("Database connection closed.")
 
+
+def connect_read_only(db_path, **kwargs):
+    uri = f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, **kwargs)
+
+
+def snapshot_db(source_path, snapshot_path, pages=SNAPSHOT_PAGES):
+    """
+    Copies ``source_path`` to ``snapshot_path`` with the SQLite online
+    backup API, ``pages`` pages per step. The source is opened read-only
+    and its read lock is released between steps, so the server keeps
+    reading and writing it; a write from another connection restarts the
+    copy, so the snapshot is always consistent. Returns the page count.
+    """
+    source = connect_read_only(source_path, timeout=60)
+    snapshot = sqlite3.connect(snapshot_path)
+    copied = 0
+
+    def progress(status, remaining, total):
+        nonlocal copied
+        copied = total
+        print(f"  Snapshot: {total - remaining}/{total} pages copied.")
+
+    try:
+        source.backup(snapshot, pages=pages, progress=progress)
+    finally:
+        snapshot.close()
+        source.close()
+    return copied
+
+
+def compact_db(db_path, output_path):
+    """
+    Writes a vacuumed copy of ``db_path`` to ``output_path``, which must
+    not exist yet; the pages freed by deleted tables are left behind.
+    """
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        conn.execute("VACUUM INTO ?", (output_path,))
+
+
+def has_progress(db_path):
+    with contextlib.closing(connect_read_only(db_path)) as conn:
+        return bool(table_columns(conn.cursor(), PROGRESS_TABLE))
+
+
+def anonymize_snapshot(source_path, output_path, compact=False, pages=SNAPSHOT_PAGES, **options):
+    """
+    Writes an anonymized copy of ``source_path`` to ``output_path`` without
+    modifying the source: an online snapshot is taken (see snapshot_db)
+    and anonymized with ``options`` passed to anonymize_db. With
+    ``compact`` the snapshot is a working file next to the output and the
+    output is its VACUUM INTO copy.
+
+    A working file left with a checkpoint by an interrupted chunked run is
+    resumed instead of snapshotted again. Returns True on success.
+    """
+    if os.path.realpath(source_path) == os.path.realpath(output_path):
+        raise ValueError("The output must not be the source database")
+    working_path = f"{output_path}.snapshot" if compact else output_path
+    if os.path.exists(working_path) and has_progress(working_path):
+        print(f"Resuming the interrupted run in {working_path}")
+    elif os.path.exists(output_path):
+        raise FileExistsError(f"{output_path} already exists")
+    else:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(working_path)
+        print(f"Taking an online snapshot of {source_path}...")
+        snapshot_db(source_path, working_path, pages)
+
+    if not anonymize_db(working_path, **options):
+        return False
+    if compact:
+        print(f"Compacting into {output_path}...")
+        compact_db(working_path, output_path)
+        os.remove(working_path)
+    return True
+
+
 if __name__ == '__main__':
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(project_root, 'data', 'fantasy_football.db')
+    parser = argparse.ArgumentParser(
+        description="Write an anonymized copy of a fantasy football database; the source is never modified"
+    )
+    parser.add_argument(
+        'db_path',
+        nargs='?',
+        default=os.path.join(project_root, 'data', 'fantasy_football.db'),
+        help="Database to snapshot (default: data/fantasy_football.db)",
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help="Anonymized database to write (default: <db_path without .db>.anonymized.db)",
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help="VACUUM INTO the output so the space of deleted tables is reclaimed",
+    )
+    parser.add_argument(
+        '--snapshot-pages',
+        type=int,
+        default=SNAPSHOT_PAGES,
+        help=f"Pages copied per online backup step (default: {SNAPSHOT_PAGES})",
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        help="Rewrite tables this many rows per committed, resumable chunk",
+    )
+    parser.add_argument(
+        '--rules',
+        default=DEFAULT_RULES,
+        help="JSON rules mapping tables and columns to strategies (default: anonymize_rules.json)",
+    )
+    parser.add_argument(
+        '--key',
+        default=os.environ.get('ANONYMIZE_KEY'),
+        help="Pseudonymization key; the same key always gives the same output "
+             "(default: $ANONYMIZE_KEY, else a random key per run)",
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Read tables on this many connections at once; writes still take "
+             f"turns on SQLite's single writer (implies --chunk-size {PARALLEL_CHUNK_SIZE} "
+             "unless given)",
+    )
+    args = parser.parse_args()
+    db_path = args.db_path
+    output_path = args.output or f"{os.path.splitext(db_path)[0]}.anonymized.db"
 
     if not os.path.exists(db_path):
         print(f"Error: Input database not found at {db_path}")
     else:
-        backup_path = db_path + '.bak'
-        print(f"Creating a backup of the database at {backup_path}")
-        shutil.copyfile(db_path, backup_path)
-        
         print("\nStarting anonymization process...")
-        anonymize_db(db_path)
-        print("\nAnonymization process complete.")
-
+        try:
+            done = anonymize_snapshot(
+                db_path,
+                output_path,
+                compact=args.compact,
+                pages=args.snapshot_pages,
+                chunk_size=args.chunk_size,
+                rules=args.rules,
+                workers=args.workers,
+                key=args.key,
+            )
+        except (ValueError, FileExistsError) as e:
+            print(f"Error: {e}")
+        else:
+            if done:
+                print(f"\nAnonymization process complete: {output_path}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Anonymize a seeded database with millions of team_seasons rows.
+
+A database with ``--managers`` managers and ``--rows`` team seasons is
+seeded once, then each mode anonymizes its own copy in a fresh process so
+peak RSS is measured per mode:
+
+    full       anonymize_db(path), one transaction over whole tables
+    chunked    anonymize_db(path, chunk_size=--chunk-size)
+    parallel   the chunked run on --workers connections
+
+Peak RSS and the largest rollback journal seen while the run was in
+progress are reported next to the wall time:
+
+    python -m backend.scripts.benchmarks.bench_anonymize --rows 2000000 --chunk-size 50000
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from backend.scripts import anonymize_db
+from backend.scripts.seed_test_db import create_tables
+
+
+def seed(db_path: Path, managers: int, rows: int) -> None:
+    with sqlite3.connect(db_path) as conn:
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_tables(conn.cursor())
+        conn.executemany(
+            "INSERT INTO managers (name_id, full_name, sleeper_username, sleeper_user_id, email) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"manager{i}", f"Manager {i}", f"user{i}", str(10**17 + i), f"m{i}@example.com")
+                for i in range(managers)
+            ),
+        )
+        # Years run past the present, so no seasons are copied forward
+        conn.executemany(
+            "INSERT INTO league_settings (year, league_id) VALUES (?, ?)",
+            ((year, str(10**9 + year)) for year in range(2000, 2000 + rows // managers + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO team_seasons (year, name_id, team_name, wins, losses) "
+            "VALUES (?, ?, ?, 7, 7)",
+            (
+                (2000 + i // managers, f"manager{i % managers}", f"Team {i}")
+                for i in range(rows)
+            ),
+        )
+
+
+def _run(db_path: str, chunk_size, workers, results) -> None:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        anonymize_db.anonymize_db(db_path, chunk_size=chunk_size, workers=workers)
+    results.put({
+        "seconds": time.perf_counter() - started,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def run_mode(seeded: Path, work_dir: Path, name: str, chunk_size, workers=1) -> dict:
+    db_path = work_dir / f"{name}.db"
+    shutil.copyfile(seeded, db_path)
+    journal = Path(f"{db_path}-journal")
+    largest_journal = 0
+    done = threading.Event()
+
+    def watch_journal() -> None:
+        nonlocal largest_journal
+        while not done.is_set():
+            with contextlib.suppress(OSError):
+                largest_journal = max(largest_journal, os.path.getsize(journal))
+            time.sleep(0.05)
+
+    watcher = threading.Thread(target=watch_journal, daemon=True)
+    watcher.start()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run, args=(str(db_path), chunk_size, workers, results))
+    process.start()
+    result = results.get()
+    process.join()
+    done.set()
+    watcher.join()
+
+    with sqlite3.connect(db_path) as conn:
+        leftover = conn.execute(
+            "SELECT COUNT(*) FROM team_seasons WHERE name_id LIKE 'manager%'"
+        ).fetchone()[0]
+    if leftover:
+        raise RuntimeError(f"{name}: {leftover} team_seasons rows kept their name_id")
+    return dict(result, journal_mb=largest_journal / 1e6)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="team_seasons rows")
+    parser.add_argument("--managers", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=4, help="Connections in parallel mode")
+    parser.add_argument("--skip-full", action="store_true", help="Skip the single-transaction mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(tmp_dir)
+        seeded = work_dir / "seeded.db"
+        started = time.perf_counter()
+        seed(seeded, args.managers, args.rows)
+        print(
+            f"Seeded {args.rows} team_seasons rows "
+            f"({seeded.stat().st_size / 1e6:.0f} MB) in {time.perf_counter() - started:.1f}s"
+        )
+
+        modes = [("chunked", args.chunk_size, 1), ("parallel", args.chunk_size, args.workers)]
+        if not args.skip_full:
+            modes.insert(0, ("full", None, 1))
+        print(f"{'mode':<10}{'seconds':>10}{'peak RSS MB':>14}{'journal MB':>13}")
+        for name, chunk_size, workers in modes:
+            result = run_mode(seeded, work_dir, name, chunk_size, workers)
+            print(
+                f"{name:<10}{result['seconds']:>10.1f}"
+                f"{result['peak_rss_mb']:>14.1f}{result['journal_mb']:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
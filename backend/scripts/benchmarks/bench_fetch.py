@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compare tail latency and failure rate of the fetch layer against a faulty
+local server.
+
+A stub HTTP server answers most requests quickly but injects slow responses,
+503s and dropped connections at fixed rates. The same request stream is then
+fetched with a single attempt per page and with retries plus hedging. Run
+from the repository root:
+
+    python -m backend.scripts.benchmarks.bench_fetch --requests 300
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.scripts.benchmarks.corpus import build_page
+from backend.scripts.fp_ros_scraper import FantasyProsScraper
+
+
+class FaultyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            roll = server.rng.random()
+        if roll < server.reset_rate:
+            self.close_connection = True
+            self.connection.close()
+            return
+        if roll < server.reset_rate + server.error_rate:
+            status, body = 503, b"unavailable"
+        else:
+            status, body = 200, server.page
+        slow = roll > 1 - server.slow_rate
+        time.sleep(server.slow_seconds if slow else server.base_seconds)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(args) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.rng = random.Random(args.seed)
+    server.page = build_page(target_bytes=200_000).encode("utf-8")
+    server.reset_rate = args.reset_rate
+    server.error_rate = args.error_rate
+    server.slow_rate = args.slow_rate
+    server.slow_seconds = args.slow_seconds
+    server.base_seconds = args.base_seconds
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(url: str, requests_count: int, concurrency: int, **scraper_kwargs) -> dict:
+    scraper = FantasyProsScraper(
+        debug=False, rate_limit=0, per_host_limit=concurrency * 2, **scraper_kwargs
+    )
+
+    def _one(_):
+        started = time.perf_counter()
+        try:
+            scraper.fetch(url, position="WR")
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_one, range(requests_count)))
+
+    latencies = sorted(seconds for _, seconds in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    counts = scraper.metrics.as_dict()["totals"]["counts"]
+    return {
+        "failure_rate": sum(1 for ok, _ in results if not ok) / len(results),
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+        "retries": counts["retries"],
+        "hedges": counts["hedges"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--base-seconds", type=float, default=0.02)
+    parser.add_argument("--slow-seconds", type=float, default=1.0)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--reset-rate", type=float, default=0.02)
+    args = parser.parse_args()
+
+    configs = {
+        "single attempt": {"retries": 0},
+        "retry + hedge": {"retries": 2, "backoff": 0.05, "hedge_after": 0.1, "hedge_percentile": 0.95},
+    }
+    print(f"{'config':<16}{'fail %':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'retries':>9}{'hedges':>8}")
+    for name, kwargs in configs.items():
+        server = start_server(args)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/ros.php"
+            result = run(url, args.requests, args.concurrency, **kwargs)
+        finally:
+            server.shutdown()
+            server.server_close()
+        print(
+            f"{name:<16}{result['failure_rate'] * 100:>8.1f}"
+            f"{result['p50'] * 1000:>9.0f}{result['p95'] * 1000:>9.0f}"
+            f"{result['p99'] * 1000:>9.0f}{result['retries']:>9}{result['hedges']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
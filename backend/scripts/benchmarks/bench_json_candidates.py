@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark JSON candidate discovery on a synthetic 5 MB inline script.
+
+Compares iter_json_candidates (one regex pass plus ``raw_decode``) with the
+character-walking implementation it replaced, kept below for reference.
+Run from the repository root:
+
+    python -m backend.scripts.benchmarks.bench_json_candidates --size-mb 5
+"""
+
+import argparse
+import json
+import random
+import time
+
+from backend.scripts.benchmarks.corpus import _player
+from backend.scripts.ros_json import JSON_ASSIGNMENT_PREFIXES, iter_json_candidates
+
+
+def legacy_json_candidates(text: str, script_type: str | None = None) -> list[tuple[str, str]]:
+    """The character-walking implementation replaced by iter_json_candidates"""
+    text = text.strip()
+    if not text:
+        return []
+
+    candidates: list[tuple[str, str]] = []
+
+    def _balanced_json_fragment(segment: str) -> str | None:
+        if not segment:
+            return None
+
+        opening = segment[0]
+        if opening not in "[{":
+            return None
+
+        closing = "}" if opening == "{" else "]"
+        depth = 0
+        in_string = False
+        escape = False
+
+        for index, char in enumerate(segment):
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == "\"":
+                    in_string = False
+                continue
+
+            if char == "\"":
+                in_string = True
+                continue
+
+            if char == opening:
+                depth += 1
+            elif char == closing:
+                depth -= 1
+                if depth == 0:
+                    return segment[: index + 1]
+
+        return None
+
+    def _normalize_json_candidate(raw: str) -> str | None:
+        raw = raw.strip()
+        if not raw:
+            return None
+
+        raw = raw.rstrip(";").strip()
+        if not raw:
+            return None
+
+        if raw[0] in "[{":
+            fragment = _balanced_json_fragment(raw)
+            if fragment:
+                return fragment
+
+        lowered = raw.lower()
+        if "function" in lowered and "return" in lowered:
+            return_index = lowered.rfind("return")
+            if return_index != -1:
+                after_return = raw[return_index + len("return") :].strip()
+                while after_return.startswith("("):
+                    after_return = after_return[1:].lstrip()
+                if after_return and after_return[0] in "[{":
+                    fragment = _balanced_json_fragment(after_return)
+                    if fragment:
+                        return fragment
+
+        brace_index = min(
+            [
+                idx
+                for idx in [raw.find("{"), raw.find("[")]
+                if idx != -1
+            ]
+            or [-1]
+        )
+        if brace_index >= 0:
+            fragment = _balanced_json_fragment(raw[brace_index:])
+            if fragment:
+                return fragment
+
+        return None
+
+    def _add_candidate(source: str, raw: str) -> None:
+        normalized = _normalize_json_candidate(raw)
+        if normalized:
+            candidates.append((source, normalized))
+
+    if script_type == "application/json":
+        _add_candidate("application/json", text)
+        return candidates
+
+    for prefix in JSON_ASSIGNMENT_PREFIXES:
+        if prefix in text:
+            _, candidate = text.split(prefix, 1)
+            candidate = candidate.split("=", 1)[-1]
+            _add_candidate(prefix, candidate)
+
+    if not candidates and "{" in text and "}" in text:
+        first = text.find("{")
+        last = text.rfind("}")
+        if first != -1 and last != -1 and last > first:
+            _add_candidate("braces", text[first : last + 1])
+
+    return candidates
+
+
+
+def legacy_decode(text: str) -> list:
+    """Decode legacy candidates the way extract_player_data used to"""
+    decoded = []
+    for _, candidate in legacy_json_candidates(text):
+        cleaned = candidate.strip().rstrip(";")
+        while cleaned and cleaned[-1] not in ("}", "]"):
+            cleaned = cleaned[:-1].rstrip()
+        if not cleaned or cleaned[0] not in ("{", "["):
+            continue
+        try:
+            decoded.append(json.loads(cleaned))
+        except json.JSONDecodeError:
+            continue
+    return decoded
+
+
+def build_script(target_bytes: int, seed: int = 2024) -> str:
+    """An inline script with several assignment prefixes and one huge payload"""
+    rng = random.Random(seed)
+    players = []
+    size = 0
+    while size < target_bytes:
+        player = _player(rng, len(players), "WR")
+        players.append(player)
+        size += len(json.dumps(player)) + 2
+    return (
+        'window.ecrDataProps = {"sport": "NFL", "type": "ROS"};\n'
+        "var ecrData = "
+        + json.dumps({"position_id": "WR", "players": players})
+        + ";\nvar rankingsData = {\"count\": %d};\n" % len(players)
+        + "window.__ads = window.__ads || [];\n"
+    )
+
+
+def _best_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    script = build_script(int(args.size_mb * 1_000_000))
+    current = [data for _, data in iter_json_candidates(script)]
+    # The legacy walk decodes "window.ecrDataProps" twice (it also matches
+    # "window.ecrData"); compare the distinct payloads.
+    legacy = []
+    for data in legacy_decode(script):
+        if data not in legacy:
+            legacy.append(data)
+    if current != legacy:
+        raise SystemExit("Candidate outputs differ between implementations")
+
+    legacy_seconds = _best_time(lambda: legacy_decode(script), args.repeat)
+    current_seconds = _best_time(
+        lambda: list(iter_json_candidates(script)), args.repeat
+    )
+    print(f"script size:           {len(script) / 1_000_000:.1f} MB")
+    print(f"candidates:            {len(current)}")
+    print(f"legacy walk + loads:   {legacy_seconds:.3f}s")
+    print(f"single pass raw_decode {current_seconds:.3f}s")
+    print(f"speedup:               {legacy_seconds / current_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Time a full offline scrape and database sync from recorded responses.
+
+Without ``--recordings`` every ROS rankings URL for ``--formats`` is
+recorded from generated corpus pages first; point it at a directory written
+by ``fp_ros_scraper.py --record`` to replay real traffic instead. Each run
+builds a fresh scraper on a ReplayAdapter, so fetching, hedging, extraction
+and sync_rankings_to_db all run as in production with a simulated network:
+
+    python -m backend.scripts.benchmarks.bench_replay --latency 0.15 --bandwidth 2e6
+"""
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from backend.scripts.benchmarks.corpus import build_page
+from backend.scripts.fp_ros_scraper import FantasyProsScraper, build_rankings_matrix
+from backend.scripts.ros_db import sync_rankings_to_db
+from backend.scripts.ros_transport import ReplayAdapter, save_response
+
+ROS_RANKINGS_SCHEMA = """
+CREATE TABLE ros_rankings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    team TEXT,
+    position TEXT,
+    proj_pts REAL,
+    sos_season INTEGER,
+    sos_playoffs INTEGER,
+    scoring_format TEXT NOT NULL DEFAULT 'half',
+    player_id TEXT,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def record_corpus(root: Path, urls_config: list[dict], size_mb: float) -> None:
+    for index, config in enumerate(urls_config):
+        page = build_page(
+            config["position"], target_bytes=int(size_mb * 1_000_000), seed=2024 + index
+        )
+        save_response(
+            root,
+            "GET",
+            config["url"],
+            200,
+            page.encode("utf-8"),
+            {"Content-Type": "text/html; charset=utf-8", "ETag": f'"{index}"'},
+        )
+
+
+def run_once(root: Path, urls_config: list[dict], db_path: Path, args) -> dict[str, float]:
+    scraper = FantasyProsScraper(
+        debug=False,
+        rate_limit=0,
+        transport=ReplayAdapter(root, latency=args.latency, bandwidth=args.bandwidth),
+    )
+    started = time.perf_counter()
+    records = scraper.scrape_all_records(urls_config)
+    scraped = time.perf_counter()
+    sync_rankings_to_db(db_path, records)
+    synced = time.perf_counter()
+    if scraper.failures:
+        raise RuntimeError(f"Replay failed: {scraper.failures}")
+    return {"scrape": scraped - started, "sync": synced - scraped, "players": len(records)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recordings", help="Replay this --record directory")
+    parser.add_argument("--formats", default="half", help="Comma-separated scoring formats")
+    parser.add_argument("--size-mb", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument("--bandwidth", type=float, help="Bytes per second per response")
+    args = parser.parse_args()
+
+    urls_config = build_rankings_matrix(args.formats.split(","))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(args.recordings) if args.recordings else Path(tmp_dir) / "recordings"
+        if not args.recordings:
+            record_corpus(root, urls_config, args.size_mb)
+
+        runs = []
+        for run in range(args.repeat):
+            # Alternate between an empty table (all inserts) and an
+            # unchanged one (pure diff) to cover both sync paths
+            db_path = Path(tmp_dir) / f"ros-{run // 2}.db"
+            if not db_path.exists():
+                with sqlite3.connect(db_path) as conn:
+                    conn.execute(ROS_RANKINGS_SCHEMA)
+            runs.append(run_once(root, urls_config, db_path, args))
+
+    print(f"{'run':<6}{'scrape ms':>12}{'sync ms':>10}{'players':>10}")
+    for index, result in enumerate(runs):
+        print(
+            f"{index:<6}{result['scrape'] * 1000:>12.1f}"
+            f"{result['sync'] * 1000:>10.1f}{result['players']:>10}"
+        )
+    print(
+        f"{'median':<6}{statistics.median(r['scrape'] for r in runs) * 1000:>12.1f}"
+        f"{statistics.median(r['sync'] for r in runs) * 1000:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
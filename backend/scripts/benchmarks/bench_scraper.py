@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark fetch-free scraper stages on real-size pages for every position.
+
+Each position is generated in every corpus variant (``ecr``, ``nuxt``,
+``iife``, ``nested``), or replayed from ``--corpus DIR`` when pages were
+saved earlier with ``--save-corpus``. Stages are timed separately:
+
+    candidates    script discovery plus JSON candidate decoding
+    extract_cold  extract_player_data with the heuristic search
+    extract_warm  extract_player_data replaying the learned plan
+    postprocess   combine_player_records plus records_to_dataframe
+
+Results are written as JSON so runs can be compared over time, and
+``--check`` fails when a stage, summed over every page, is slower than the
+committed baseline by more than ``--threshold``. Run from the repository root:
+
+    python -m backend.scripts.benchmarks.bench_scraper --check
+    python -m backend.scripts.benchmarks.bench_scraper --output backend/scripts/benchmarks/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from backend.scripts.benchmarks.corpus import VARIANTS, build_page
+from backend.scripts.fp_ros_scraper import (
+    FantasyProsScraper,
+    combine_player_records,
+    iter_script_blocks,
+    records_to_dataframe,
+)
+from backend.scripts.ros_json import iter_json_candidates
+
+POSITIONS = ("QB", "RB", "WR", "TE", "DST")
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def _best_of(repeat: int, func) -> tuple[float, object]:
+    """Fastest of ``repeat`` calls with the cyclic GC paused, as timeit does.
+
+    One untimed call first keeps lazy imports (pandas) out of the numbers.
+    """
+    best = float("inf")
+    result = func()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best, result
+
+
+def _count_candidates(page: str) -> int:
+    return sum(
+        1
+        for text, script_type in iter_script_blocks(page, "scan")
+        for _ in iter_json_candidates(text, script_type)
+    )
+
+
+def load_corpus(args) -> dict[tuple[str, str], str]:
+    """Pages keyed by (variant, position), generated or read from --corpus"""
+    pages = {}
+    for variant in VARIANTS:
+        for index, position in enumerate(POSITIONS):
+            if args.corpus:
+                path = Path(args.corpus) / f"{variant}-{position.lower()}.html"
+                pages[variant, position] = path.read_text(encoding="utf-8")
+            else:
+                pages[variant, position] = build_page(
+                    position,
+                    target_bytes=int(args.size_mb * 1_000_000),
+                    seed=2024 + index,
+                    variant=variant,
+                )
+    if args.save_corpus:
+        corpus_dir = Path(args.save_corpus)
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        for (variant, position), page in pages.items():
+            (corpus_dir / f"{variant}-{position.lower()}.html").write_text(page, encoding="utf-8")
+    return pages
+
+
+def run(pages: dict[tuple[str, str], str], repeat: int) -> dict[str, float]:
+    """Best-of-``repeat`` seconds per stage, keyed ``variant/position/stage``"""
+    timings: dict[str, float] = {}
+    for variant in VARIANTS:
+        batches = []
+        for position in POSITIONS:
+            page = pages[variant, position]
+            key = f"{variant}/{position}"
+
+            timings[f"{key}/candidates"], _ = _best_of(repeat, lambda: _count_candidates(page))
+            timings[f"{key}/extract_cold"], records = _best_of(
+                repeat,
+                lambda: FantasyProsScraper(debug=False).extract_player_data(page, position),
+            )
+            warm = FantasyProsScraper(debug=False)
+            warm.extract_player_data(page, position)
+            timings[f"{key}/extract_warm"], _ = _best_of(
+                repeat, lambda: warm.extract_player_data(page, position)
+            )
+            if not records:
+                raise RuntimeError(f"No players extracted from {key}")
+            batches.append(records)
+
+        timings[f"{variant}/ALL/postprocess"], _ = _best_of(
+            repeat, lambda: records_to_dataframe(combine_player_records(batches))
+        )
+    return timings
+
+
+def stage_totals(timings: dict[str, float]) -> dict[str, float]:
+    """Sum each stage over every page; single pages are too noisy to gate on"""
+    totals: dict[str, float] = {}
+    for key, seconds in timings.items():
+        stage = key.rsplit("/", 1)[1]
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return totals
+
+
+def check(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Stages whose total is slower than ``threshold`` times the baseline"""
+    reference_totals = stage_totals(baseline["timings"])
+    regressions = []
+    for stage, seconds in stage_totals(results["timings"]).items():
+        reference = reference_totals.get(stage)
+        if reference is None:
+            continue
+        if seconds > reference * threshold and seconds - reference > min_delta:
+            regressions.append(
+                f"{stage}: {seconds * 1000:.1f} ms vs baseline {reference * 1000:.1f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus", help="Replay pages saved with --save-corpus")
+    parser.add_argument("--save-corpus", help="Write the generated pages to this directory")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--check",
+        nargs="?",
+        const=str(BASELINE),
+        help="Compare against a baseline results file (default: the committed baseline)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=1.5, help="Allowed slowdown factor per stage"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=5.0,
+        help="Ignore slowdowns smaller than this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    timings = run(load_corpus(args), args.repeat)
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size_mb": args.size_mb,
+        "repeat": args.repeat,
+        "timings": {key: round(seconds, 6) for key, seconds in timings.items()},
+    }
+
+    print(f"{'stage':<32}{'ms':>10}")
+    for key, seconds in timings.items():
+        print(f"{key:<32}{seconds * 1000:>10.1f}")
+    for stage, seconds in stage_totals(timings).items():
+        print(f"{'total/' + stage:<32}{seconds * 1000:>10.1f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text(encoding="utf-8"))
+        regressions = check(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print("\nSlower than baseline:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print(f"\nNo stage slower than {args.threshold}x baseline")
+
+
+if __name__ == "__main__":
+    main()
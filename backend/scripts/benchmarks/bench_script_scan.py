@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare script-tag discovery backends on a realistic multi-MB ranking page.
+
+The page is generated once and written to a temporary file; each backend
+then runs in a fresh interpreter that only reads it, so peak RSS reflects
+that backend's parse. Run from the repository root:
+
+    python -m backend.scripts.benchmarks.bench_script_scan --size-mb 4
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.scripts.benchmarks.corpus import build_page
+from backend.scripts.fp_ros_scraper import SCRIPT_PARSERS, FantasyProsScraper
+
+
+def _max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_worker(parser: str, page_path: str, repeat: int) -> dict:
+    """Time extract_player_data for one backend inside this process"""
+    page = Path(page_path).read_text(encoding="utf-8")
+    scraper = FantasyProsScraper(debug=False, script_parser=parser)
+    baseline_rss = _max_rss_kb()
+
+    timings = []
+    players = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        players = len(scraper.extract_player_data(page, "WR"))
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "parser": parser,
+        "page_bytes": len(page),
+        "players": players,
+        "best_seconds": min(timings),
+        "peak_rss_delta_kb": _max_rss_kb() - baseline_rss,
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--size-mb", type=float, default=4.0)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--worker", choices=SCRIPT_PARSERS, help=argparse.SUPPRESS)
+    arg_parser.add_argument("--page", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.page, args.repeat)))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_path = Path(tmp_dir) / "page.html"
+        page_path.write_text(
+            build_page(target_bytes=int(args.size_mb * 1_000_000)), encoding="utf-8"
+        )
+        for parser in SCRIPT_PARSERS:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "backend.scripts.benchmarks.bench_script_scan",
+                    "--worker",
+                    parser,
+                    "--page",
+                    str(page_path),
+                    "--repeat",
+                    str(args.repeat),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results.append(json.loads(output))
+
+    print(f"{'parser':<8}{'players':>9}{'seconds':>10}{'peak RSS +MB':>14}")
+    for result in results:
+        print(
+            f"{result['parser']:<8}{result['players']:>9}"
+            f"{result['best_seconds']:>10.3f}"
+            f"{result['peak_rss_delta_kb'] / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Synthetic FantasyPros-shaped pages for benchmarking the ROS scraper.
+
+Real ranking pages are several megabytes: a large navigation/markup shell,
+a rendered rankings table, analytics scripts and one inline ``ecrData``
+assignment holding every player. The generator reproduces that shape
+deterministically so timings are comparable between runs.
+
+Besides the ``ecr`` layout, the ``nuxt``, ``iife`` and ``nested`` variants
+embed the same roster the way the test fixtures do: a ``window.__NUXT__``
+object, the same object returned from an IIFE, and projections buried under
+``stats.ros.points.value.raw``.
+"""
+
+import json
+import random
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE",
+    "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAC", "KC",
+    "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+]
+
+FIRST_NAMES = [
+    "Aaron", "Amon-Ra", "Brandon", "Calvin", "CeeDee", "Chris", "D'Andre",
+    "Davante", "Garrett", "Jaylen", "Justin", "Keenan", "Marvin", "Puka",
+    "Rashee", "Stefon", "Tee", "Tyreek", "Xavier", "Zay",
+]
+
+LAST_NAMES = [
+    "Adams", "Brown", "Chase", "Diggs", "Evans", "Flowers", "Godwin",
+    "Higgins", "Jefferson", "Kupp", "Lamb", "London", "McLaurin", "Nacua",
+    "Olave", "Pittman", "Rice", "St. Brown", "Waddle", "Wilson",
+]
+
+
+def _player(rng: random.Random, index: int, position: str) -> dict:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+    team = rng.choice(TEAMS)
+    slug = name.lower().replace(" ", "-").replace(".", "").replace("'", "")
+    return {
+        "player_id": 10000 + index,
+        "player_name": name,
+        "sportsdata_id": f"{rng.getrandbits(128):032x}",
+        "player_short_name": name.split(" ")[-2],
+        "player_position_id": position,
+        "player_positions": position,
+        "player_team_id": team,
+        "player_filename": f"{slug}.php",
+        "player_image_url": f"https://images.fantasypros.com/images/players/nfl/{10000 + index}/headshot/70x70.png",
+        "player_square_image_url": f"https://images.fantasypros.com/images/players/nfl/{10000 + index}/headshot/140x140.png",
+        "player_page_url": f"https://www.fantasypros.com/nfl/players/{slug}.php",
+        "player_bye_week": str(rng.randint(5, 14)),
+        "player_owned_avg": round(rng.uniform(0, 100), 2),
+        "player_owned_espn": round(rng.uniform(0, 100), 2),
+        "player_owned_yahoo": round(rng.uniform(0, 100), 2),
+        "player_ecr_delta": rng.randint(-10, 10),
+        "rank_ecr": index + 1,
+        "rank_min": str(max(index - 5, 1)),
+        "rank_max": str(index + 8),
+        "rank_ave": f"{index + rng.uniform(0, 3):.2f}",
+        "rank_std": f"{rng.uniform(0, 6):.2f}",
+        "pos_rank": f"{position}{index + 1}",
+        "tier": index // 12 + 1,
+        "r2p_pts": f"{max(260 - index * 0.9 + rng.uniform(-4, 4), 1):.1f}",
+        "recommended": rng.random() > 0.5,
+        "notes": "",
+    }
+
+
+VARIANTS = ("ecr", "nuxt", "iife", "nested")
+
+
+def _nuxt_player(player: dict, nested: bool) -> dict:
+    """Re-shape an ecrData player like the __NUXT__ fixtures"""
+    points = player["r2p_pts"]
+    ros = {"points": {"value": {"raw": points}}} if nested else {"proj_pts": points}
+    return {
+        "player": {
+            "name": player["player_name"],
+            "team": {"short_name": player["player_team_id"]},
+            "id": player["player_id"],
+            "image": player["player_image_url"],
+            "page": player["player_page_url"],
+            "bye_week": player["player_bye_week"],
+        },
+        "ranks": {
+            "ecr": player["rank_ecr"],
+            "min": player["rank_min"],
+            "max": player["rank_max"],
+            "avg": player["rank_ave"],
+            "std": player["rank_std"],
+            "tier": player["tier"],
+        },
+        "ownership": {
+            "avg": player["player_owned_avg"],
+            "espn": player["player_owned_espn"],
+            "yahoo": player["player_owned_yahoo"],
+        },
+        "stats": {"ros": ros},
+    }
+
+
+def _data_script(variant: str, position: str, roster: list[dict], ecr_data: dict) -> str:
+    if variant == "ecr":
+        return (
+            "<script type=\"text/javascript\">var ecrData = "
+            + json.dumps(ecr_data)
+            + ";\nvar sosData = [];</script>"
+        )
+
+    nuxt = {
+        "state": {"position": position},
+        "data": [
+            {
+                "props": {
+                    "pageProps": {
+                        "dehydratedState": {
+                            "queries": [
+                                {
+                                    "state": {
+                                        "data": {
+                                            "players": [
+                                                _nuxt_player(player, variant == "nested")
+                                                for player in roster
+                                            ]
+                                        }
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        ],
+    }
+    payload = json.dumps(nuxt)
+    if variant == "iife":
+        payload = f"(function () {{ return {payload}; }})()"
+    return f"<script type=\"application/javascript\">window.__NUXT__ = {payload};</script>"
+
+
+def _table_row(player: dict) -> str:
+    return (
+        '<tr class="player-row" data-pid="{player_id}">'
+        '<td class="sticky-cell sticky-cell-one">{rank_ecr}</td>'
+        '<td class="sticky-cell sticky-cell-two"><div class="player-cell">'
+        '<a class="player-cell-name" href="{player_page_url}">{player_name}</a>'
+        '<span class="player-cell-team">({player_team_id})</span></div></td>'
+        "<td>{player_bye_week}</td><td>{rank_min}</td><td>{rank_max}</td>"
+        "<td>{rank_ave}</td><td>{rank_std}</td><td>{r2p_pts}</td></tr>\n"
+    ).format(**player)
+
+
+def build_page(
+    position: str = "WR",
+    players: int = 400,
+    target_bytes: int = 3_000_000,
+    seed: int = 2024,
+    variant: str = "ecr",
+) -> str:
+    """Return a deterministic ranking page of roughly ``target_bytes``"""
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown page variant {variant!r}; expected one of {VARIANTS}")
+    rng = random.Random(seed)
+    roster = [_player(rng, index, position) for index in range(players)]
+    # Real pages carry the odd player without a projection yet
+    roster[-1]["r2p_pts"] = ""
+    ecr_data = {
+        "sport": "NFL",
+        "type": "ROS",
+        "ranking_type_name": "ros",
+        "scoring": "HALF",
+        "position_id": position,
+        "count": len(roster),
+        "players": roster,
+    }
+
+    head = [
+        "<!DOCTYPE html><html lang=\"en\"><head>",
+        f"<title>Rest of Season {position} Rankings | FantasyPros</title>",
+        "<script>window.dataLayer = window.dataLayer || [];"
+        "function gtag(){dataLayer.push(arguments);}gtag('js', new Date());</script>",
+        "<script type=\"application/ld+json\">"
+        + json.dumps({"@context": "https://schema.org", "@type": "WebPage"})
+        + "</script>",
+        "</head><body>",
+    ]
+    table = ["<table id=\"ranking-table\"><tbody>"]
+    table.extend(_table_row(player) for player in roster)
+    table.append("</tbody></table>")
+    data_script = _data_script(variant, position, roster, ecr_data)
+    tail = "</body></html>"
+
+    filler: list[str] = []
+    filler_size = target_bytes - sum(
+        len(part) for part in (*head, *table, data_script, tail)
+    )
+    block = 0
+    while filler_size > 0:
+        chunk = (
+            f'<div class="nav-block" id="nav-{block}"><ul>'
+            + "".join(
+                f'<li class="menu-item"><a href="/nfl/{block}/{item}.php" '
+                f'data-track="nav-{block}-{item}">Link {item}</a></li>'
+                for item in range(40)
+            )
+            + f"</ul><!-- block {block} --></div>"
+            f"<script>window.__ads = window.__ads || []; __ads.push({block});</script>\n"
+        )
+        filler.append(chunk)
+        filler_size -= len(chunk)
+        block += 1
+
+    return "".join(head) + "".join(filler) + "".join(table) + data_script + tail
@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 """
 Simple FantasyPros Rest of Season Rankings Scraper
-Extracts: Player, Team, Position, Proj. Fpts
+Extracts: Player, Team, Position, Proj. Fpts (plus SOS ranks with --schedule)
+
+pandas and BeautifulSoup are imported lazily: the --json mode that Node
+spawns on every refresh needs neither, and they dominate interpreter startup.
 """
 
+from __future__ import annotations
+
 import argparse
+import hashlib
+import html
+import importlib.util
 import json
+import math
+import os
+import random
+import re
+import sys
+import threading
 import time
-from datetime import datetime
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
-import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pandas as pd
 
 try:
     import brotli  # type: ignore  # noqa: F401
@@ -20,13 +41,408 @@ try:
 except ImportError:  # pragma: no cover - optional dependency hint
     _HAS_BROTLI = False
 
+# lxml is optional and only imported when --script-parser lxml is used
+_HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+try:
+    from .atomic_files import atomic_write_text
+    from .player_identity import PlayerResolver
+    from .ros_cache import ResponseCache
+    from .ros_db import DEFAULT_SCORING_FORMAT, sync_rankings_to_db
+    from .ros_json import STREAM_ELEMENT_CHARS, iter_json_candidates, iter_json_elements
+    from .ros_metrics import ScrapeMetrics, timed_iter
+    from .ros_snapshots import SnapshotStore
+    from .ros_transport import RecordingAdapter, ReplayAdapter
+except ImportError:  # run as a script from backend/scripts
+    from atomic_files import atomic_write_text
+    from player_identity import PlayerResolver
+    from ros_cache import ResponseCache
+    from ros_db import DEFAULT_SCORING_FORMAT, sync_rankings_to_db
+    from ros_json import STREAM_ELEMENT_CHARS, iter_json_candidates, iter_json_elements
+    from ros_metrics import ScrapeMetrics, timed_iter
+    from ros_snapshots import SnapshotStore
+    from ros_transport import RecordingAdapter, ReplayAdapter
+
+
+POSITIONS = ("QB", "RB", "WR", "TE", "DST")
+
+# FantasyPros URL infix per scoring format. QB and DST projections do not
+# depend on reception scoring, so one page serves every format.
+SCORING_FORMATS = {
+    "standard": "",
+    "half": "half-point-ppr-",
+    "ppr": "ppr-",
+}
+FORMAT_INDEPENDENT_POSITIONS = frozenset({"QB", "DST"})
+ROS_RANKINGS_URL = "https://www.fantasypros.com/nfl/rankings/ros-{infix}{position}.php"
+
+
+def build_rankings_matrix(
+    formats=(DEFAULT_SCORING_FORMAT,), positions=POSITIONS
+) -> list[dict]:
+    """URL configs covering ``positions`` x ``formats``.
+
+    Each page appears once with the ``formats`` it serves, so a page shared
+    between formats is fetched and parsed a single time per run.
+    """
+    unknown = [fmt for fmt in formats if fmt not in SCORING_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown scoring format(s): {', '.join(unknown)}")
+    unknown = [position for position in positions if position not in POSITIONS]
+    if unknown:
+        raise ValueError(f"Unknown position(s): {', '.join(unknown)}")
+
+    configs = []
+    for position in positions:
+        slug = position.lower()
+        if position in FORMAT_INDEPENDENT_POSITIONS:
+            url = ROS_RANKINGS_URL.format(infix="", position=slug)
+            configs.append({"url": url, "position": position, "formats": list(formats)})
+            continue
+        for fmt in formats:
+            url = ROS_RANKINGS_URL.format(infix=SCORING_FORMATS[fmt], position=slug)
+            configs.append({"url": url, "position": position, "formats": [fmt]})
+    return configs
+
+
+ROS_RANKINGS_URLS = build_rankings_matrix()
+
+# Politeness defaults: the whole position set may be fetched as one burst,
+# after which requests are paced to the old one-page-every-two-seconds rate.
+DEFAULT_PER_HOST_LIMIT = 5
+DEFAULT_RATE_LIMIT = 0.5
+DEFAULT_RATE_BURST = 5
+
+# Fetch resilience: retryable failures back off exponentially with full
+# jitter, capped at BACKOFF_MAX seconds between attempts.
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+BACKOFF_MAX = 8.0
+REQUEST_TIMEOUT = 30
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+# Hedging switches from --hedge-after to the observed latency percentile
+# once a host has this many completed requests.
+HEDGE_MIN_SAMPLES = 5
+LATENCY_WINDOW = 50
+
+
+class DeadlineExceeded(RuntimeError):
+    """The run's deadline budget ran out before a page could be fetched"""
+
+
+class PageUnchanged(Exception):
+    """A --changed-only probe found the page's cached fingerprint still
+    current, so it is not parsed; ``players`` are the cached ones"""
+
+    def __init__(self, changed_at: str | None, players: list[dict]):
+        super().__init__(f"unchanged since {changed_at}")
+        self.changed_at = changed_at
+        self.players = players
+
+
+SCRIPT_PARSERS = ("scan", "lxml", "bs4")
+
+# Comments are matched alongside scripts so commented-out markup is skipped,
+# mirroring what an HTML parser would report.
+_SCRIPT_OR_COMMENT_RE = re.compile(
+    r"<!--.*?-->|<script\b([^>]*)>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TYPE_ATTR_RE = re.compile(
+    r"""(?:^|\s)type\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+
+
+def _scan_script_blocks(html_content: str):
+    """Yield (text, type) for each <script> element using a regex scan"""
+    for match in _SCRIPT_OR_COMMENT_RE.finditer(html_content):
+        attrs, body = match.group(1, 2)
+        if body is None:
+            continue
+        script_type = None
+        if attrs:
+            type_match = _TYPE_ATTR_RE.search(attrs)
+            if type_match:
+                script_type = html.unescape(
+                    next(group for group in type_match.groups() if group is not None)
+                )
+        yield body, script_type
+
+
+class _LxmlScriptTarget:
+    """lxml parser target that keeps script text and builds no tree"""
+
+    def __init__(self):
+        self.scripts: list[tuple[str, str | None]] = []
+        self._type: str | None = None
+        self._parts: list[str] | None = None
+
+    def start(self, tag, attrib):
+        if tag == "script":
+            self._type = attrib.get("type")
+            self._parts = []
+
+    def data(self, text):
+        if self._parts is not None:
+            self._parts.append(text)
+
+    def end(self, tag):
+        if tag == "script" and self._parts is not None:
+            self.scripts.append(("".join(self._parts), self._type))
+            self._parts = None
+
+    def close(self):
+        return self.scripts
+
+
+def _lxml_script_blocks(html_content: str):
+    """Yield (text, type) for each <script> element using lxml's event parser"""
+    from lxml import etree
+
+    target = _LxmlScriptTarget()
+    parser = etree.HTMLParser(target=target)
+    chunk_size = 1 << 16
+    for offset in range(0, len(html_content), chunk_size):
+        parser.feed(html_content[offset : offset + chunk_size])
+        yield from target.scripts
+        target.scripts.clear()
+    yield from parser.close()
+
+
+def _soup_script_blocks(html_content: str):
+    """Yield (text, type) for each <script> element using BeautifulSoup"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    for script in soup.find_all("script"):
+        yield script.string or script.text or "", script.get("type")
+
+
+def iter_script_blocks(html_content: str, parser: str = "scan"):
+    """Yield (text, type) for every script element in a page"""
+    if parser == "lxml" and _HAS_LXML:
+        return _lxml_script_blocks(html_content)
+    if parser == "bs4":
+        return _soup_script_blocks(html_content)
+    return _scan_script_blocks(html_content)
+
+
+RECORD_COLUMNS = ["Player", "Team", "Position", "Proj. Fpts"]
+SOS_COLUMNS = ["SOS Season", "SOS Playoffs"]
+
+
+def _coerce_float(value) -> float | None:
+    """Numeric coercion matching pd.to_numeric(errors="coerce") + dropna"""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    return None if math.isnan(number) else number
+
+
+def clean_player_records(players: list[dict]) -> list[dict]:
+    """Normalize extracted players: strip names and teams, coerce projections,
+    drop rows without a name or projection and keep the first of each name"""
+    cleaned: list[dict] = []
+    seen: set[str] = set()
+    for player in players:
+        name = str(player.get("Player", "")).strip()
+        proj = _coerce_float(player.get("Proj. Fpts"))
+        if not name or proj is None or name in seen:
+            continue
+        seen.add(name)
+        team = player.get("Team")
+        cleaned.append(
+            {
+                "Player": name,
+                "Team": "" if team is None else str(team).strip(),
+                "Position": player.get("Position"),
+                "Proj. Fpts": proj,
+            }
+        )
+    return cleaned
+
+
+def combine_player_records(batches: list[list[dict]]) -> list[dict]:
+    """Merge per-position batches: first occurrence of a name wins (within a
+    scoring format), then sort by position ascending and projection
+    descending (stable, like pandas)"""
+    combined: list[dict] = []
+    seen: set[tuple[str | None, str]] = set()
+    for batch in batches:
+        for player in batch:
+            key = (player.get("Scoring"), player["Player"])
+            if key in seen:
+                continue
+            seen.add(key)
+            combined.append(player)
+    combined.sort(key=lambda player: -player["Proj. Fpts"])
+    combined.sort(key=lambda player: player["Position"])
+    return combined
+
+
+def records_to_json_rows(records: list[dict]) -> list[dict]:
+    """Rename record fields to the ros_rankings column names Node expects"""
+    rows = []
+    for record in records:
+        row = {
+            "player_name": record["Player"],
+            "team": record["Team"],
+            "position": record["Position"],
+            "proj_pts": record["Proj. Fpts"],
+        }
+        if "Scoring" in record:
+            row["scoring_format"] = record["Scoring"]
+        if "SOS Season" in record:
+            row["sos_season"] = record["SOS Season"]
+            row["sos_playoffs"] = record["SOS Playoffs"]
+        if "Player ID" in record:
+            row["player_id"] = record["Player ID"]
+        rows.append(row)
+    return rows
+
+
+def tag_scoring_formats(records: list[dict], formats) -> list[dict]:
+    """Copy one page's records into each scoring format it serves"""
+    formats = list(formats)
+    if len(formats) == 1:
+        return [dict(record, Scoring=formats[0]) for record in records]
+    return [dict(record, Scoring=fmt) for fmt in formats for record in records]
+
+
+def records_to_dataframe(records: list[dict]) -> pd.DataFrame:
+    import pandas as pd
+
+    if not records:
+        return pd.DataFrame()
+    columns = RECORD_COLUMNS
+    if "SOS Season" in records[0]:
+        columns = [*columns, *SOS_COLUMNS]
+    if "Player ID" in records[0]:
+        columns = [*columns, "Player ID"]
+    if len({record.get("Scoring") for record in records}) > 1:
+        columns = [*columns, "Scoring"]
+    return pd.DataFrame(records, columns=columns)
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to cap the request rate to a host"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it"""
+        with self._lock:
+            now = self._clock()
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time waited"""
+        if self.rate <= 0:
+            return 0.0
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+def _atomic_write_json(path: Path, data) -> None:
+    atomic_write_text(path, json.dumps(data))
+
 
 class FantasyProsScraper:
     """Simple scraper for FantasyPros Rest of Season Rankings"""
 
-    def __init__(self, debug: bool = True):
+    def __init__(
+        self,
+        debug: bool = True,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+        cache_dir: str | os.PathLike | None = None,
+        script_parser: str = "scan",
+        plan_file: str | os.PathLike | None = None,
+        metrics_file: str | os.PathLike | None = None,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        deadline: float | None = None,
+        hedge_after: float | None = None,
+        hedge_percentile: float | None = None,
+        sos=None,
+        identity: PlayerResolver | None = None,
+        transport: HTTPAdapter | None = None,
+        low_memory: bool = False,
+        stream_element_chars: int = STREAM_ELEMENT_CHARS,
+    ):
         self.debug = debug
+        if script_parser not in SCRIPT_PARSERS:
+            raise ValueError(f"Unknown script parser: {script_parser}")
+        self.script_parser = script_parser
         self.failures: list[str] = []
+        # {"position", "url", "changed_at"} of pages a --changed-only run skipped
+        self.unchanged: list[dict] = []
+        self._changed_only = False
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.metrics = ScrapeMetrics()
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        if plan_file is None and self.cache is not None:
+            plan_file = self.cache.cache_dir / "extraction_plans.json"
+        self.plan_file = Path(plan_file) if plan_file else None
+        self.extraction_plans: dict[str, dict] = self._load_plans()
+        self._key_families: dict[str, dict[str, tuple[str, ...]]] = {}
+        self.per_host_limit = max(int(per_host_limit), 1)
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self._state_lock = threading.Lock()
+        self._hosts_lock = threading.Lock()
+        self._host_slots: dict[str, tuple[threading.BoundedSemaphore, TokenBucket]] = {}
+        self.retries = max(int(retries), 0)
+        self.backoff = backoff
+        self.deadline = deadline
+        self._deadline_at: float | None = None
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self._latencies: dict[str, deque[float]] = {}
+        self._sleep = time.sleep
+        # ros_sos.SosTable (or anything with annotate) adding SOS ranks
+        self.sos = sos
+        self.identity = identity
+        # Stream large payloads element by element instead of decoding them
+        self.low_memory = low_memory
+        self.stream_element_chars = stream_element_chars
 
         encoding_values = ["gzip", "deflate"]
         if _HAS_BROTLI:
@@ -46,11 +462,17 @@ class FantasyProsScraper:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # ``transport`` swaps the network for e.g. ros_transport.ReplayAdapter
+        adapter = transport or HTTPAdapter(pool_maxsize=max(self.per_host_limit, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         if not _HAS_BROTLI:
             self.debug_print(
                 "Brotli module not available; requesting gzip/deflate responses"
             )
+        if script_parser == "lxml" and not _HAS_LXML:
+            self.debug_print("lxml not available; scanning script tags directly")
 
     # ------------------------------------------------------------------
     def debug_print(self, message: str) -> None:
@@ -62,13 +484,336 @@ class FantasyProsScraper:
     def record_failure(self, position: str, reason: str) -> None:
         """Record a scraping failure for later reporting"""
         message = f"{position}: {reason}"
-        self.failures.append(message)
+        with self._state_lock:
+            self.failures.append(message)
         if self.debug:
             print(f"❌ {message}")
 
+    # ------------------------------------------------------------------
+    def _host_slot(self, url: str) -> tuple[threading.BoundedSemaphore, TokenBucket]:
+        """Return the concurrency semaphore and rate bucket for a URL's host"""
+        host = urlsplit(url).netloc.lower()
+        with self._hosts_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = (
+                    threading.BoundedSemaphore(self.per_host_limit),
+                    TokenBucket(self.rate_limit, self.rate_burst),
+                )
+                self._host_slots[host] = slot
+            return slot
+
+    # ------------------------------------------------------------------
+    def _attempt(
+        self, url: str, headers: dict | None, timeout: float
+    ) -> tuple[requests.Response, dict]:
+        """One GET inside the host's concurrency and rate limits, returning the
+        response with its wait/request/download timings"""
+        semaphore, bucket = self._host_slot(url)
+        stats = ScrapeMetrics.new_stats()
+        started = time.perf_counter()
+        with semaphore:
+            waited = bucket.acquire()
+            if waited:
+                self.debug_print(f"Rate limit: waited {waited:.2f}s for {url}")
+            requested = time.perf_counter()
+            stats["wait"] = requested - started
+            response = self.session.get(url, headers=headers, timeout=timeout)
+        total = time.perf_counter() - requested
+        elapsed = getattr(response, "elapsed", None)
+        stats["request"] = min(elapsed.total_seconds(), total) if elapsed else total
+        stats["download"] = total - stats["request"]
+        return response, stats
+
+    # ------------------------------------------------------------------
+    def _record_latency(self, url: str, seconds: float) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self._hosts_lock:
+            samples = self._latencies.setdefault(host, deque(maxlen=LATENCY_WINDOW))
+            samples.append(seconds)
+
+    # ------------------------------------------------------------------
+    def _hedge_delay(self, url: str) -> float | None:
+        """Seconds to wait before firing a hedged duplicate, or None.
+
+        The host's latency percentile once enough samples exist, never below
+        ``hedge_after``, which alone applies until then.
+        """
+        if self.hedge_percentile is not None:
+            host = urlsplit(url).netloc.lower()
+            with self._hosts_lock:
+                samples = sorted(self._latencies.get(host, ()))
+            if len(samples) >= HEDGE_MIN_SAMPLES:
+                index = min(int(len(samples) * self.hedge_percentile), len(samples) - 1)
+                return max(samples[index], self.hedge_after or 0.0)
+        return self.hedge_after
+
+    # ------------------------------------------------------------------
+    def _start_attempt(self, url: str, headers: dict | None, timeout: float) -> Future:
+        """Run ``_attempt`` on a daemon thread so a losing hedge never holds
+        up interpreter exit"""
+        future: Future = Future()
+
+        def _run() -> None:
+            try:
+                future.set_result(self._attempt(url, headers, timeout))
+            except BaseException as exc:  # handed to the waiting caller
+                future.set_exception(exc)
+
+        threading.Thread(target=_run, daemon=True).start()
+        return future
+
+    # ------------------------------------------------------------------
+    def _hedged_attempt(
+        self, url: str, headers: dict | None, timeout: float, stats: dict
+    ) -> tuple[requests.Response, dict]:
+        """Attempt a GET, firing a duplicate once the first one is slower
+        than the hedge delay and keeping whichever succeeds first.
+
+        A retryable (429/5xx) answer only wins once no attempt is left in
+        flight; every response that does not win is closed so its pooled
+        connection is released. The duplicate draws a rate-limit token like
+        any other request, so hedging counts against ``rate_limit``.
+
+        ``timeout`` bounds each socket read, not a whole response, so the
+        run's deadline is also enforced here: when it passes with both
+        attempts still in flight, DeadlineExceeded is raised and they are
+        closed whenever they finish.
+        """
+        delay = self._hedge_delay(url)
+        if delay is None or delay >= timeout:
+            return self._attempt(url, headers, timeout)
+
+        pending = {self._start_attempt(url, headers, timeout)}
+        done, pending = wait(pending, timeout=delay)
+        if not done:
+            self.debug_print(f"Hedging {url} after {delay:.2f}s")
+            stats["hedges"] += 1
+            pending.add(self._start_attempt(url, headers, timeout))
+
+        error: BaseException | None = None
+        retryable: list[tuple[requests.Response, dict]] = []
+        winner: tuple[requests.Response, dict] | None = None
+        try:
+            while True:
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        error = exc
+                        continue
+                    if result[0].status_code in RETRY_STATUSES:
+                        retryable.append(result)
+                        continue
+                    winner = result
+                    return winner
+                if not pending:
+                    if not retryable:
+                        raise error
+                    winner = retryable[-1]
+                    return winner
+                remaining = self._remaining()
+                done, pending = wait(
+                    pending,
+                    timeout=None if remaining is None else max(remaining, 0.0),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    raise DeadlineExceeded(f"Run deadline exceeded while fetching {url}")
+        finally:
+            for response, _ in retryable:
+                if winner is None or response is not winner[0]:
+                    response.close()
+            for loser in pending:
+                loser.add_done_callback(
+                    lambda f: f.exception() is None and f.result()[0].close()
+                )
+
+    # ------------------------------------------------------------------
+    def _remaining(self) -> float | None:
+        if self._deadline_at is None:
+            return None
+        return self._deadline_at - time.monotonic()
+
+    # ------------------------------------------------------------------
+    def _backoff_delay(self, attempt: int, response: requests.Response | None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAX, self.backoff * 2**attempt))
+
+    # ------------------------------------------------------------------
+    def fetch(
+        self, url: str, headers: dict | None = None, position: str | None = None
+    ) -> requests.Response:
+        """GET a URL while respecting the per-host concurrency and rate limits.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        ``retries`` times with jittered exponential backoff, never past the
+        run's deadline. With ``hedge_after`` or ``hedge_percentile`` a slow
+        attempt gets a duplicate request and the first good answer wins; the
+        duplicate takes a rate-limit token of its own.
+
+        With ``position``, wait/request/download times, retries, hedges and
+        byte counts are added to ``self.metrics``. requests does not expose
+        DNS or connect timings separately, so they are part of ``request``.
+        """
+        stats = ScrapeMetrics.new_stats()
+        attempt = 0
+        while True:
+            remaining = self._remaining()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Run deadline exceeded before fetching {url}")
+            timeout = REQUEST_TIMEOUT if remaining is None else min(REQUEST_TIMEOUT, remaining)
+
+            response = None
+            try:
+                response, attempt_stats = self._hedged_attempt(url, headers, timeout, stats)
+            except RETRYABLE_ERRORS as exc:
+                error: Exception = exc
+            else:
+                for stage in ("wait", "request", "download"):
+                    stats[stage] += attempt_stats[stage]
+                if response.status_code not in RETRY_STATUSES:
+                    # Only winning attempts count: a hedge's abandoned loser
+                    # would drag the percentile toward the slow tail
+                    self._record_latency(url, attempt_stats["request"] + attempt_stats["download"])
+                    break
+                reason = "Too Many Requests" if response.status_code == 429 else "Server Error"
+                error = requests.HTTPError(
+                    f"{response.status_code} {reason} for url: {url}", response=response
+                )
+
+            delay = self._backoff_delay(attempt, response)
+            remaining = self._remaining()
+            if attempt >= self.retries or (remaining is not None and delay >= remaining):
+                if position is not None:
+                    self.metrics.add(position, stats)
+                raise error
+            if response is not None:
+                response.close()
+            attempt += 1
+            stats["retries"] += 1
+            self.debug_print(f"Retrying {url} in {delay:.2f}s after: {error}")
+            self._sleep(delay)
+
+        if position is not None:
+            stats["bytes"] = len(response.content)
+            raw_tell = getattr(getattr(response, "raw", None), "tell", None)
+            stats["wire_bytes"] = raw_tell() if callable(raw_tell) else stats["bytes"]
+            self.metrics.add(position, stats)
+        response.raise_for_status()
+        return response
+
+    # ------------------------------------------------------------------
+    def _response_text(self, response: requests.Response, position: str) -> str:
+        """``response.text``, timed as the position's decode stage"""
+        stats = ScrapeMetrics.new_stats()
+        started = time.perf_counter()
+        text = response.text
+        stats["decode"] = time.perf_counter() - started
+        self.metrics.add(position, stats)
+        return text
+
+    # ------------------------------------------------------------------
+    def _count_cache(self, outcome: str) -> None:
+        with self._state_lock:
+            self.cache_stats[outcome] += 1
+
+    # ------------------------------------------------------------------
+    def fetch_players(self, url: str, position: str) -> list[dict]:
+        """Fetch a rankings page and extract its players, reusing cached
+        records when the page has not changed since the last run.
+
+        In a changed-only run an unchanged page raises PageUnchanged instead.
+        The conditional GET is the probe: a 304 costs no body, and a server
+        that ignores the validators is caught by the content hash before
+        anything is parsed.
+        """
+        if self.cache is None:
+            response = self.fetch(url, position=position)
+            return self.extract_player_data(self._response_text(response, position), position)
+
+        entry = self.cache.load(url)
+        if entry is not None and entry.get("position") != position:
+            entry = None
+
+        conditional_headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.fetch(url, headers=conditional_headers or None, position=position)
+
+        if entry is not None and response.status_code == 304:
+            self.debug_print(f"{position}: not modified, reusing cached players")
+            self._count_cache("hits")
+            if self._changed_only:
+                raise PageUnchanged(entry.get("changed_at"), entry["players"])
+            return entry["players"]
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        validators = {
+            "position": position,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+        }
+
+        if entry is not None and entry.get("content_hash") == content_hash:
+            self.debug_print(f"{position}: content unchanged, reusing cached players")
+            self._count_cache("hits")
+            self.cache.store(
+                url,
+                dict(validators, players=entry["players"], changed_at=entry.get("changed_at")),
+            )
+            if self._changed_only:
+                raise PageUnchanged(entry.get("changed_at"), entry["players"])
+            return entry["players"]
+
+        self._count_cache("misses")
+        players = self.extract_player_data(self._response_text(response, position), position)
+        if players:
+            changed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self.cache.store(url, dict(validators, players=players, changed_at=changed_at))
+        return players
+
+    # ------------------------------------------------------------------
+    def _load_plans(self) -> dict[str, dict]:
+        """Read persisted extraction plans, ignoring a missing or corrupt file"""
+        if self.plan_file is None:
+            return {}
+        try:
+            with open(self.plan_file, encoding="utf-8") as handle:
+                plans = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return plans if isinstance(plans, dict) else {}
+
+    # ------------------------------------------------------------------
+    def _remember_plan(self, position: str, plan: dict | None) -> None:
+        """Store (or forget) a position's extraction plan and persist it"""
+        with self._state_lock:
+            if plan is None:
+                if self.extraction_plans.pop(position, None) is None:
+                    return
+            else:
+                self.extraction_plans[position] = plan
+            if self.plan_file is not None:
+                self.plan_file.parent.mkdir(parents=True, exist_ok=True)
+                _atomic_write_json(self.plan_file, self.extraction_plans)
+
     # ------------------------------------------------------------------
     def extract_player_data(self, html_content: str, position: str):
         """Extract player data focusing only on the 4 required fields"""
+        started = time.perf_counter()
+        stats = ScrapeMetrics.new_stats()
 
         def _normalize_string(value: str | None) -> str:
             if value is None:
@@ -90,166 +835,108 @@ class FantasyProsScraper:
                     return None
             return None
 
-        def _json_candidates(script_tag) -> list[str]:
-            text = script_tag.string or script_tag.text or ""
-            text = text.strip()
-            if not text:
-                return []
-
-            candidates: list[str] = []
-
-            def _balanced_json_fragment(segment: str) -> str | None:
-                if not segment:
-                    return None
-
-                opening = segment[0]
-                if opening not in "[{":
-                    return None
-
-                closing = "}" if opening == "{" else "]"
-                depth = 0
-                in_string = False
-                escape = False
-
-                for index, char in enumerate(segment):
-                    if in_string:
-                        if escape:
-                            escape = False
-                        elif char == "\\":
-                            escape = True
-                        elif char == "\"":
-                            in_string = False
-                        continue
-
-                    if char == "\"":
-                        in_string = True
-                        continue
-
-                    if char == opening:
-                        depth += 1
-                    elif char == closing:
-                        depth -= 1
-                        if depth == 0:
-                            return segment[: index + 1]
-
-                return None
+        def _string_value(value) -> str | None:
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+            return None
 
-            def _normalize_json_candidate(raw: str) -> str | None:
-                raw = raw.strip()
-                if not raw:
-                    return None
+        proj_candidates = [
+            "r2p_pts",
+            "ros_pts",
+            "ros_points",
+            "proj_pts",
+            "proj_fpts",
+            "pts",
+            "pts_half",
+            "points",
+            "points_total",
+            "fantasy_points",
+            "fantasy_points_total",
+            "fpts",
+        ]
 
-                raw = raw.rstrip(";").strip()
-                if not raw:
-                    return None
+        team_keys = [
+            "player_team_id",
+            "team",
+            "team_name",
+            "short_name",
+            "player_team",
+            "nfl_team_id",
+        ]
 
-                if raw[0] in "[{":
-                    fragment = _balanced_json_fragment(raw)
-                    if fragment:
-                        return fragment
-
-                lowered = raw.lower()
-                if "function" in lowered and "return" in lowered:
-                    return_index = lowered.rfind("return")
-                    if return_index != -1:
-                        after_return = raw[return_index + len("return") :].strip()
-                        while after_return.startswith("("):
-                            after_return = after_return[1:].lstrip()
-                        if after_return and after_return[0] in "[{":
-                            fragment = _balanced_json_fragment(after_return)
-                            if fragment:
-                                return fragment
-
-                brace_index = min(
-                    [
-                        idx
-                        for idx in [raw.find("{"), raw.find("[")]
-                        if idx != -1
-                    ]
-                    or [-1]
+        name_keys = [
+            "player_name",
+            "name",
+            "player",
+            "display_name",
+        ]
+        if position == "DST":
+            name_keys.append("team_name")
+
+        # Every token family a key can belong to. A key is classified against
+        # all families at once and the result cached, since the same few key
+        # names repeat across every player on every page.
+        token_families = (
+            ("entry_name", ("player", "name", "team_name", "display_name")),
+            ("entry_projection", ("pts", "points", "proj", "fpts")),
+            ("name", tuple(name_keys)),
+            ("team", tuple(team_keys)),
+            ("projection", tuple(proj_candidates)),
+            ("projection_any", ("pts", "points", "proj", "fpts")),
+        )
+        key_families = self._key_families.setdefault(position, {})
+
+        def _classify(key: str) -> tuple[str, ...]:
+            families = key_families.get(key)
+            if families is None:
+                lowered = key.lower()
+                families = tuple(
+                    family
+                    for family, tokens in token_families
+                    if any(token in lowered for token in tokens)
                 )
-                if brace_index >= 0:
-                    fragment = _balanced_json_fragment(raw[brace_index:])
-                    if fragment:
-                        return fragment
-
-                return None
-
-            def _add_candidate(raw: str) -> None:
-                normalized = _normalize_json_candidate(raw)
-                if normalized:
-                    candidates.append(normalized)
-
-            if script_tag.get("type") == "application/json":
-                _add_candidate(text)
-                return candidates
-
-            prefixes = [
-                "window.__NUXT__",
-                "window.ecrData",
-                "window.ecrDataProps",
-                "var ecrData",
-                "var data",
-                "var playerData",
-                "var rankingsData",
-                "const ecrData",
-                "const data",
-            ]
-
-            for prefix in prefixes:
-                if prefix in text:
-                    _, candidate = text.split(prefix, 1)
-                    candidate = candidate.split("=", 1)[-1]
-                    _add_candidate(candidate)
-
-            if not candidates and "{" in text and "}" in text:
-                first = text.find("{")
-                last = text.rfind("}")
-                if first != -1 and last != -1 and last > first:
-                    _add_candidate(text[first : last + 1])
-
-            return candidates
+                key_families[key] = families
+            return families
 
         def _looks_like_player_entry(entry: dict) -> bool:
             if not isinstance(entry, dict):
                 return False
 
-            name_tokens = ["player", "name", "team_name", "display_name"]
-            projection_tokens = ["pts", "points", "proj", "fpts"]
-
-            def _has_token(data, tokens: list[str]) -> bool:
-                stack: list[object] = [data]
-                while stack:
-                    current = stack.pop()
-                    if isinstance(current, dict):
-                        for key, value in current.items():
-                            if isinstance(key, str):
-                                lowered = key.lower()
-                                if any(token in lowered for token in tokens):
-                                    return True
-                            if isinstance(value, (dict, list)):
-                                stack.append(value)
-                    elif isinstance(current, list):
-                        for item in current:
-                            if isinstance(item, (dict, list)):
-                                stack.append(item)
-                return False
-
-            has_name_like = _has_token(entry, name_tokens)
-            has_projection_like = _has_token(entry, projection_tokens)
-
-            return has_name_like and has_projection_like
+            has_name_like = False
+            has_projection_like = False
+            stack: list[object] = [entry]
+            while stack:
+                current = stack.pop()
+                if isinstance(current, dict):
+                    for key, value in current.items():
+                        if isinstance(key, str):
+                            families = _classify(key)
+                            has_name_like = has_name_like or "entry_name" in families
+                            has_projection_like = (
+                                has_projection_like or "entry_projection" in families
+                            )
+                            if has_name_like and has_projection_like:
+                                return True
+                        if isinstance(value, (dict, list)):
+                            stack.append(value)
+                elif isinstance(current, list):
+                    for item in current:
+                        if isinstance(item, (dict, list)):
+                            stack.append(item)
+            return False
 
         def _find_player_lists(data):
-            player_lists: list[list[dict]] = []
+            """Return (list, path) pairs for every list that holds player-like
+            entries, where path is the key/index sequence from ``data``"""
+            player_lists: list[tuple[list[dict], tuple]] = []
             seen: set[int] = set()
-            stack = [data]
+            stack: list[tuple[object, tuple]] = [(data, ())]
             while stack:
-                current = stack.pop()
+                current, path = stack.pop()
                 if isinstance(current, dict):
-                    for value in current.values():
+                    for key, value in current.items():
                         if isinstance(value, (dict, list)):
-                            stack.append(value)
+                            stack.append((value, path + (key,)))
                 elif isinstance(current, list):
                     if id(current) not in seen:
                         seen.add(id(current))
@@ -257,278 +944,489 @@ class FantasyProsScraper:
                         if dict_items and any(
                             _looks_like_player_entry(item) for item in dict_items
                         ):
-                            player_lists.append(current)
-                    for item in current:
+                            player_lists.append((current, path))
+                    for index, item in enumerate(current):
                         if isinstance(item, (dict, list)):
-                            stack.append(item)
+                            stack.append((item, path + (index,)))
             return player_lists
 
-        def _extract_from_players(players: list[dict]):
-            extracted = []
-
-            if players and isinstance(players[0], dict):
-                self.debug_print(f"Found {len(players)} raw player entries")
-                sample_keys = list(players[0].keys())
-                self.debug_print(f"Available fields: {sample_keys}")
-
-            proj_candidates = [
-                "r2p_pts",
-                "ros_pts",
-                "ros_points",
-                "proj_pts",
-                "proj_fpts",
-                "pts",
-                "pts_half",
-                "points",
-                "points_total",
-                "fantasy_points",
-                "fantasy_points_total",
-                "fpts",
-            ]
-
-            team_keys = [
-                "player_team_id",
-                "team",
-                "team_name",
-                "short_name",
-                "player_team",
-                "nfl_team_id",
-            ]
-
-            name_keys = [
-                "player_name",
-                "name",
-                "player",
-                "display_name",
-            ]
-            if position == "DST":
-                name_keys.append("team_name")
-
-            def _resolve_candidate(value, validator, seen: set[int] | None = None):
-                if seen is None:
-                    seen = set()
-
-                if isinstance(value, (dict, list)):
-                    obj_id = id(value)
-                    if obj_id in seen:
-                        return None
-                    seen.add(obj_id)
-
-                direct = validator(value)
-                if direct is not None:
-                    return direct
-
-                if isinstance(value, dict):
-                    prioritized_keys = ["value", "raw"]
-                    for key in prioritized_keys:
-                        if key in value:
-                            result = _resolve_candidate(value[key], validator, seen)
-                            if result is not None:
-                                return result
-                    for key, child in value.items():
-                        if key in prioritized_keys:
-                            continue
-                        result = _resolve_candidate(child, validator, seen)
-                        if result is not None:
-                            return result
-                elif isinstance(value, list):
-                    for item in value:
-                        result = _resolve_candidate(item, validator, seen)
+        def _resolve_candidate(
+            value, validator, seen: set[int] | None = None, path: tuple = ()
+        ):
+            """Return (result, path) for the first value accepted by the
+            validator, where path leads from the starting value to it"""
+            if seen is None:
+                seen = set()
+
+            if isinstance(value, (dict, list)):
+                obj_id = id(value)
+                if obj_id in seen:
+                    return None
+                seen.add(obj_id)
+
+            direct = validator(value)
+            if direct is not None:
+                return direct, path
+
+            if isinstance(value, dict):
+                prioritized_keys = ["value", "raw"]
+                for key in prioritized_keys:
+                    if key in value:
+                        result = _resolve_candidate(
+                            value[key], validator, seen, path + (key,)
+                        )
                         if result is not None:
                             return result
+                for key, child in value.items():
+                    if key in prioritized_keys:
+                        continue
+                    result = _resolve_candidate(child, validator, seen, path + (key,))
+                    if result is not None:
+                        return result
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    result = _resolve_candidate(item, validator, seen, path + (index,))
+                    if result is not None:
+                        return result
 
-                return None
+            return None
 
-            def _search_nested_value(data, tokens: list[str], validator):
-                stack: list[object] = [data]
-                while stack:
-                    current = stack.pop()
-                    if isinstance(current, dict):
-                        for key, value in current.items():
-                            if isinstance(key, str):
-                                lowered = key.lower()
-                                if any(token in lowered for token in tokens):
-                                    candidate = _resolve_candidate(value, validator)
-                                    if candidate is not None:
-                                        return candidate
-                            if isinstance(value, (dict, list)):
-                                stack.append(value)
-                    elif isinstance(current, list):
-                        for item in current:
-                            if isinstance(item, (dict, list)):
-                                stack.append(item)
-                return None
+        validators = {
+            "name": _string_value,
+            "team": _string_value,
+            "projection": _to_float,
+            "projection_any": _to_float,
+        }
 
-            def _get_string_value(data: dict, keys: list[str]) -> str:
-                # Try direct keys first for backward compatibility
-                for key in keys:
-                    value = data.get(key)
-                    if isinstance(value, str) and value.strip():
-                        return value.strip()
-
-                result = _search_nested_value(
-                    data,
-                    keys,
-                    lambda value: (
-                        value.strip()
-                        if isinstance(value, str) and value.strip()
-                        else None
-                    ),
-                )
-                return result or ""
+        def _resolve_fields(data: dict) -> dict[str, tuple]:
+            """Resolve name, team and projection for one player in a
+            single traversal, returning {field: (value, path)}.
 
-            def _get_projection_value(data: dict, keys: list[str]) -> float | None:
+            Direct keys win, as before. Otherwise each field takes the
+            first matching key in the same depth-first order the
+            per-field searches used, so results are unchanged.
+            """
+            resolved: dict[str, tuple] = {}
+            for field, keys in (("name", name_keys), ("team", team_keys)):
                 for key in keys:
-                    if key in data:
-                        proj_value = _resolve_candidate(data.get(key), _to_float)
-                        if proj_value is not None:
-                            return proj_value
-
-                return _search_nested_value(data, keys, _to_float)
+                    value = _string_value(data.get(key))
+                    if value is not None:
+                        resolved[field] = (value, (key,))
+                        break
+            for key in proj_candidates:
+                if key in data:
+                    result = _resolve_candidate(data.get(key), _to_float, path=(key,))
+                    if result is not None:
+                        resolved["projection"] = result
+                        break
+
+            def _done() -> bool:
+                return (
+                    "name" in resolved
+                    and "team" in resolved
+                    and "projection" in resolved
+                )
 
-            for player in players:
-                if not isinstance(player, dict):
-                    continue
+            stack: list[tuple[object, tuple]] = [(data, ())]
+            while stack and not _done():
+                current, path = stack.pop()
+                if isinstance(current, dict):
+                    for key, value in current.items():
+                        if isinstance(key, str):
+                            for family in _classify(key):
+                                if family in resolved or family not in validators:
+                                    continue
+                                result = _resolve_candidate(
+                                    value, validators[family], path=path + (key,)
+                                )
+                                if result is not None:
+                                    resolved[family] = result
+                        if isinstance(value, (dict, list)):
+                            stack.append((value, path + (key,)))
+                elif isinstance(current, list):
+                    for index, item in enumerate(current):
+                        if isinstance(item, (dict, list)):
+                            stack.append((item, path + (index,)))
+
+            if "projection" not in resolved and "projection_any" in resolved:
+                resolved["projection"] = resolved["projection_any"]
+            return resolved
+
+        def _new_field_paths() -> dict:
+            """Paths every field was found on, across one list's players"""
+            return {"name": [], "team": [], "projection": [], "team_optional": False}
+
+        def _note_path(field_paths: dict, field: str, path: tuple) -> None:
+            path_list = list(path)
+            if path_list not in field_paths[field]:
+                field_paths[field].append(path_list)
+
+        def _extract_one(player: dict, field_paths: dict) -> dict | None:
+            """One player's record, noting where its fields were found"""
+            fields = _resolve_fields(player)
+            player_name_raw, name_path = fields.get("name", ("", None))
+            player_name = _normalize_string(player_name_raw) if player_name_raw else ""
+            if not player_name:
+                return None
 
-                player_name_raw = _get_string_value(player, name_keys)
-                player_name = (
-                    _normalize_string(player_name_raw) if player_name_raw else ""
-                )
-                if not player_name:
-                    continue
+            team_value_raw, team_path = fields.get("team", ("", None))
+            team_value = _normalize_string(team_value_raw) if team_value_raw else ""
+            if position == "DST" and not team_value:
+                team_value = player_name
 
-                team_value_raw = _get_string_value(player, team_keys)
-                team_value = _normalize_string(team_value_raw) if team_value_raw else ""
-                if position == "DST" and not team_value:
-                    team_value = player_name
+            proj_value, proj_path = fields.get("projection", (None, None))
+            if proj_value is None:
+                return None
 
-                proj_value = _get_projection_value(player, proj_candidates)
+            _note_path(field_paths, "name", name_path)
+            _note_path(field_paths, "projection", proj_path)
+            if team_path is None:
+                field_paths["team_optional"] = True
+            else:
+                _note_path(field_paths, "team", team_path)
 
-                if proj_value is None:
-                    proj_value = _search_nested_value(
-                        player,
-                        ["pts", "points", "proj", "fpts"],
-                        _to_float,
-                    )
+            return {
+                "Player": player_name,
+                "Team": team_value,
+                "Position": position,
+                "Proj. Fpts": proj_value,
+            }
 
-                if proj_value is None:
-                    continue
+        def _extract_from_players(players: list[dict]):
+            if players and isinstance(players[0], dict):
+                self.debug_print(f"Found {len(players)} raw player entries")
+                sample_keys = list(players[0].keys())
+                self.debug_print(f"Available fields: {sample_keys}")
 
-                extracted.append(
-                    {
-                        "Player": player_name,
-                        "Team": team_value,
-                        "Position": position,
-                        "Proj. Fpts": proj_value,
-                    }
-                )
+            field_paths = _new_field_paths()
+            extracted = []
+            for player in players:
+                if isinstance(player, dict):
+                    record = _extract_one(player, field_paths)
+                    if record is not None:
+                        extracted.append(record)
 
             if extracted:
                 self.debug_print(
                     f"Successfully extracted {len(extracted)} players"
                 )
 
-            return extracted
-
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        scripts = soup.find_all("script")
-        best_extracted: list[dict] = []
+            return extracted, field_paths
+
+        def _json_candidates(
+            text: str, script_type: str | None, only_source=None, decode=None
+        ):
+            return timed_iter(
+                iter_json_candidates(
+                    text,
+                    script_type,
+                    only_source=only_source,
+                    on_error=lambda exc: self.debug_print(f"JSON decode error: {exc}"),
+                    stats=stats,
+                    decode=decode,
+                ),
+                stats,
+                "candidates",
+            )
 
-        for script in scripts:
-            candidates = _json_candidates(script)
-            for candidate in candidates:
-                cleaned_candidate = candidate.strip().rstrip(";")
-                while cleaned_candidate and cleaned_candidate[-1] not in ("}", "]"):
-                    cleaned_candidate = cleaned_candidate[:-1].rstrip()
-                if not cleaned_candidate:
-                    continue
-                if cleaned_candidate[0] not in ("{", "["):
-                    continue
-                try:
-                    json_data = json.loads(cleaned_candidate)
-                except json.JSONDecodeError as exc:
-                    self.debug_print(f"JSON decode error: {exc}")
+        def _script_blocks(parser: str | None = None):
+            if parser == "bs4":
+                blocks = _soup_script_blocks(html_content)
+            else:
+                blocks = iter_script_blocks(html_content, self.script_parser)
+            return timed_iter(blocks, stats, "parse", "script_tags")
+
+        def _best_from_scripts(scripts) -> tuple[list[dict], dict | None]:
+            """Run the heuristic search, returning the largest player list
+            together with the extraction plan that reproduces it"""
+            best_extracted: list[dict] = []
+            best_plan: dict | None = None
+
+            for text, script_type in scripts:
+                for source, json_data in _json_candidates(text, script_type):
+                    for players, list_path in _find_player_lists(json_data):
+                        extracted, fields = _extract_from_players(players)
+                        if extracted and len(extracted) > len(best_extracted):
+                            best_extracted = extracted
+                            best_plan = {
+                                "source": source,
+                                "list_path": list(list_path),
+                                "fields": fields,
+                            }
+                    # Free this tree before the next candidate is decoded
+                    json_data = players = None
+
+            return best_extracted, best_plan
+
+        def _stream_player_lists(text: str, index: int) -> list[tuple]:
+            """Largest player list in the JSON value at ``index``, found from
+            one decoded array element at a time. Records accumulate per
+            array as its elements stream past; elements that are small
+            enough to decode are also searched for player lists inside."""
+            lists: dict[tuple, list] = {}  # array path -> [records, fields, has players]
+            best: tuple[list[dict], tuple, dict] | None = None
+
+            def _offer(extracted: list[dict], path: tuple, fields: dict) -> None:
+                nonlocal best
+                if extracted and (best is None or len(extracted) > len(best[0])):
+                    best = (extracted, path, fields)
+
+            for path, element in iter_json_elements(text, index, self.stream_element_chars):
+                for players, sub_path in _find_player_lists(element):
+                    extracted, fields = _extract_from_players(players)
+                    _offer(extracted, path + sub_path, fields)
+                if not isinstance(element, dict):
                     continue
+                state = lists.get(path[:-1])
+                if state is None:
+                    state = lists[path[:-1]] = [[], _new_field_paths(), False]
+                record = _extract_one(element, state[1])
+                if record is not None:
+                    state[0].append(record)
+                if not state[2]:
+                    state[2] = _looks_like_player_entry(element)
+
+            for path, (extracted, fields, has_players) in lists.items():
+                if has_players:
+                    _offer(extracted, path, fields)
+            return [best] if best is not None else []
+
+        def _best_from_stream(scripts) -> tuple[list[dict], dict | None]:
+            """_best_from_scripts without decoding whole payloads; JSON
+            decode time then includes extraction"""
+            best_extracted: list[dict] = []
+            best_plan: dict | None = None
+
+            for text, script_type in scripts:
+                candidates = _json_candidates(text, script_type, decode=_stream_player_lists)
+                for source, found in candidates:
+                    for extracted, list_path, fields in found:
+                        if len(extracted) > len(best_extracted):
+                            best_extracted = extracted
+                            best_plan = {
+                                "source": source,
+                                "list_path": list(list_path),
+                                "fields": fields,
+                            }
+
+            return best_extracted, best_plan
+
+        def _follow_path(data, path: list):
+            for step in path:
+                if isinstance(step, int) and isinstance(data, list):
+                    if not 0 <= step < len(data):
+                        return None
+                    data = data[step]
+                elif isinstance(step, str) and isinstance(data, dict):
+                    if step not in data:
+                        return None
+                    data = data[step]
+                else:
+                    return None
+            return data
 
-                for players in _find_player_lists(json_data):
-                    extracted = _extract_from_players(players)
-                    if extracted and len(extracted) > len(best_extracted):
-                        best_extracted = extracted
+        def _first_on_paths(data: dict, paths: list[list], validator):
+            for path in paths:
+                value = validator(_follow_path(data, path))
+                if value is not None:
+                    return value
+            return None
+
+        def _extract_with_plan(scripts, plan: dict) -> list[dict] | None:
+            """Index straight into the structure a previous run learned.
+            Entries without a name or projection are skipped, as the
+            heuristic search skips them; None means the page no longer has
+            that structure (no list on the path, most entries unreadable, or
+            no team where the plan always found one)."""
+            fields = plan["fields"]
+            for text, script_type in scripts:
+                for _, json_data in _json_candidates(text, script_type, plan["source"]):
+                    players = _follow_path(json_data, plan["list_path"])
+                    if not isinstance(players, list):
+                        continue
 
-        if best_extracted:
-            return best_extracted
+                    extracted = []
+                    entries = skipped = 0
+                    found_team = False
+                    for player in players:
+                        if not isinstance(player, dict):
+                            continue
+                        entries += 1
+                        player_name = _first_on_paths(player, fields["name"], _string_value)
+                        proj_value = _first_on_paths(player, fields["projection"], _to_float)
+                        if not player_name or proj_value is None:
+                            skipped += 1
+                            continue
+                        team_value = _first_on_paths(player, fields["team"], _string_value)
+                        if team_value is None:
+                            team_value = player_name if position == "DST" else ""
+                        else:
+                            found_team = True
+                        extracted.append(
+                            {
+                                "Player": player_name,
+                                "Team": team_value,
+                                "Position": position,
+                                "Proj. Fpts": proj_value,
+                            }
+                        )
+                    if not extracted or skipped * 2 > entries:
+                        return None
+                    if fields["team"] and not fields["team_optional"] and not found_team:
+                        return None
+                    return extracted
+            return None
 
-        self.debug_print("No player data found in JSON")
-        return []
+        def _extract() -> list[dict]:
+            plan = self.extraction_plans.get(position)
+            # Replaying a plan needs the whole tree, so low-memory mode
+            # always streams (and still learns plans for normal runs)
+            if plan is not None and not self.low_memory:
+                try:
+                    planned = _extract_with_plan(_script_blocks(), plan)
+                except (KeyError, TypeError):
+                    planned = None
+                if planned:
+                    self.debug_print(
+                        f"Extracted {len(planned)} players using the cached {position} plan"
+                    )
+                    return planned
+                self.debug_print(f"Cached {position} plan no longer matches; searching page")
+
+            search = _best_from_stream if self.low_memory else _best_from_scripts
+            best_extracted, learned_plan = search(_script_blocks())
+            if best_extracted:
+                self._remember_plan(position, learned_plan)
+            elif self.script_parser != "bs4":
+                # Malformed markup can defeat the fast scanners; let the
+                # forgiving HTML parser have a second look before giving up.
+                # Plans are only learned from the fast path they will replay on.
+                self.debug_print("Falling back to BeautifulSoup script parsing")
+                best_extracted, _ = search(_script_blocks("bs4"))
+
+            if best_extracted:
+                return best_extracted
+
+            self.debug_print("No player data found in JSON")
+            return []
+
+        extracted = _extract()
+        # The candidates timer wraps json_decode; report the two separately
+        stats["extract"] = time.perf_counter() - started - stats["parse"] - stats["candidates"]
+        stats["candidates"] -= stats["json_decode"]
+        self.metrics.add(position, stats)
+        return extracted
 
     # ------------------------------------------------------------------
-    def scrape_rankings(self, url: str, position: str) -> pd.DataFrame:
-        """Scrape rankings from a single URL"""
+    def scrape_position(self, url: str, position: str) -> list[dict]:
+        """Scrape and clean one position's records without touching pandas"""
         if self.debug:
             print("\n" + "=" * 50)
             print(f"Fetching {position} rankings...")
             print("=" * 50)
 
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            players_data = self.extract_player_data(response.text, position)
-            if players_data:
-                df = pd.DataFrame(players_data)
-                df["Player"] = df["Player"].astype(str).str.strip()
-                df = df[df["Player"] != ""]
-                df["Team"] = df["Team"].fillna("").astype(str).str.strip()
-                df["Proj. Fpts"] = pd.to_numeric(
-                    df["Proj. Fpts"], errors="coerce"
-                )
-                df = df.dropna(subset=["Proj. Fpts"])
-                df = df.drop_duplicates(subset=["Player"], keep="first")
+            players_data = self.fetch_players(url, position)
+            records = clean_player_records(players_data) if players_data else []
+            if records:
                 if self.debug:
-                    print(f"✅ Successfully scraped {len(df)} {position} players")
+                    print(f"✅ Successfully scraped {len(records)} {position} players")
                     print("\nSample data:")
-                    print(df.head().to_string(index=False))
-                return df
+                    print(records_to_dataframe(records[:5]).to_string(index=False))
+                return records
             else:
                 self.record_failure(position, "No player data found")
-                return pd.DataFrame()
+                return []
+        except PageUnchanged as unchanged:
+            self.debug_print(f"{position}: {unchanged}, reusing cached players")
+            with self._state_lock:
+                self.unchanged.append(
+                    {"position": position, "url": url, "changed_at": unchanged.changed_at}
+                )
+            return clean_player_records(unchanged.players) if unchanged.players else []
         except Exception as e:
             self.record_failure(position, str(e))
-            return pd.DataFrame()
+            return []
 
     # ------------------------------------------------------------------
-    def scrape_all_rankings(self) -> pd.DataFrame:
-        """Scrape all position rankings"""
+    def scrape_rankings(self, url: str, position: str) -> pd.DataFrame:
+        """Scrape rankings from a single URL"""
+        return records_to_dataframe(self.scrape_position(url, position))
+
+    # ------------------------------------------------------------------
+    def iter_position_records(
+        self, urls_config: list[dict] | None = None, changed_only: bool = False
+    ):
+        """Scrape positions concurrently, yielding (index, position, records,
+        seconds) for each one as soon as it finishes. ``index`` is the
+        position's place in ``urls_config``. Per-stage timings land in
+        ``self.metrics`` and, once every position is done, in
+        ``metrics_file`` as Prometheus text.
+
+        With ``changed_only`` a page whose cached fingerprint is still
+        current is not parsed and is listed in ``self.unchanged``; its
+        cached records are still annotated and yielded, so syncs and
+        snapshots see the whole run (see _changed_records).
+        Without a cache there are no fingerprints, so every page counts as
+        changed."""
         self.failures = []
-        urls_config = [
-            {"url": "https://www.fantasypros.com/nfl/rankings/ros-qb.php", "position": "QB"},
-            {"url": "https://www.fantasypros.com/nfl/rankings/ros-half-point-ppr-rb.php", "position": "RB"},
-            {"url": "https://www.fantasypros.com/nfl/rankings/ros-half-point-ppr-wr.php", "position": "WR"},
-            {"url": "https://www.fantasypros.com/nfl/rankings/ros-half-point-ppr-te.php", "position": "TE"},
-            {"url": "https://www.fantasypros.com/nfl/rankings/ros-dst.php", "position": "DST"},
-        ]
+        self.unchanged = []
+        self._changed_only = changed_only
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.metrics = ScrapeMetrics()
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline else None
+        if urls_config is None:
+            urls_config = ROS_RANKINGS_URLS
+
+        if not urls_config:
+            return
+
+        def _timed_scrape(config: dict) -> tuple[list[dict], float]:
+            started = time.perf_counter()
+            records = self.scrape_position(config["url"], config["position"])
+            if self.sos is not None:
+                self.sos.annotate(records)
+            if self.identity is not None:
+                self.identity.annotate(records)
+            records = tag_scoring_formats(
+                records, config.get("formats", (DEFAULT_SCORING_FORMAT,))
+            )
+            seconds = time.perf_counter() - started
+            self.metrics.add(config["position"], {"total": seconds, "players": len(records)})
+            return records, seconds
+
+        with ThreadPoolExecutor(max_workers=len(urls_config)) as executor:
+            futures = {
+                executor.submit(_timed_scrape, config): index
+                for index, config in enumerate(urls_config)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                records, seconds = future.result()
+                yield index, urls_config[index]["position"], records, seconds
 
-        all_data = []
+        if self.metrics_file is not None:
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.metrics_file, self.metrics.to_prometheus())
+        if self.identity is not None:
+            self.identity.save()
 
-        for config in urls_config:
-            df = self.scrape_rankings(config["url"], config["position"])
-            if not df.empty:
-                all_data.append(df)
-            if self.debug:
-                print("Waiting 2 seconds...")
-            time.sleep(2)
-
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            combined_df = combined_df.drop_duplicates(subset=["Player"], keep="first")
-            combined_df["Proj. Fpts"] = pd.to_numeric(
-                combined_df["Proj. Fpts"], errors="coerce"
-            )
-            combined_df = combined_df.sort_values(
-                ["Position", "Proj. Fpts"], ascending=[True, False]
-            )
-            return combined_df
-        return pd.DataFrame()
+    # ------------------------------------------------------------------
+    def scrape_all_records(
+        self, urls_config: list[dict] | None = None, changed_only: bool = False
+    ) -> list[dict]:
+        """Scrape all positions concurrently and return combined, sorted records"""
+        if urls_config is None:
+            urls_config = ROS_RANKINGS_URLS
+        batches: list[list[dict]] = [[] for _ in urls_config]
+        for index, _, records, _ in self.iter_position_records(urls_config, changed_only):
+            batches[index] = records
+        return combine_player_records(batches)
+
+    # ------------------------------------------------------------------
+    def scrape_all_rankings(self, urls_config: list[dict] | None = None) -> pd.DataFrame:
+        """Scrape all position rankings, fetching positions concurrently"""
+        return records_to_dataframe(self.scrape_all_records(urls_config))
 
     # ------------------------------------------------------------------
     def save_to_csv(self, df: pd.DataFrame, filename: str | None = None) -> str | None:
@@ -563,6 +1461,269 @@ class FantasyProsScraper:
         return filename
 
 
+def _snapshot_records(records: list[dict], urls_config: list[dict] | None) -> list[dict]:
+    """The run's primary scoring format; snapshots hold one format per run"""
+    configs = urls_config or ROS_RANKINGS_URLS
+    formats = configs[0].get("formats") if configs else None
+    primary = formats[0] if formats else DEFAULT_SCORING_FORMAT
+    return [
+        record
+        for record in records
+        if record.get("Scoring", DEFAULT_SCORING_FORMAT) == primary
+    ]
+
+
+def _unchanged_pages(configs: list[dict], unchanged: list[dict]) -> set[tuple[str, str]]:
+    """(position, scoring format) of every page skipped as unchanged"""
+    urls = {page["url"] for page in unchanged}
+    return {
+        (config["position"], scoring_format)
+        for config in configs
+        if config["url"] in urls
+        for scoring_format in config.get("formats", (DEFAULT_SCORING_FORMAT,))
+    }
+
+
+def _changed_records(records: list[dict], configs: list[dict], unchanged: list[dict]) -> list[dict]:
+    """The records a changed-only run reports as players: those of pages
+    whose content changed. Unchanged pages' records are still synced and
+    snapshotted, so refreshed SOS and player ids reach the database."""
+    skipped = _unchanged_pages(configs, unchanged)
+    if not skipped:
+        return records
+    return [
+        record
+        for record in records
+        if (record.get("Position"), record.get("Scoring", DEFAULT_SCORING_FORMAT)) not in skipped
+    ]
+
+
+def _anything_changed(configs: list[dict], unchanged: list[dict]) -> bool:
+    """False only when every page was skipped as unchanged, in which case a
+    snapshot would repeat the last one"""
+    return len({page["url"] for page in unchanged}) < len(configs)
+
+
+def stream_ndjson(
+    scraper: FantasyProsScraper,
+    stdout=None,
+    db_path: str | os.PathLike | None = None,
+    snapshots: SnapshotStore | None = None,
+    urls_config: list[dict] | None = None,
+    changed_only: bool = False,
+) -> None:
+    """Write one NDJSON line per page as it completes, then a summary.
+
+    A page is written once it and every page before it in ``urls_config``
+    have finished, so names are deduplicated in the same fixed order --json
+    uses and a player listed under two positions always lands in the same
+    one. With ``db_path`` each page is synced to ros_rankings as it is
+    written, including a page whose every name was already written, whose
+    old rows are removed; a page that failed keeps its rows. ``snapshots``
+    receives the whole run once every page is done. With ``changed_only``
+    skipped pages are marked ``"unchanged"`` and list no players, but their
+    cached records are still synced and included in the snapshot, which is
+    only skipped when every page was unchanged.
+    """
+    stdout = stdout or sys.stdout
+    started = time.monotonic()
+    emitted: set[tuple[str | None, str]] = set()
+    run_records: list[dict] = []
+    counts: dict[str, int] = {}
+    position_seconds: dict[str, float] = {}
+
+    configs = urls_config or ROS_RANKINGS_URLS
+    finished: dict[int, tuple[str, list[dict], float]] = {}
+    next_index = 0
+    for index, position, records, seconds in scraper.iter_position_records(
+        configs, changed_only
+    ):
+        finished[index] = (position, records, seconds)
+        while next_index in finished:
+            config = configs[next_index]
+            position, records, seconds = finished.pop(next_index)
+            next_index += 1
+            fresh = [
+                record
+                for record in records
+                if (record.get("Scoring"), record["Player"]) not in emitted
+            ]
+            emitted.update((record.get("Scoring"), record["Player"]) for record in fresh)
+            fresh.sort(key=lambda record: -record["Proj. Fpts"])
+            run_records.extend(fresh)
+            counts[position] = counts.get(position, 0) + len(fresh)
+            position_seconds[position] = max(
+                position_seconds.get(position, 0), round(seconds, 3)
+            )
+            formats = config.get("formats", [DEFAULT_SCORING_FORMAT])
+            unchanged = any(page["url"] == config["url"] for page in scraper.unchanged)
+            line = {
+                "type": "position",
+                "position": position,
+                "formats": formats,
+                "players": [] if unchanged else records_to_json_rows(fresh),
+            }
+            if unchanged:
+                line["unchanged"] = True
+            if db_path is not None and records:
+                line["db"] = sync_rankings_to_db(
+                    db_path, fresh, {(position, fmt) for fmt in formats}
+                )
+            stdout.write(json.dumps(line) + "\n")
+            stdout.flush()
+
+    summary = {
+        "type": "summary",
+        "failed": scraper.failures,
+        "player_count": len(emitted),
+        "position_counts": counts,
+        "position_seconds": position_seconds,
+        "total_seconds": round(time.monotonic() - started, 3),
+        "metrics": scraper.metrics.as_dict(),
+    }
+    if scraper.cache is not None:
+        summary["cache"] = scraper.cache_stats
+    if changed_only:
+        summary["unchanged"] = scraper.unchanged
+    snapshot_records = _snapshot_records(run_records, urls_config)
+    if snapshots is not None and snapshot_records and _anything_changed(configs, scraper.unchanged):
+        summary["snapshot"] = snapshots.append(snapshot_records)
+    stdout.write(json.dumps(summary) + "\n")
+    stdout.flush()
+
+
+def _handle_command(
+    scraper: FantasyProsScraper,
+    request: dict,
+    state: dict,
+    db_path: str | os.PathLike | None = None,
+    snapshots: SnapshotStore | None = None,
+    urls_config: list[dict] | None = None,
+) -> dict:
+    """Execute one worker command and build its response"""
+    command = request.get("cmd")
+
+    if command == "scrape":
+        changed_only = bool(request.get("changed_only"))
+        positions = request.get("positions")
+        if request.get("position") is not None:
+            positions = [request["position"]]
+        if request.get("formats"):
+            urls_config = build_rankings_matrix(request["formats"])
+        elif urls_config is None:
+            urls_config = ROS_RANKINGS_URLS
+        if positions:
+            unknown = sorted(set(positions) - {config["position"] for config in urls_config})
+            if unknown:
+                return {"ok": False, "error": f"Unknown position: {', '.join(unknown)}"}
+            urls_config = [config for config in urls_config if config["position"] in positions]
+
+        if scraper.identity is not None:
+            # A warm worker outlives its keepers index; pick up new keepers
+            scraper.identity.reload()
+        started = time.monotonic()
+        records = scraper.scrape_all_records(urls_config, changed_only)
+        state["scrapes"] += 1
+        state["last_scrape_seconds"] = round(time.monotonic() - started, 3)
+        for outcome, count in scraper.cache_stats.items():
+            state["cache"][outcome] += count
+
+        response = {
+            "ok": True,
+            "players": records_to_json_rows(
+                _changed_records(records, urls_config, scraper.unchanged)
+            ),
+            "failed": scraper.failures,
+            "metrics": scraper.metrics.as_dict(),
+        }
+        if scraper.cache is not None:
+            response["cache"] = scraper.cache_stats
+        if changed_only:
+            response["unchanged"] = scraper.unchanged
+        if db_path is not None:
+            response["db"] = sync_rankings_to_db(db_path, records)
+        snapshot_records = _snapshot_records(records, urls_config)
+        if (
+            snapshots is not None
+            and snapshot_records
+            and _anything_changed(urls_config, scraper.unchanged)
+        ):
+            response["snapshot"] = snapshots.append(snapshot_records)
+        return response
+
+    if command == "stats":
+        return {
+            "ok": True,
+            "uptime_seconds": round(time.monotonic() - state["started"], 3),
+            "scrapes": state["scrapes"],
+            "last_scrape_seconds": state["last_scrape_seconds"],
+            "cache": state["cache"] if scraper.cache is not None else None,
+            "plans": sorted(scraper.extraction_plans),
+        }
+
+    if command == "shutdown":
+        return {"ok": True}
+
+    return {"ok": False, "error": f"Unknown command: {command}"}
+
+
+def serve(
+    scraper: FantasyProsScraper,
+    stdin=None,
+    stdout=None,
+    db_path: str | os.PathLike | None = None,
+    snapshots: SnapshotStore | None = None,
+    urls_config: list[dict] | None = None,
+) -> None:
+    """Answer newline-delimited JSON commands until stdin closes.
+
+    Commands are ``{"cmd": "scrape"}`` (optionally with a ``"position"`` or
+    ``"positions"`` subset, a ``"formats"`` list overriding ``urls_config``
+    and ``"changed_only": true`` to skip pages whose fingerprint held),
+    ``{"cmd": "stats"}`` and ``{"cmd": "shutdown"}``. Each gets exactly one
+    JSON line back, echoing the request's ``id`` when one was sent. The
+    scraper, its HTTP connection pool and its extraction caches stay warm
+    between commands. With ``db_path`` every scrape is synced to ros_rankings
+    and with ``snapshots`` it is appended to the snapshot history.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    state = {
+        "started": time.monotonic(),
+        "scrapes": 0,
+        "last_scrape_seconds": None,
+        "cache": {"hits": 0, "misses": 0},
+    }
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("command must be a JSON object")
+        except ValueError as exc:
+            request = {}
+            response = {"ok": False, "error": f"Invalid command: {exc}"}
+        else:
+            try:
+                response = _handle_command(
+                    scraper, request, state, db_path, snapshots, urls_config
+                )
+            except Exception as exc:  # keep the worker alive for the next command
+                response = {"ok": False, "error": str(exc)}
+
+        if "id" in request:
+            response = {"id": request["id"], **response}
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+        if request.get("cmd") == "shutdown":
+            break
+
+
 def main() -> tuple[pd.DataFrame | None, str | None]:
     """Main function to run the scraper"""
     parser = argparse.ArgumentParser(
@@ -573,46 +1734,307 @@ def main() -> tuple[pd.DataFrame | None, str | None]:
         action="store_true",
         help="Output data as JSON to stdout (suppresses other output)",
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON line per position, in order, as soon as it and the ones before it complete, then a summary",
+    )
+    parser.add_argument(
+        "--formats",
+        type=lambda value: [fmt.strip() for fmt in value.split(",") if fmt.strip()],
+        default=[DEFAULT_SCORING_FORMAT],
+        help=(
+            "Comma-separated scoring formats to scrape in one run "
+            f"({', '.join(SCORING_FORMATS)}; default {DEFAULT_SCORING_FORMAT})"
+        ),
+    )
+    parser.add_argument(
+        "--positions",
+        type=lambda value: [pos.strip().upper() for pos in value.split(",") if pos.strip()],
+        default=list(POSITIONS),
+        help=f"Comma-separated positions to scrape (default {','.join(POSITIONS)})",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help=(
+            "Probe each page with a conditional GET and only parse and sync pages "
+            "whose --cache-dir fingerprint changed; the rest keep their rows "
+            "(without --cache-dir every page counts as changed)"
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        help="Sync results straight into this SQLite database's ros_rankings table",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Append every run to the ROS projection snapshot store in this directory",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a persistent worker answering JSON-lines commands on stdin",
+    )
+    parser.add_argument(
+        "--per-host-limit",
+        type=int,
+        default=DEFAULT_PER_HOST_LIMIT,
+        help="Maximum concurrent requests to a single host",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help="Sustained requests per second per host (0 disables pacing)",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=int,
+        default=DEFAULT_RATE_BURST,
+        help="Requests per host that may be sent before pacing applies",
+    )
+    parser.add_argument(
+        "--script-parser",
+        choices=SCRIPT_PARSERS,
+        default="scan",
+        help="How to locate <script> tags (BeautifulSoup is always the fallback)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the conditional-GET response cache",
+    )
+    parser.add_argument(
+        "--plan-file",
+        help="Where to persist learned extraction plans (defaults to the cache dir)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Retries per page on connection errors, timeouts and 429/5xx responses",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="Overall time budget in seconds for one run; no retry starts past it",
+    )
+    parser.add_argument(
+        "--hedge-after",
+        type=float,
+        help=(
+            "Send a duplicate request when a page takes longer than this many seconds "
+            "(the floor when --hedge-percentile is also set); duplicates count "
+            "against --rate-limit"
+        ),
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help=(
+            "Hedge once a request is slower than this latency percentile (e.g. 0.95) "
+            f"of the host's last {LATENCY_WINDOW} requests"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write per-stage metrics in Prometheus text format here after every run",
+    )
+    parser.add_argument(
+        "--schedule",
+        help="NFL schedule file (week, home, away) for strength-of-schedule ranks",
+    )
+    parser.add_argument(
+        "--points-allowed",
+        help="Points allowed per game by defense and position, used with --schedule",
+    )
+    parser.add_argument(
+        "--sos-from-week",
+        type=int,
+        default=1,
+        help="First week still to play; earlier games drop out of season SOS",
+    )
+    parser.add_argument(
+        "--playoff-weeks",
+        default="15-17",
+        help="Fantasy playoff weeks for playoff SOS (default 15-17)",
+    )
+    parser.add_argument(
+        "--sleeper-players",
+        help="Saved Sleeper /players/nfl JSON used, with --db keepers, to resolve player ids",
+    )
+    parser.add_argument(
+        "--identity-map",
+        help="Persist resolved player_name -> player_id matches in this JSON file",
+    )
+    transport_group = parser.add_mutually_exclusive_group()
+    transport_group.add_argument(
+        "--record",
+        help="Save every response (gzip-compressed, with headers) to this directory",
+    )
+    transport_group.add_argument(
+        "--replay",
+        help="Serve responses saved with --record from this directory instead of the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before each replayed response",
+    )
+    parser.add_argument(
+        "--replay-bandwidth",
+        type=float,
+        help="Cap replayed downloads at this many bytes per second",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help=(
+            "Stream embedded JSON one array element at a time instead of decoding "
+            "whole payloads (slower, but memory stays near one player list)"
+        ),
+    )
     args = parser.parse_args()
+    try:
+        urls_config = build_rankings_matrix(args.formats, args.positions)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    pool_maxsize = max(args.per_host_limit, 10)
+    transport = None
+    if args.record:
+        transport = RecordingAdapter(args.record, pool_maxsize=pool_maxsize)
+    elif args.replay:
+        try:
+            transport = ReplayAdapter(
+                args.replay,
+                latency=args.replay_latency,
+                bandwidth=args.replay_bandwidth,
+                pool_maxsize=pool_maxsize,
+            )
+        except FileNotFoundError as exc:
+            parser.error(str(exc))
+
+    sos = None
+    if bool(args.schedule) != bool(args.points_allowed):
+        parser.error("--schedule and --points-allowed must be given together")
+    if args.schedule:
+        # numpy is only needed when SOS ranks are requested
+        try:
+            from .ros_sos import SosTable, parse_weeks
+        except ImportError:
+            from ros_sos import SosTable, parse_weeks
 
-    scraper = FantasyProsScraper(debug=not args.json)
-    df = scraper.scrape_all_rankings()
+        try:
+            sos = SosTable.from_files(
+                args.schedule,
+                args.points_allowed,
+                args.sos_from_week,
+                parse_weeks(args.playoff_weeks),
+            )
+        except (OSError, KeyError, ValueError) as exc:
+            parser.error(f"Could not load SOS inputs: {exc}")
+
+    scraper = FantasyProsScraper(
+        debug=not (args.json or args.ndjson or args.serve),
+        per_host_limit=args.per_host_limit,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        cache_dir=args.cache_dir,
+        script_parser=args.script_parser,
+        plan_file=args.plan_file,
+        metrics_file=args.metrics_file,
+        retries=args.retries,
+        deadline=args.deadline,
+        hedge_after=args.hedge_after,
+        hedge_percentile=args.hedge_percentile,
+        sos=sos,
+        identity=(
+            PlayerResolver.build(args.db, args.sleeper_players, args.identity_map)
+            if args.db or args.sleeper_players
+            else None
+        ),
+        transport=transport,
+        low_memory=args.low_memory,
+    )
+    snapshots = SnapshotStore(args.snapshot_dir) if args.snapshot_dir else None
+    if args.serve:
+        serve(scraper, db_path=args.db, snapshots=snapshots, urls_config=urls_config)
+        return None, None
+
+    if args.ndjson:
+        stream_ndjson(
+            scraper,
+            db_path=args.db,
+            snapshots=snapshots,
+            urls_config=urls_config,
+            changed_only=args.changed_only,
+        )
+        return None, None
+
+    records = scraper.scrape_all_records(urls_config, args.changed_only)
 
     failures = scraper.failures
+    db_changes = sync_rankings_to_db(args.db, records) if args.db else None
+    snapshot_records = _snapshot_records(records, urls_config)
+    snapshot = (
+        snapshots.append(snapshot_records)
+        if snapshots is not None
+        and snapshot_records
+        and _anything_changed(urls_config, scraper.unchanged)
+        else None
+    )
+    changed = _changed_records(records, urls_config, scraper.unchanged)
 
+    if args.json:
+        payload = {
+            "players": records_to_json_rows(changed),
+            "failed": failures,
+            "metrics": scraper.metrics.as_dict(),
+        }
+        if scraper.cache is not None:
+            payload["cache"] = scraper.cache_stats
+        if args.changed_only:
+            payload["unchanged"] = scraper.unchanged
+        if db_changes is not None:
+            payload["db"] = db_changes
+        if snapshot is not None:
+            payload["snapshot"] = snapshot
+        print(json.dumps(payload))
+        return None, None
+
+    for page in scraper.unchanged:
+        print(f"⏭️  {page['position']} unchanged since {page['changed_at']}: {page['url']}")
+
+    df = records_to_dataframe(changed)
+    if df.empty and scraper.unchanged and not failures:
+        print("\n✅ Nothing changed since the last run")
+        return None, None
     if df.empty:
-        if args.json:
-            print(json.dumps({"players": [], "failed": failures}))
-        else:
-            print("\n❌ Failed to scrape any data")
-            if failures:
-                print("Reasons:")
-                for failure in failures:
-                    print(f"   - {failure}")
+        print("\n❌ Failed to scrape any data")
+        if failures:
+            print("Reasons:")
+            for failure in failures:
+                print(f"   - {failure}")
         return None, None
 
-    filename = None
-    if not args.json:
-        filename = scraper.save_to_csv(df)
-        print("\n📋 Final data sample (top 10 by projected points):")
-        top_players = df.nlargest(10, "Proj. Fpts")
-        print(top_players.to_string(index=False))
+    filename = scraper.save_to_csv(df)
+    print("\n📋 Final data sample (top 10 by projected points):")
+    top_players = df.nlargest(10, "Proj. Fpts")
+    print(top_players.to_string(index=False))
+    print(
+        f"\n🎉 Success! '{filename}' is ready for your database!"
+    )
+    if db_changes is not None:
         print(
-            f"\n🎉 Success! '{filename}' is ready for your database!"
+            f"🗄️  {args.db}: {db_changes['added']} added, "
+            f"{db_changes['changed']} changed, {db_changes['removed']} removed"
         )
-    else:
-        records = df.rename(
-            columns={
-                "Player": "player_name",
-                "Team": "team",
-                "Position": "position",
-                "Proj. Fpts": "proj_pts",
-            }
-        ).to_dict(orient="records")
-        payload = {"players": records, "failed": failures}
-        print(json.dumps(payload))
+    if snapshot is not None:
+        print(f"🗂️  Snapshot {snapshot['run']} appended to {args.snapshot_dir}")
 
-    if not args.json and failures:
+    if failures:
         print("\n⚠️ Issues encountered during scraping:")
         for failure in failures:
             print(f"   - {failure}")
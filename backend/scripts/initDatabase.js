@@ -177,6 +177,8 @@ db.serialize(() => {
       proj_pts REAL,
       sos_season INTEGER,
       sos_playoffs INTEGER,
+      scoring_format TEXT NOT NULL DEFAULT 'half',
+      player_id TEXT,
       updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
     )
   `, (err) => {
@@ -399,6 +401,10 @@ db.serialize(() => {
       name: 'idx_keepers_year_player',
       sql: 'CREATE INDEX IF NOT EXISTS idx_keepers_year_player ON keepers(year, player_id)'
     },
+    {
+      name: 'idx_ros_rankings_player_id',
+      sql: 'CREATE INDEX IF NOT EXISTS idx_ros_rankings_player_id ON ros_rankings(player_id)'
+    },
     {
       name: 'idx_team_seasons_year',
       sql: 'CREATE INDEX IF NOT EXISTS idx_team_seasons_year ON team_seasons(year)'
@@ -0,0 +1,41 @@
+const sqlite3 = require('sqlite3').verbose();
+const path = require('path');
+
+const dbPath = path.join(__dirname, '..', '..', 'data', 'fantasy_football.db');
+const db = new sqlite3.Database(dbPath);
+
+console.log('🚀 Running migration: add scoring_format column to ros_rankings table...');
+
+db.serialize(() => {
+  db.run(
+    `ALTER TABLE ros_rankings ADD COLUMN scoring_format TEXT NOT NULL DEFAULT 'half';`,
+    err => {
+      if (err && err.message.includes('duplicate column name')) {
+        console.log('ℹ️  scoring_format column already exists');
+      } else if (err) {
+        console.error('❌ Error adding scoring_format column:', err.message);
+      } else {
+        console.log('✅ Added scoring_format column');
+      }
+    }
+  );
+
+  db.run(
+    `CREATE INDEX IF NOT EXISTS idx_ros_rankings_format_position ON ros_rankings(scoring_format, position);`,
+    err => {
+      if (err) {
+        console.error('❌ Error creating idx_ros_rankings_format_position index:', err.message);
+      } else {
+        console.log('✅ Created idx_ros_rankings_format_position index');
+      }
+    }
+  );
+});
+
+db.close(err => {
+  if (err) {
+    console.error('❌ Error closing database:', err.message);
+  } else {
+    console.log('✅ Migration completed and database closed.');
+  }
+});
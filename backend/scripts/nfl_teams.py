@@ -0,0 +1,90 @@
+"""
+NFL team codes, names and the aliases different data sources use for them.
+
+Codes follow gameStatusService.js (JAX, LAR, LV, WAS, ...). ``team_code``
+accepts an abbreviation, a full name, a nickname or a D/ST label.
+"""
+
+from __future__ import annotations
+
+TEAMS = (
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE",
+    "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+    "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+)
+TEAM_NAMES = {
+    "ARI": "Arizona Cardinals",
+    "ATL": "Atlanta Falcons",
+    "BAL": "Baltimore Ravens",
+    "BUF": "Buffalo Bills",
+    "CAR": "Carolina Panthers",
+    "CHI": "Chicago Bears",
+    "CIN": "Cincinnati Bengals",
+    "CLE": "Cleveland Browns",
+    "DAL": "Dallas Cowboys",
+    "DEN": "Denver Broncos",
+    "DET": "Detroit Lions",
+    "GB": "Green Bay Packers",
+    "HOU": "Houston Texans",
+    "IND": "Indianapolis Colts",
+    "JAX": "Jacksonville Jaguars",
+    "KC": "Kansas City Chiefs",
+    "LAC": "Los Angeles Chargers",
+    "LAR": "Los Angeles Rams",
+    "LV": "Las Vegas Raiders",
+    "MIA": "Miami Dolphins",
+    "MIN": "Minnesota Vikings",
+    "NE": "New England Patriots",
+    "NO": "New Orleans Saints",
+    "NYG": "New York Giants",
+    "NYJ": "New York Jets",
+    "PHI": "Philadelphia Eagles",
+    "PIT": "Pittsburgh Steelers",
+    "SEA": "Seattle Seahawks",
+    "SF": "San Francisco 49ers",
+    "TB": "Tampa Bay Buccaneers",
+    "TEN": "Tennessee Titans",
+    "WAS": "Washington Commanders",
+}
+
+TEAM_ALIASES = {
+    "JAC": "JAX",
+    "ARZ": "ARI",
+    "LA": "LAR",
+    "STL": "LAR",
+    "SD": "LAC",
+    "SDC": "LAC",
+    "OAK": "LV",
+    "LVR": "LV",
+    "TAM": "TB",
+    "WSH": "WAS",
+    "WFT": "WAS",
+    "NOR": "NO",
+    "NWE": "NE",
+    "SFO": "SF",
+    "KAN": "KC",
+    "GNB": "GB",
+    "Washington Football Team": "WAS",
+    "Washington Redskins": "WAS",
+    "Oakland Raiders": "LV",
+    "San Diego Chargers": "LAC",
+    "St. Louis Rams": "LAR",
+}
+
+_TEAM_LOOKUP = {
+    key.lower(): team
+    for team in TEAMS
+    for key in (team, TEAM_NAMES[team], TEAM_NAMES[team].rsplit(" ", 1)[1])
+}
+_TEAM_LOOKUP.update({alias.lower(): team for alias, team in TEAM_ALIASES.items()})
+
+
+def team_code(value: str | None) -> str | None:
+    """Canonical team code for an abbreviation, full name or nickname"""
+    if not value:
+        return None
+    key = str(value).strip().lower()
+    if key.endswith(" d/st") or key.endswith(" dst"):
+        key = key.rsplit(" ", 1)[0]
+    return _TEAM_LOOKUP.get(key)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Resolve free-text player names to Sleeper player ids.
+
+ros_rankings rows arrive keyed by whatever name FantasyPros prints, while
+keepers (and everything fetched from Sleeper) use ``player_id``. Names are
+normalized first — accents, punctuation, hyphens and generational suffixes
+are dropped, so "Amon-Ra St. Brown" and "Amon Ra St Brown" agree — and D/ST
+entries resolve straight to their team code, which is Sleeper's id for a
+defense. Anything that still does not match exactly goes through a trigram
+index: only players sharing a trigram with the name are scored, instead of
+comparing against every known player.
+
+Resolved names are kept in a small JSON map so later runs skip the lookup,
+and the scraper writes the ids into ros_rankings.player_id.
+
+    python backend/scripts/player_identity.py --db data/fantasy_football.db "DK Metcalf"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+try:
+    from .atomic_files import atomic_write_text
+    from .nfl_teams import team_code
+except ImportError:  # run as a script from backend/scripts
+    from atomic_files import atomic_write_text
+    from nfl_teams import team_code
+
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+DST_POSITIONS = frozenset({"DST", "DEF", "D/ST"})
+# Sleeper positions worth indexing; everything else is noise for rankings
+INDEXED_POSITIONS = frozenset({"QB", "RB", "WR", "TE", "K"})
+MIN_SCORE = 0.8
+
+_APOSTROPHES_RE = re.compile(r"[.'’`]")
+_SEPARATORS_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str | None) -> str:
+    """Lowercase ASCII name without punctuation or a trailing suffix"""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    text = _SEPARATORS_RE.sub(" ", _APOSTROPHES_RE.sub("", text.lower()))
+    tokens = text.split()
+    while len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def trigrams(normalized: str) -> set[str]:
+    padded = f"  {normalized} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    """Exact and trigram-blocked fuzzy lookup of player ids by name"""
+
+    def __init__(self, min_score: float = MIN_SCORE):
+        self.min_score = min_score
+        # (player_id, normalized name, position, team) per entry
+        self._entries: list[tuple[str, str, str | None, str | None]] = []
+        self._exact: dict[str, list[int]] = {}
+        self._blocks: dict[str, list[int]] = {}
+        self._grams: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        player_id: str,
+        name: str,
+        position: str | None = None,
+        team: str | None = None,
+    ) -> None:
+        normalized = normalize_name(name)
+        if not player_id or not normalized:
+            return
+        index = len(self._entries)
+        self._entries.append((str(player_id), normalized, position, team_code(team)))
+        self._exact.setdefault(normalized, []).append(index)
+        grams = trigrams(normalized)
+        self._grams.append(len(grams))
+        for gram in grams:
+            self._blocks.setdefault(gram, []).append(index)
+
+    def _pick(self, candidates: list[int], position: str | None, team: str | None) -> str | None:
+        """The one player id among ``candidates``, narrowed by position and team"""
+        if position is not None:
+            candidates = [
+                index for index in candidates if self._entries[index][2] in (None, position)
+            ]
+        ids = {self._entries[index][0] for index in candidates}
+        if len(ids) > 1 and team is not None:
+            on_team = {
+                self._entries[index][0]
+                for index in candidates
+                if self._entries[index][3] == team_code(team)
+            }
+            ids = on_team or ids
+        return ids.pop() if len(ids) == 1 else None
+
+    def lookup(
+        self,
+        name: str,
+        position: str | None = None,
+        team: str | None = None,
+    ) -> str | None:
+        """Player id for ``name``, or None when unknown or ambiguous"""
+        if position in DST_POSITIONS:
+            return team_code(name) or team_code(team)
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+        exact = self._exact.get(normalized)
+        if exact:
+            return self._pick(exact, position, team)
+
+        grams = trigrams(normalized)
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._blocks.get(gram, ()))
+        scored: dict[float, list[int]] = {}
+        for index, count in shared.items():
+            # Dice coefficient over trigram sets
+            score = 2 * count / (len(grams) + self._grams[index])
+            if score >= self.min_score:
+                scored.setdefault(score, []).append(index)
+        for score in sorted(scored, reverse=True):
+            player_id = self._pick(scored[score], position, team)
+            if player_id is not None:
+                return player_id
+        return None
+
+
+def load_keepers(db_path: str | os.PathLike) -> list[tuple[str, str]]:
+    """Distinct (player_id, player_name) pairs from the keepers table"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        return conn.execute(
+            "SELECT player_id, player_name FROM keepers "
+            "WHERE player_id IS NOT NULL AND player_name IS NOT NULL "
+            "GROUP BY player_id, player_name"
+        ).fetchall()
+    except sqlite3.OperationalError:  # database without a keepers table
+        return []
+    finally:
+        conn.close()
+
+
+def load_sleeper_players(path: str | os.PathLike) -> list[dict]:
+    """Players from a saved Sleeper ``/players/nfl`` response"""
+    players = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [
+        {
+            "player_id": player_id,
+            "name": player.get("full_name")
+            or f"{player.get('first_name', '')} {player.get('last_name', '')}",
+            "position": player.get("position"),
+            "team": player.get("team"),
+        }
+        for player_id, player in players.items()
+        if player.get("position") in INDEXED_POSITIONS
+    ]
+
+
+class PlayerResolver:
+    """PlayerIndex lookups remembered in a persisted name -> id map"""
+
+    def __init__(self, index: PlayerIndex, map_path: str | os.PathLike | None = None):
+        self.index = index
+        self.map_path = Path(map_path) if map_path else None
+        self.mapping: dict[str, str] = {}
+        if self.map_path is not None and self.map_path.exists():
+            self.mapping = json.loads(self.map_path.read_text(encoding="utf-8"))
+        self._lock = threading.Lock()
+        self._dirty = False
+        # Sources reload() rebuilds the index from; set by build()
+        self.db_path: str | os.PathLike | None = None
+        self.sleeper_players: str | os.PathLike | None = None
+        self._sleeper_cache: tuple[int, list[dict]] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        db_path: str | os.PathLike | None = None,
+        sleeper_players: str | os.PathLike | None = None,
+        map_path: str | os.PathLike | None = None,
+    ) -> PlayerResolver:
+        """Index Sleeper players (with positions and teams) and keepers"""
+        resolver = cls(PlayerIndex(), map_path)
+        resolver.db_path = db_path
+        resolver.sleeper_players = sleeper_players
+        resolver.reload()
+        return resolver
+
+    def reload(self) -> None:
+        """Rebuild the index from the keepers table as it is now, so a
+        long-lived resolver sees keepers added since it was built. The
+        Sleeper players file is only parsed again once its mtime changes."""
+        index = PlayerIndex(self.index.min_score)
+        if self.sleeper_players:
+            mtime = os.stat(self.sleeper_players).st_mtime_ns
+            if self._sleeper_cache is None or self._sleeper_cache[0] != mtime:
+                self._sleeper_cache = (mtime, load_sleeper_players(self.sleeper_players))
+            for player in self._sleeper_cache[1]:
+                index.add(**player)
+        if self.db_path:
+            for player_id, player_name in load_keepers(self.db_path):
+                index.add(player_id, player_name)
+        self.index = index
+
+    def resolve(
+        self,
+        name: str,
+        position: str | None = None,
+        team: str | None = None,
+    ) -> str | None:
+        key = f"{position}:{name}"
+        player_id = self.mapping.get(key)
+        if player_id is None:
+            player_id = self.index.lookup(name, position, team)
+            if player_id is not None:
+                with self._lock:
+                    self.mapping[key] = player_id
+                    self._dirty = True
+        return player_id
+
+    def annotate(self, records: list[dict]) -> list[dict]:
+        """Set "Player ID" on every record in place"""
+        for record in records:
+            record["Player ID"] = self.resolve(
+                record["Player"], record.get("Position"), record.get("Team")
+            )
+        return records
+
+    def save(self) -> None:
+        """Write the map if new names were resolved since the last save"""
+        with self._lock:
+            if self.map_path is None or not self._dirty:
+                return
+            self.map_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.map_path, json.dumps(self.mapping, indent=0, sort_keys=True))
+            self._dirty = False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve player names to Sleeper ids")
+    parser.add_argument("names", nargs="+", help="Player names to resolve")
+    parser.add_argument("--db", help="SQLite database whose keepers table is indexed")
+    parser.add_argument("--sleeper-players", help="Saved Sleeper /players/nfl JSON")
+    parser.add_argument("--position", help="Position of every name (e.g. WR, DST)")
+    args = parser.parse_args()
+
+    resolver = PlayerResolver.build(args.db, args.sleeper_players)
+    for name in args.names:
+        print(json.dumps({"name": name, "player_id": resolver.resolve(name, args.position)}))
+
+
+if __name__ == "__main__":
+    main()
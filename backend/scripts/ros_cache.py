@@ -0,0 +1,50 @@
+"""
+On-disk cache of fetched ROS pages.
+
+One JSON file per URL holds the page's HTTP validators, a fingerprint of
+its body and the players extracted from it, so an unchanged page is neither
+downloaded again (304 Not Modified) nor re-parsed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+try:
+    from .atomic_files import atomic_write_text
+except ImportError:  # run as a script from backend/scripts
+    from atomic_files import atomic_write_text
+
+
+class ResponseCache:
+    """On-disk cache of page validators and the players extracted from them.
+
+    Each entry also fingerprints its page: ``content_hash`` of the body and
+    ``changed_at``, when that hash last changed.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, url: str) -> dict | None:
+        """Return the cached entry for a URL, or None when absent or unreadable"""
+        try:
+            with open(self._entry_path(url), encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url:
+            return None
+        return entry
+
+    def store(self, url: str, entry: dict) -> None:
+        """Atomically persist an entry so concurrent readers never see partial files"""
+        atomic_write_text(self._entry_path(url), json.dumps(dict(entry, url=url)))
@@ -0,0 +1,109 @@
+"""
+Write scraped ROS rankings into the ros_rankings table.
+
+``sync_rankings_to_db`` diffs a run's records against the rows already
+stored and applies only the inserts, updates and deletes, in one
+transaction, so ``MAX(updated_at)`` moves only when a projection really
+changed.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+# Scoring format of records that carry none, and of ros_rankings rows
+# written before the scoring_format column existed
+DEFAULT_SCORING_FORMAT = "half"
+
+
+def sync_rankings_to_db(
+    db_path: str | os.PathLike,
+    records: list[dict],
+    pages: set[tuple[str, str]] | None = None,
+) -> dict[str, int]:
+    """Diff records against ros_rankings and apply only the changes.
+
+    Rows are matched on (player_name, position, scoring_format). New players
+    are inserted, players whose team or projection moved are updated
+    (bumping ``updated_at``), and players no longer listed are deleted.
+    Records carrying SOS ranks or a "Player ID" also diff and write
+    sos_season, sos_playoffs and player_id; without them those columns are
+    left alone. Only the (position, scoring format) pages present in
+    ``records`` are touched, or the given ``pages`` even when no record is
+    left for them, so a page that failed to scrape keeps its old rows.
+    Everything runs in a single transaction.
+    """
+    if pages is None:
+        pages = {
+            (record["Position"], record.get("Scoring", DEFAULT_SCORING_FORMAT))
+            for record in records
+        }
+    desired = {
+        (record["Player"], record["Position"], record.get("Scoring", DEFAULT_SCORING_FORMAT)): record
+        for record in records
+        if (record["Position"], record.get("Scoring", DEFAULT_SCORING_FORMAT)) in pages
+    }
+    # (column, record key) pairs compared to decide whether a row changed
+    tracked = [("team", "Team"), ("proj_pts", "Proj. Fpts")]
+    if any("SOS Season" in record for record in records):
+        tracked += [("sos_season", "SOS Season"), ("sos_playoffs", "SOS Playoffs")]
+    if any("Player ID" in record for record in records):
+        tracked.append(("player_id", "Player ID"))
+    tracked_columns = ", ".join(column for column, _ in tracked)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(ros_rankings)")}
+            if "scoring_format" not in columns:
+                conn.execute(
+                    "ALTER TABLE ros_rankings ADD COLUMN scoring_format TEXT NOT NULL "
+                    f"DEFAULT '{DEFAULT_SCORING_FORMAT}'"
+                )
+            if "player_id" not in columns:
+                conn.execute("ALTER TABLE ros_rankings ADD COLUMN player_id TEXT")
+            existing: dict[tuple[str, str, str], tuple[int, tuple]] = {}
+            duplicate_ids: list[tuple[int]] = []
+            for position, fmt in sorted(pages):
+                rows = conn.execute(
+                    f"SELECT id, player_name, {tracked_columns} FROM ros_rankings "
+                    "WHERE position = ? AND scoring_format = ? ORDER BY id",
+                    (position, fmt),
+                )
+                for row_id, player_name, *values in rows:
+                    key = (player_name, position, fmt)
+                    if key in existing:
+                        duplicate_ids.append((row_id,))
+                    else:
+                        existing[key] = (row_id, tuple(values))
+
+            inserts = []
+            updates = []
+            for key, record in desired.items():
+                values = tuple(record.get(field) for _, field in tracked)
+                current = existing.get(key)
+                if current is None:
+                    inserts.append((record["Player"], *key[1:], *values))
+                elif current[1] != values:
+                    updates.append((*values, current[0]))
+            deletes = [(row_id,) for key, (row_id, _) in existing.items() if key not in desired]
+
+            conn.executemany(
+                "INSERT INTO ros_rankings "
+                f"(player_name, position, scoring_format, {tracked_columns}) "
+                f"VALUES (?, ?, ?, {', '.join('?' for _ in tracked)})",
+                inserts,
+            )
+            assignments = ", ".join(f"{column} = ?" for column, _ in tracked)
+            conn.executemany(
+                f"UPDATE ros_rankings SET {assignments}, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                updates,
+            )
+            conn.executemany("DELETE FROM ros_rankings WHERE id = ?", deletes + duplicate_ids)
+    finally:
+        conn.close()
+
+    return {"added": len(inserts), "changed": len(updates), "removed": len(deletes)}
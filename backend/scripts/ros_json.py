@@ -0,0 +1,233 @@
+"""
+Locate and decode the JSON payloads FantasyPros embeds in script blocks.
+
+``iter_json_candidates`` finds every ``window.ecrData = {...}``-style
+assignment (or a bare JSON document) in one regex pass and decodes each value
+in place. ``iter_json_elements`` walks a large payload's arrays element by
+element instead of decoding it whole, so a low-memory extraction only ever
+holds one small element at a time.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+
+JSON_ASSIGNMENT_PREFIXES = (
+    "window.__NUXT__",
+    "window.ecrData",
+    "window.ecrDataProps",
+    "var ecrData",
+    "var data",
+    "var playerData",
+    "var rankingsData",
+    "const ecrData",
+    "const data",
+)
+
+# Longest prefixes first so "window.ecrDataProps" is not reported as
+# "window.ecrData" when both could match at the same offset.
+_JSON_PREFIX_RE = re.compile(
+    "|".join(
+        re.escape(prefix)
+        for prefix in sorted(JSON_ASSIGNMENT_PREFIXES, key=len, reverse=True)
+    )
+)
+_JSON_START_RE = re.compile(r"[\[{]")
+_NON_SPACE_RE = re.compile(r"\S")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _decode_json_at(
+    text: str, start: int, on_error=None, stats: dict | None = None, decode=None
+):
+    """Decode the JSON value assigned at ``start``, following an IIFE's final
+    ``return`` or the first brace when the value is not a literal.
+
+    ``decode(text, index)`` replaces the default full ``raw_decode`` of the
+    value; it signals malformed JSON with ``json.JSONDecodeError``."""
+    match = _NON_SPACE_RE.search(text, start)
+    if match is None:
+        return None
+    index = match.start()
+
+    if text[index] not in "[{":
+        return_index = text.rfind("return", index)
+        if return_index != -1 and text.find("function", index) != -1:
+            match = _NON_SPACE_RE.search(text, return_index + len("return"))
+            while match is not None and text[match.start()] == "(":
+                match = _NON_SPACE_RE.search(text, match.start() + 1)
+            if match is not None and text[match.start()] in "[{":
+                index = match.start()
+        if text[index] not in "[{":
+            match = _JSON_START_RE.search(text, index)
+            if match is None:
+                return None
+            index = match.start()
+
+    started = time.perf_counter()
+    try:
+        if decode is not None:
+            return decode(text, index)
+        return _JSON_DECODER.raw_decode(text, index)[0]
+    except json.JSONDecodeError as exc:
+        if stats is not None:
+            stats["json_decode_failures"] += 1
+        if on_error is not None:
+            on_error(exc)
+        return None
+    finally:
+        if stats is not None:
+            stats["json_decode"] += time.perf_counter() - started
+            stats["candidates_tried"] += 1
+
+
+def iter_json_candidates(
+    text: str,
+    script_type: str | None = None,
+    only_source: str | None = None,
+    on_error=None,
+    stats: dict | None = None,
+    decode=None,
+):
+    """Yield (source, data) for each JSON payload embedded in a script body.
+
+    Every assignment prefix is located in a single regex pass and each value
+    is decoded in place with ``raw_decode``, so the script text is scanned
+    once regardless of how many prefixes match. ``source`` names the prefix
+    (or ``application/json`` / ``braces``) the payload was found by. When
+    given, ``stats`` accumulates ``candidates_tried``, ``json_decode`` seconds
+    and ``json_decode_failures``. ``decode`` is passed on to
+    ``_decode_json_at``. Each payload is released before the next one is
+    decoded, so at most one is alive at a time.
+    """
+    if script_type == "application/json":
+        if only_source in (None, "application/json"):
+            data = _decode_json_at(text, 0, on_error, stats, decode)
+            if data is not None:
+                yield "application/json", data
+        return
+
+    found = False
+    seen_prefixes: set[str] = set()
+    for match in _JSON_PREFIX_RE.finditer(text):
+        prefix = match.group()
+        if prefix in seen_prefixes:
+            continue
+        seen_prefixes.add(prefix)
+        # The brace fallback only applies when no prefix yielded a payload,
+        # so a "braces" filter still has to decode the prefixed values.
+        if only_source not in (None, prefix, "braces"):
+            continue
+        equals = text.find("=", match.end())
+        data = _decode_json_at(
+            text, match.end() if equals == -1 else equals + 1, on_error, stats, decode
+        )
+        if data is not None:
+            found = True
+            if only_source in (None, prefix):
+                yield prefix, data
+        data = None
+
+    if found or only_source not in (None, "braces"):
+        return
+    first = text.find("{")
+    if first != -1 and text.rfind("}") > first:
+        data = _decode_json_at(text, first, on_error, stats, decode)
+        if data is not None:
+            yield "braces", data
+
+
+# Array elements up to this many characters of JSON are decoded whole by
+# iter_json_elements; a player entry is a few hundred bytes to a few KB
+STREAM_ELEMENT_CHARS = 65536
+# Everything up to the next bracket outside a string literal
+_SKIP_TO_BRACKET_RE = re.compile(r'(?:[^"\[\]{}]+|"(?:[^"\\]|\\.)*")*')
+_SCALAR_END_RE = re.compile(r"[,\]}\s]")
+_WHITESPACE_RE = re.compile(r"\s*")
+
+
+def _skip_json_value(text: str, index: int, limit: int | None = None) -> int | None:
+    """End offset of the JSON value starting at ``index``, or None once a
+    container runs past ``limit`` characters"""
+    char = text[index]
+    if char == '"':
+        return json.decoder.scanstring(text, index + 1)[1]
+    if char not in "[{":
+        match = _SCALAR_END_RE.search(text, index)
+        return match.start() if match else len(text)
+
+    stop = len(text) if limit is None else min(len(text), index + limit)
+    depth = 0
+    position = index
+    while position < stop:
+        char = text[position]
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        else:  # a string literal cut off by ``stop`` or never closed
+            break
+        position = _SKIP_TO_BRACKET_RE.match(text, position + 1, stop).end()
+    if stop < len(text):
+        return None
+    raise json.JSONDecodeError("Unterminated container", text, index)
+
+
+def iter_json_elements(text: str, index: int, max_chars: int = STREAM_ELEMENT_CHARS):
+    """Yield (path, value) for array elements in the JSON value at ``index``
+    without decoding the whole value.
+
+    Objects and arrays are walked iteratively. An array element whose JSON
+    text fits in ``max_chars`` is decoded on its own and yielded; a bigger
+    one is walked in turn, so only one small element is ever materialized.
+    ``path`` holds the keys and indexes leading to the element.
+    """
+    index = _WHITESPACE_RE.match(text, index).end()
+    if index >= len(text) or text[index] not in "[{":
+        raise json.JSONDecodeError("Expecting an object or array", text, index)
+    # [kind, cursor, path, next array index] per open container
+    stack: list[list] = [[text[index], index + 1, (), 0]]
+    while stack:
+        frame = stack[-1]
+        kind = frame[0]
+        position = _WHITESPACE_RE.match(text, frame[1]).end()
+        if position >= len(text):
+            raise json.JSONDecodeError("Unterminated container", text, position)
+        char = text[position]
+        if char == ("]" if kind == "[" else "}"):
+            stack.pop()
+            if stack:
+                stack[-1][1] = position + 1
+            continue
+        if char == ",":
+            position = _WHITESPACE_RE.match(text, position + 1).end()
+
+        if kind == "{":
+            if not text.startswith('"', position):
+                raise json.JSONDecodeError("Expecting property name", text, position)
+            step, position = json.decoder.scanstring(text, position + 1)
+            position = _WHITESPACE_RE.match(text, position).end()
+            if not text.startswith(":", position):
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, position)
+            position = _WHITESPACE_RE.match(text, position + 1).end()
+        else:
+            step = frame[3]
+            frame[3] += 1
+
+        if position >= len(text):
+            raise json.JSONDecodeError("Expecting value", text, position)
+        char = text[position]
+        if char not in "[{":
+            frame[1] = _skip_json_value(text, position)
+            continue
+        if kind == "[":
+            end = _skip_json_value(text, position, max_chars)
+            if end is not None:
+                frame[1] = end
+                yield frame[2] + (step,), _JSON_DECODER.raw_decode(text, position)[0]
+                continue
+        stack.append([char, position + 1, frame[2] + (step,), 0])
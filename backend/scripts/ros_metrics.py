@@ -0,0 +1,136 @@
+"""
+Per-stage timings and counters for a scrape run.
+
+``ScrapeMetrics`` collects, per position, where the time of a run went
+(waiting on rate limits, the request, decoding, JSON parsing, extraction)
+along with byte and retry counts, and renders them as a dict for --json or
+as Prometheus text for --metrics-file. ``timed_iter`` charges the time a
+generator spends producing items to one of those stages.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+def timed_iter(iterable, stats: dict, stage: str, counter: str | None = None):
+    """Re-yield ``iterable``, charging only the time spent producing items to
+    ``stats[stage]`` and counting them in ``stats[counter]``"""
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            stats[stage] += time.perf_counter() - started
+            return
+        stats[stage] += time.perf_counter() - started
+        if counter is not None:
+            stats[counter] += 1
+        yield item
+        # Let the consumer drop the item before the next one is produced
+        del item
+
+
+class ScrapeMetrics:
+    """Per-position stage timings and counters for one scrape run.
+
+    Stages, in seconds: ``wait`` (host slot and rate limit), ``request``
+    (until response headers, including DNS, connect and TLS on a new
+    connection), ``download`` (body transfer and decompression), ``decode``
+    (bytes to text), ``parse`` (script discovery), ``candidates`` (locating
+    JSON payloads), ``json_decode``, ``extract`` (the player search) and
+    ``total``.
+    """
+
+    STAGES = (
+        "wait",
+        "request",
+        "download",
+        "decode",
+        "parse",
+        "candidates",
+        "json_decode",
+        "extract",
+        "total",
+    )
+    COUNTERS = (
+        "script_tags",
+        "candidates_tried",
+        "json_decode_failures",
+        "bytes",
+        "wire_bytes",
+        "players",
+        "retries",
+        "hedges",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.positions: dict[str, dict[str, dict[str, float]]] = {}
+
+    @classmethod
+    def new_stats(cls) -> dict[str, float]:
+        """Scratch dict for one stage's measurements, merged with ``add``"""
+        return {key: 0 for key in (*cls.STAGES, *cls.COUNTERS)}
+
+    def add(self, position: str, stats: dict[str, float]) -> None:
+        with self._lock:
+            entry = self.positions.setdefault(
+                position,
+                {
+                    "seconds": dict.fromkeys(self.STAGES, 0.0),
+                    "counts": dict.fromkeys(self.COUNTERS, 0),
+                },
+            )
+            for stage in self.STAGES:
+                entry["seconds"][stage] += stats.get(stage, 0)
+            for counter in self.COUNTERS:
+                entry["counts"][counter] += stats.get(counter, 0)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            positions = {
+                position: {
+                    "seconds": {
+                        stage: round(seconds, 6) for stage, seconds in entry["seconds"].items()
+                    },
+                    "counts": dict(entry["counts"]),
+                }
+                for position, entry in self.positions.items()
+            }
+        totals = {
+            "seconds": {
+                stage: round(sum(entry["seconds"][stage] for entry in positions.values()), 6)
+                for stage in self.STAGES
+            },
+            "counts": {
+                counter: sum(entry["counts"][counter] for entry in positions.values())
+                for counter in self.COUNTERS
+            },
+        }
+        return {"positions": positions, "totals": totals}
+
+    def to_prometheus(self, prefix: str = "fp_ros_scraper") -> str:
+        """Render the run in Prometheus text exposition format"""
+        positions = self.as_dict()["positions"]
+        lines = [
+            f"# HELP {prefix}_stage_seconds Seconds spent per stage in the last scrape",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for position, entry in sorted(positions.items()):
+            for stage, seconds in entry["seconds"].items():
+                lines.append(
+                    f'{prefix}_stage_seconds{{position="{position}",stage="{stage}"}} {seconds}'
+                )
+        lines += [
+            f"# HELP {prefix}_count Counters from the last scrape",
+            f"# TYPE {prefix}_count gauge",
+        ]
+        for position, entry in sorted(positions.items()):
+            for counter, value in entry["counts"].items():
+                lines.append(
+                    f'{prefix}_count{{position="{position}",counter="{counter}"}} {value}'
+                )
+        return "\n".join(lines) + "\n"
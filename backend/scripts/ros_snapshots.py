@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Append-only store of historical ROS projection snapshots.
+
+Every scraper run appends its rows to a handful of fixed-width column files
+instead of copying the whole table, so a season of weekly refreshes stays
+small and a player's projection history can be read back without loading
+every snapshot:
+
+    dictionary.jsonl  one JSON string per line; a string's id is its line
+    player.u32        dictionary id of the player name, one per row
+    team.u32          dictionary id of the team
+    position.u32      dictionary id of the position
+    proj.f32          projected fantasy points
+    runs.jsonl        {"run", "offset", "count"} per run, written last
+
+A run only becomes visible once its line lands in runs.jsonl, so rows left
+behind by an interrupted append are ignored and overwritten by the next one.
+The store assumes a single writer.
+
+    python backend/scripts/ros_snapshots.py DIR --player "Justin Jefferson"
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import os
+import sys
+from array import array
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+# (file name, array typecode) for every per-row column
+COLUMNS = (
+    ("player.u32", "I"),
+    ("team.u32", "I"),
+    ("position.u32", "I"),
+    ("proj.f32", "f"),
+)
+CHUNK_ROWS = 65536
+FORMAT_VERSION = 1
+
+
+class SnapshotStore:
+    """Columnar, dictionary-encoded history of scraper runs in ``root``"""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._check_meta()
+        self._strings: list[str] | None = None
+        self._ids: dict[str, int] = {}
+
+    def _check_meta(self) -> None:
+        meta_path = self.root / "meta.json"
+        meta = {"version": FORMAT_VERSION, "byteorder": sys.byteorder}
+        if not meta_path.exists():
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            return
+        found = json.loads(meta_path.read_text(encoding="utf-8"))
+        if found != meta:
+            raise ValueError(f"Unsupported snapshot store format in {self.root}: {found}")
+
+    def _load_dictionary(self) -> list[str]:
+        if self._strings is None:
+            path = self.root / "dictionary.jsonl"
+            self._strings = []
+            if path.exists():
+                with path.open(encoding="utf-8") as handle:
+                    self._strings = [json.loads(line) for line in handle if line.strip()]
+            self._ids = {value: index for index, value in enumerate(self._strings)}
+        return self._strings
+
+    def _lookup(self, value: str) -> int | None:
+        self._load_dictionary()
+        return self._ids.get(value)
+
+    def _encode(self, values: list[str]) -> array:
+        """Dictionary ids for ``values``, appending unseen strings first"""
+        strings = self._load_dictionary()
+        new = []
+        ids = array("I")
+        for value in values:
+            index = self._ids.get(value)
+            if index is None:
+                index = len(strings)
+                strings.append(value)
+                self._ids[value] = index
+                new.append(value)
+            ids.append(index)
+        if new:
+            with (self.root / "dictionary.jsonl").open("a", encoding="utf-8") as handle:
+                handle.writelines(json.dumps(value) + "\n" for value in new)
+                handle.flush()
+                os.fsync(handle.fileno())
+        return ids
+
+    def runs(self) -> list[dict]:
+        """Committed runs in append order"""
+        path = self.root / "runs.jsonl"
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+    def append(self, records: list[dict], run_at: datetime | None = None) -> dict:
+        """Store one run of scraper records and return its runs.jsonl entry"""
+        runs = self.runs()
+        offset = runs[-1]["offset"] + runs[-1]["count"] if runs else 0
+        run_at = run_at or datetime.now(timezone.utc)
+
+        columns = (
+            self._encode([record["Player"] for record in records]),
+            self._encode([record["Team"] or "" for record in records]),
+            self._encode([record["Position"] for record in records]),
+            array("f", [record["Proj. Fpts"] for record in records]),
+        )
+        for (name, typecode), values in zip(COLUMNS, columns):
+            path = self.root / name
+            with path.open("ab") as handle:
+                # Drop rows written by an append that never committed
+                handle.truncate(offset * array(typecode).itemsize)
+                values.tofile(handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        entry = {
+            "run": run_at.isoformat(timespec="seconds"),
+            "offset": offset,
+            "count": len(records),
+        }
+        with (self.root / "runs.jsonl").open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        return entry
+
+    def _iter_chunks(self, runs: list[dict]) -> Iterator[tuple[int, tuple[array, ...]]]:
+        """Yield (first row, column arrays) over committed rows, chunk by chunk"""
+        total = runs[-1]["offset"] + runs[-1]["count"] if runs else 0
+        with ExitStack() as stack:
+            handles = [stack.enter_context((self.root / name).open("rb")) for name, _ in COLUMNS]
+            row = 0
+            while row < total:
+                size = min(CHUNK_ROWS, total - row)
+                chunk = []
+                for handle, (_, typecode) in zip(handles, COLUMNS):
+                    values = array(typecode)
+                    values.fromfile(handle, size)
+                    chunk.append(values)
+                yield row, tuple(chunk)
+                row += size
+
+    def player_series(self, player: str, position: str | None = None) -> list[dict]:
+        """Projection history for one player, oldest run first"""
+        player_id = self._lookup(player)
+        position_id = self._lookup(position) if position is not None else None
+        if player_id is None or (position is not None and position_id is None):
+            return []
+
+        runs = self.runs()
+        starts = [run["offset"] for run in runs]
+        strings = self._load_dictionary()
+        series = []
+        for first_row, (players, teams, positions, projections) in self._iter_chunks(runs):
+            index = -1
+            while True:
+                try:
+                    index = players.index(player_id, index + 1)
+                except ValueError:
+                    break
+                if position_id is not None and positions[index] != position_id:
+                    continue
+                run = runs[bisect.bisect_right(starts, first_row + index) - 1]
+                series.append(
+                    {
+                        "run": run["run"],
+                        "team": strings[teams[index]],
+                        "position": strings[positions[index]],
+                        "proj_pts": round(projections[index], 2),
+                    }
+                )
+        return series
+
+    def position_series(self, position: str) -> Iterator[tuple[str, dict[str, float]]]:
+        """Yield (run, {player: projection}) for every run that has ``position``"""
+        position_id = self._lookup(position)
+        if position_id is None:
+            return
+
+        runs = self.runs()
+        strings = self._load_dictionary()
+        run_index = 0
+        current: dict[str, float] = {}
+        for first_row, (players, _, positions, projections) in self._iter_chunks(runs):
+            for offset, value in enumerate(positions):
+                row = first_row + offset
+                while row >= runs[run_index]["offset"] + runs[run_index]["count"]:
+                    if current:
+                        yield runs[run_index]["run"], current
+                        current = {}
+                    run_index += 1
+                if value == position_id:
+                    current[strings[players[offset]]] = round(projections[offset], 2)
+        if current:
+            yield runs[run_index]["run"], current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query ROS projection snapshots")
+    parser.add_argument("root", help="Snapshot store directory")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--player", help="Print one player's projection history")
+    group.add_argument("--position", help="Print every run's projections for a position")
+    group.add_argument("--runs", action="store_true", help="List stored runs")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.runs:
+        rows = store.runs()
+    elif args.player:
+        rows = store.player_series(args.player)
+    else:
+        rows = [
+            {"run": run, "players": players}
+            for run, players in store.position_series(args.position)
+        ]
+    for row in rows:
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
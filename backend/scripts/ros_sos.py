@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Strength-of-schedule ranks for the ROS rankings.
+
+Two local files feed the calculation:
+
+    schedule        one row per game: week, home, away
+                    (CSV with a header row, or a JSON list of objects)
+    points allowed  fantasy points each defense allows per game to a
+                    position: team, position, points_allowed
+                    (CSV, a JSON list of objects, or {position: {team: value}})
+
+The schedule becomes a 32 x 18 grid of opponent indices, one row per team
+and one column per week (-1 on a bye), and every position's points-allowed
+vector is gathered through that grid in one step. The mean over the rest of
+the season and over the fantasy playoff weeks is ranked 1-32, where 1 is the
+softest schedule (opponents allow the most points). Team codes follow the
+aliases used by gameStatusService.js, and D/ST names such as "Buffalo Bills"
+resolve to their team.
+
+    python backend/scripts/ros_sos.py --schedule 2025.csv --points-allowed pa.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .nfl_teams import TEAMS, team_code
+except ImportError:  # run as a script from backend/scripts
+    from nfl_teams import TEAMS, team_code
+
+WEEKS = 18
+# This league's regular season is 14 weeks, so its playoffs run 15-17
+PLAYOFF_WEEKS = (15, 16, 17)
+
+_TEAM_INDEX = {team: index for index, team in enumerate(TEAMS)}
+
+
+def _read_rows(path: str | os.PathLike) -> list[dict] | dict:
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        return json.loads(text)
+    return list(csv.DictReader(text.splitlines()))
+
+
+def _require_team(value, path) -> int:
+    team = team_code(value)
+    if team is None:
+        raise ValueError(f"Unknown team {value!r} in {path}")
+    return _TEAM_INDEX[team]
+
+
+def load_schedule(path: str | os.PathLike, weeks: int = WEEKS) -> np.ndarray:
+    """Opponent index grid of shape (teams, weeks); -1 marks a bye"""
+    opponents = np.full((len(TEAMS), weeks), -1, dtype=np.int16)
+    for row in _read_rows(path):
+        week = int(row["week"])
+        if not 1 <= week <= weeks:
+            raise ValueError(f"Week {week} outside 1-{weeks} in {path}")
+        home = _require_team(row["home"], path)
+        away = _require_team(row["away"], path)
+        opponents[home, week - 1] = away
+        opponents[away, week - 1] = home
+    return opponents
+
+
+def load_points_allowed(path: str | os.PathLike) -> dict[str, np.ndarray]:
+    """Points allowed per game by each defense, as a team-indexed vector per
+    position; teams missing from the file are NaN"""
+    data = _read_rows(path)
+    if isinstance(data, dict):
+        data = [
+            {"team": team, "position": position, "points_allowed": value}
+            for position, teams in data.items()
+            for team, value in teams.items()
+        ]
+    allowed: dict[str, np.ndarray] = {}
+    for row in data:
+        position = str(row["position"]).strip().upper()
+        if position in ("D/ST", "DEF"):
+            position = "DST"
+        vector = allowed.setdefault(position, np.full(len(TEAMS), np.nan))
+        vector[_require_team(row["team"], path)] = float(row["points_allowed"])
+    return allowed
+
+
+def _window_mean(faced: np.ndarray, weeks: list[int]) -> np.ndarray:
+    """Mean over the given 1-based weeks, ignoring byes; NaN without games"""
+    window = faced[..., [week - 1 for week in weeks if week <= faced.shape[-1]]]
+    games = (~np.isnan(window)).sum(axis=-1)
+    totals = np.nansum(window, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(games > 0, totals / games, np.nan)
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    """Rank each row descending (1 = most points allowed); 0 where NaN"""
+    order = np.argsort(-np.nan_to_num(values, nan=-np.inf), axis=-1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(
+        ranks, order, np.broadcast_to(np.arange(1, values.shape[-1] + 1), order.shape), axis=-1
+    )
+    return np.where(np.isnan(values), 0, ranks)
+
+
+def compute_sos(
+    opponents: np.ndarray,
+    allowed: np.ndarray,
+    from_week: int = 1,
+    playoff_weeks: tuple[int, ...] = PLAYOFF_WEEKS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Season and playoff SOS ranks, each of shape (positions, teams).
+
+    ``allowed`` is (positions, teams); ``opponents`` is the schedule grid.
+    The season window starts at ``from_week`` so played games drop out.
+    """
+    faced = np.where(opponents >= 0, allowed[:, np.maximum(opponents, 0)], np.nan)
+    season = _window_mean(faced, list(range(from_week, opponents.shape[1] + 1)))
+    playoffs = _window_mean(faced, [week for week in playoff_weeks if week >= from_week])
+    return _rank(season), _rank(playoffs)
+
+
+class SosTable:
+    """SOS ranks keyed by (position, team), ready to annotate records"""
+
+    def __init__(
+        self,
+        opponents: np.ndarray,
+        allowed: dict[str, np.ndarray],
+        from_week: int = 1,
+        playoff_weeks: tuple[int, ...] = PLAYOFF_WEEKS,
+    ):
+        self.positions = tuple(allowed)
+        matrix = np.empty((len(self.positions), len(TEAMS)))
+        for row, position in enumerate(self.positions):
+            matrix[row] = allowed[position]
+        season, playoffs = compute_sos(opponents, matrix, from_week, playoff_weeks)
+        self.ranks: dict[tuple[str, str], tuple[int | None, int | None]] = {
+            (position, team): (
+                int(season[row, column]) or None,
+                int(playoffs[row, column]) or None,
+            )
+            for row, position in enumerate(self.positions)
+            for column, team in enumerate(TEAMS)
+        }
+
+    @classmethod
+    def from_files(
+        cls,
+        schedule: str | os.PathLike,
+        points_allowed: str | os.PathLike,
+        from_week: int = 1,
+        playoff_weeks: tuple[int, ...] = PLAYOFF_WEEKS,
+    ) -> SosTable:
+        return cls(
+            load_schedule(schedule), load_points_allowed(points_allowed), from_week, playoff_weeks
+        )
+
+    def lookup(self, position: str, team: str | None) -> tuple[int | None, int | None]:
+        return self.ranks.get((position, team_code(team)), (None, None))
+
+    def annotate(self, records: list[dict]) -> list[dict]:
+        """Set "SOS Season" and "SOS Playoffs" on every record in place"""
+        for record in records:
+            team = record.get("Team")
+            if record.get("Position") == "DST" and team_code(team) is None:
+                team = record.get("Player")
+            season, playoffs = self.lookup(record.get("Position"), team)
+            record["SOS Season"] = season
+            record["SOS Playoffs"] = playoffs
+        return records
+
+
+def parse_weeks(value: str) -> tuple[int, ...]:
+    """"15,16,17" or "15-17" as a tuple of weeks"""
+    weeks: list[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = part.split("-", 1)
+            weeks.extend(range(int(first), int(last) + 1))
+        elif part:
+            weeks.append(int(part))
+    return tuple(weeks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print SOS ranks per position and team")
+    parser.add_argument("--schedule", required=True, help="Schedule file (week, home, away)")
+    parser.add_argument(
+        "--points-allowed",
+        required=True,
+        help="Points allowed per game file (team, position, points_allowed)",
+    )
+    parser.add_argument("--from-week", type=int, default=1, help="First week still to play")
+    parser.add_argument(
+        "--playoff-weeks",
+        type=parse_weeks,
+        default=PLAYOFF_WEEKS,
+        help="Fantasy playoff weeks, e.g. 15-17",
+    )
+    args = parser.parse_args()
+
+    table = SosTable.from_files(
+        args.schedule, args.points_allowed, args.from_week, args.playoff_weeks
+    )
+    for (position, team), (season, playoffs) in sorted(table.ranks.items()):
+        row = {"position": position, "team": team, "sos_season": season, "sos_playoffs": playoffs}
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Record and replay HTTP traffic for offline scraper runs.
+
+Both classes are requests transport adapters, mounted on the scraper's
+session in place of the default one, so fetching, retries, hedging, the
+response cache and every metric run unchanged:
+
+    RecordingAdapter  passes requests through to the network and saves each
+                      response under a directory
+    ReplayAdapter     answers from that directory without touching the
+                      network, optionally after a fixed latency and with the
+                      body trickled out at a capped bandwidth
+
+A response is stored as ``<key>.json`` (status, reason, headers) next to
+``<key>.body.gz``, the decoded body gzip-compressed; ``key`` hashes the
+method and URL. Replay serves the body with ``Content-Encoding: gzip`` so
+the compressed size is what crosses the simulated wire. A request whose
+If-None-Match matches the recorded ETag is answered with a 304, and one
+that was never recorded gets a 404.
+
+    python backend/scripts/fp_ros_scraper.py --json --record recordings/
+    python backend/scripts/fp_ros_scraper.py --json --replay recordings/ --replay-latency 0.2
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+try:
+    from .atomic_files import atomic_write_bytes
+except ImportError:  # run as a script from backend/scripts
+    from atomic_files import atomic_write_bytes
+
+# Headers that describe the wire encoding rather than the content
+_TRANSPORT_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+def _key(method: str, url: str) -> str:
+    return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()[:32]
+
+
+def save_response(
+    root: str | os.PathLike,
+    method: str,
+    url: str,
+    status: int,
+    body: bytes,
+    headers: dict | None = None,
+    reason: str = "OK",
+) -> Path:
+    """Store one response the way RecordingAdapter does and return its
+    metadata path; also used to build recordings from saved pages"""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    key = _key(method, url)
+    meta = {
+        "method": method.upper(),
+        "url": url,
+        "status": status,
+        "reason": reason,
+        "headers": {
+            name: value
+            for name, value in (headers or {}).items()
+            if name.lower() not in _TRANSPORT_HEADERS
+        },
+    }
+    # Body first: the metadata file is what makes a recording visible
+    atomic_write_bytes(root / f"{key}.body.gz", gzip.compress(body, mtime=0))
+    meta_path = root / f"{key}.json"
+    atomic_write_bytes(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+    return meta_path
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that saves every response it receives under ``root``"""
+
+    def __init__(self, root: str | os.PathLike, **kwargs):
+        super().__init__(**kwargs)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # A 304 only means something next to the 200 it revalidates
+        if response.status_code != 304:
+            save_response(
+                self.root,
+                request.method,
+                request.url,
+                response.status_code,
+                response.content,
+                dict(response.headers),
+                response.reason or "",
+            )
+        return response
+
+
+class _ThrottledBody(io.BytesIO):
+    """Response body that sleeps so reads average ``bytes_per_second``"""
+
+    def __init__(self, data: bytes, bytes_per_second: float):
+        super().__init__(data)
+        self.bytes_per_second = bytes_per_second
+
+    def _throttle(self, chunk: bytes) -> bytes:
+        if chunk:
+            time.sleep(len(chunk) / self.bytes_per_second)
+        return chunk
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self._throttle(super().read(size))
+
+    def read1(self, size: int | None = -1) -> bytes:
+        return self._throttle(super().read1(size))
+
+
+class ReplayAdapter(HTTPAdapter):
+    """HTTPAdapter that serves responses recorded under ``root``.
+
+    ``latency`` seconds pass before the headers arrive and, with
+    ``bandwidth`` (bytes per second), the compressed body downloads no
+    faster than that cap.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        latency: float = 0.0,
+        bandwidth: float | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.root = Path(root)
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"No recordings directory at {self.root}")
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = _key(request.method, request.url)
+        meta_path = self.root / f"{key}.json"
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not meta_path.exists():
+            status, reason, headers, body = 404, "Not Recorded", {}, b""
+        else:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            status, reason, headers = meta["status"], meta["reason"], dict(meta["headers"])
+            etag = headers.get("ETag") or headers.get("etag")
+            if etag and request.headers.get("If-None-Match") == etag:
+                status, reason, body = 304, "Not Modified", b""
+            else:
+                body = (self.root / f"{key}.body.gz").read_bytes()
+                headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+
+        fp = _ThrottledBody(body, self.bandwidth) if self.bandwidth else io.BytesIO(body)
+        raw = HTTPResponse(
+            body=fp,
+            headers=headers,
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=True,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
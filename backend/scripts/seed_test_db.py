@@ -68,6 +68,8 @@ def create_tables(cursor):
         proj_pts REAL,
         sos_season INTEGER,
         sos_playoffs INTEGER,
+        scoring_format TEXT NOT NULL DEFAULT 'half',
+        player_id TEXT,
         updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
       )
     """)
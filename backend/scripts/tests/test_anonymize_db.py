@@ -0,0 +1,367 @@
+from pathlib import Path
+import contextlib
+import datetime
+import functools
+import io
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import unittest.mock
+
+from backend.scripts import anonymize_db
+from backend.scripts.seed_test_db import create_tables
+
+
+MANAGERS = [
+    ("alice", "Alice Real", "alice_sleeper", "111", "alice@example.com", "1234"),
+    ("bob", "Bob Real", "bob_sleeper", "222", "bob@example.com", "5678"),
+    ("carol", "Carol Real", "carol_sleeper", "333", "carol@example.com", None),
+]
+
+
+def _seed(db_path: Path) -> None:
+    current_year = datetime.datetime.now().year
+    with sqlite3.connect(db_path) as conn:
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_tables(conn.cursor())
+        conn.executemany(
+            "INSERT INTO managers (name_id, full_name, sleeper_username, sleeper_user_id, "
+            "email, passcode) VALUES (?, ?, ?, ?, ?, ?)",
+            MANAGERS,
+        )
+        # The current year already exists, so no seasons are copied forward
+        conn.executemany(
+            "INSERT INTO league_settings (year, league_id) VALUES (?, ?)",
+            [(current_year - 1, "900"), (current_year, "901")],
+        )
+        conn.executemany(
+            "INSERT INTO team_seasons (year, name_id, team_name, wins, losses) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (year, name_id, f"{name_id} team {year}", wins, 14 - wins)
+                for year in (current_year - 1, current_year)
+                for wins, (name_id, *_) in enumerate(MANAGERS, start=5)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO manager_sleeper_ids (name_id, sleeper_user_id, season) VALUES (?, ?, ?)",
+            [(name_id, sleeper_user_id, current_year) for name_id, _, _, sleeper_user_id, *_ in MANAGERS],
+        )
+        conn.executemany(
+            "INSERT INTO rule_change_votes (proposal_id, voter_id, option) VALUES (1, ?, 'yes')",
+            [("alice",), ("carol",)],
+        )
+        # Older databases record who proposed a rule and vote in rule_votes
+        conn.execute("ALTER TABLE rule_change_proposals ADD COLUMN proposed_by TEXT")
+        conn.execute(
+            "INSERT INTO rule_change_proposals (season_year, title, options, proposed_by) "
+            "VALUES (?, 'Superflex', '[\"yes\",\"no\"]', 'bob')",
+            (current_year,),
+        )
+        conn.execute(
+            "CREATE TABLE rule_votes (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "proposal_id INTEGER NOT NULL, manager_id TEXT NOT NULL, vote TEXT NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO rule_votes (proposal_id, manager_id, vote) VALUES (1, ?, 'no')",
+            [("bob",), ("carol",)],
+        )
+        conn.execute(
+            "INSERT INTO keepers (year, roster_id, player_name, trade_note) "
+            "VALUES (?, 1, 'Puka Nacua', 'from Bob Real for a 3rd')",
+            (current_year,),
+        )
+        conn.execute(
+            "CREATE TABLE manager_emails (id INTEGER PRIMARY KEY, manager_id INTEGER, email TEXT)"
+        )
+        conn.execute("INSERT INTO manager_emails (manager_id, email) VALUES (1, 'alice@example.com')")
+
+
+class AnonymizeDbTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "fantasy_football.db"
+        _seed(self.db_path)
+
+    def _anonymize(self, **kwargs) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            anonymize_db.anonymize_db(str(self.db_path), **kwargs)
+
+    def _query(self, sql: str) -> list[tuple]:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def test_replaces_pii_and_keeps_name_ids_consistent(self):
+        before = dict(self._query("SELECT id, name_id FROM team_seasons"))
+
+        self._anonymize()
+
+        self._assert_anonymized(before)
+
+    def test_interrupted_chunked_run_resumes_from_its_checkpoint(self):
+        before = dict(self._query("SELECT id, name_id FROM team_seasons"))
+        save_progress = anonymize_db.save_progress
+
+        def interrupt_second_season_chunk(cursor, step, last_rowid, done=False):
+            # Stops before the chunk commits, so it is rolled back
+            if step == "team_seasons" and last_rowid > 2:
+                raise KeyboardInterrupt
+            save_progress(cursor, step, last_rowid, done)
+
+        with unittest.mock.patch.object(anonymize_db, "save_progress", interrupt_second_season_chunk):
+            with self.assertRaises(KeyboardInterrupt):
+                self._anonymize(chunk_size=2)
+
+        self.assertEqual(
+            [
+                ("managers", 3, 1),
+                ("map:email", 0, 1),
+                ("map:manager", 0, 1),
+                ("map:sleeper_user", 0, 1),
+                ("map:sleeper_username", 0, 1),
+                ("map:team_name", 0, 1),
+                ("team_seasons", 2, 0),
+            ],
+            self._query("SELECT step, last_rowid, done FROM _anonymize_progress ORDER BY step"),
+        )
+        seasons = dict(self._query("SELECT id, name_id FROM team_seasons"))
+        self.assertNotEqual(before[1], seasons[1])
+        self.assertEqual(before[3], seasons[3])
+
+        self._anonymize(chunk_size=2)
+
+        self._assert_anonymized(before)
+        tables = {name for (name,) in self._query("SELECT name FROM sqlite_master")}
+        self.assertFalse({name for name in tables if name.startswith("_anonymize")})
+
+    def test_parallel_workers_cover_every_rule(self):
+        before = dict(self._query("SELECT id, name_id FROM team_seasons"))
+
+        self._anonymize(chunk_size=2, workers=3)
+
+        self._assert_anonymized(before)
+        name_ids = {name_id for (name_id,) in self._query("SELECT name_id FROM managers")}
+        sleeper_ids = {
+            sleeper_user_id
+            for (sleeper_user_id,) in self._query("SELECT sleeper_user_id FROM managers")
+        }
+        self.assertEqual(
+            name_ids,
+            {name_id for (name_id,) in self._query("SELECT name_id FROM manager_sleeper_ids")},
+        )
+        self.assertEqual(
+            sleeper_ids,
+            {
+                sleeper_user_id
+                for (sleeper_user_id,) in self._query(
+                    "SELECT sleeper_user_id FROM manager_sleeper_ids"
+                )
+            },
+        )
+        voters = {voter for (voter,) in self._query("SELECT voter_id FROM rule_change_votes")}
+        self.assertEqual(2, len(voters))
+        self.assertLess(voters, name_ids)
+        self.assertEqual([(None,)], self._query("SELECT trade_note FROM keepers"))
+
+    def test_parallel_workers_always_walk_tables_in_chunks(self):
+        before = dict(self._query("SELECT id, name_id FROM team_seasons"))
+        chunk_sizes = set()
+        iter_rowid_chunks = anonymize_db.iter_rowid_chunks
+
+        def record_chunk_size(cursor, table, chunk_size, after=0):
+            chunk_sizes.add(chunk_size)
+            return iter_rowid_chunks(cursor, table, chunk_size, after)
+
+        with unittest.mock.patch.object(anonymize_db, "iter_rowid_chunks", record_chunk_size):
+            self._anonymize(workers=2)
+
+        self._assert_anonymized(before)
+        self.assertEqual({anonymize_db.PARALLEL_CHUNK_SIZE}, chunk_sizes)
+
+    def test_manager_references_still_join_after_anonymizing(self):
+        self._anonymize()
+
+        full_names = dict(
+            zip((manager[0] for manager in MANAGERS), self._query("SELECT full_name FROM managers ORDER BY id"))
+        )
+        joins = {
+            "SELECT m.full_name FROM rule_change_proposals r "
+            "LEFT JOIN managers m ON m.name_id = r.proposed_by ORDER BY r.id": ["bob"],
+            "SELECT m.full_name FROM rule_change_votes r "
+            "LEFT JOIN managers m ON m.name_id = r.voter_id ORDER BY r.id": ["alice", "carol"],
+            "SELECT m.full_name FROM rule_votes r "
+            "LEFT JOIN managers m ON m.name_id = r.manager_id ORDER BY r.id": ["bob", "carol"],
+        }
+        for sql, name_ids in joins.items():
+            with self.subTest(sql=sql):
+                self.assertEqual([full_names[name_id] for name_id in name_ids], self._query(sql))
+
+    def test_same_key_gives_byte_identical_output(self):
+        copies = {
+            name: self.db_path.with_name(f"{name}.db") for name in ("copy", "chunked", "batched", "other")
+        }
+        for path in copies.values():
+            shutil.copyfile(self.db_path, path)
+        before = dict(self._query("SELECT id, name_id FROM team_seasons"))
+
+        self._anonymize(key="secret")
+        with contextlib.redirect_stdout(io.StringIO()):
+            anonymize_db.anonymize_db(str(copies["copy"]), key="secret")
+            anonymize_db.anonymize_db(str(copies["chunked"]), chunk_size=2, key="secret")
+            anonymize_db.anonymize_db(str(copies["other"]), key="other secret")
+            # Maps assigned one value at a time match maps assigned all at once
+            build_map = functools.partial(anonymize_db.build_consistent_map, batch_size=1)
+            with unittest.mock.patch.object(anonymize_db, "build_consistent_map", build_map):
+                anonymize_db.anonymize_db(str(copies["batched"]), key="secret")
+
+        self._assert_anonymized(before)
+        self.assertEqual(self.db_path.read_bytes(), copies["copy"].read_bytes())
+        self.assertEqual(self.db_path.read_bytes(), copies["batched"].read_bytes())
+        dumps = {}
+        for name, path in {"original": self.db_path, **copies}.items():
+            with contextlib.closing(sqlite3.connect(path)) as conn:
+                dumps[name] = list(conn.iterdump())
+        # Chunking changes how the file was written, not what it holds
+        self.assertEqual(dumps["original"], dumps["chunked"])
+        self.assertNotEqual(dumps["original"], dumps["other"])
+
+    def test_assigned_pseudonyms_never_collide(self):
+        pseudonyms = anonymize_db.Pseudonymizer(b"key")
+        taken = {"100000"}
+
+        replacements = pseudonyms.assign("digits:6", "ids", [str(n) for n in range(1000)], taken)
+
+        self.assertEqual(1000, len(set(replacements.values())))
+        self.assertNotIn("100000", replacements.values())
+        reordered = pseudonyms.assign("digits:6", "ids", list(replacements)[::-1], {"100000"})
+        self.assertEqual(replacements, reordered)
+        with self.assertRaises(ValueError):
+            pseudonyms.assign("digits:1", "ids", [str(n) for n in range(10)], set())
+
+    def test_distinct_values_get_distinct_fakes(self):
+        pseudonyms = anonymize_db.Pseudonymizer(b"key")
+        # Well past the birthday bound of the two-word team names alone
+        values = [*range(20_000), *(str(n) for n in range(20_000))]
+
+        team_names = pseudonyms.assign("team_name", "map:team_name", values, set())
+        hashes = {pseudonyms.hash(value) for value in values}
+
+        self.assertEqual(len(values), len(set(team_names.values())))
+        self.assertEqual(len(values), len(hashes))
+        self.assertRegex(team_names[0], r"^[A-Z][a-z]+ [A-Z][a-z]+ [1-9][0-9]?$")
+
+    def test_custom_rules_follow_the_live_schema(self):
+        rules = Path(self.db_path).with_name("rules.json")
+        rules.write_text(json.dumps({
+            "managers": {"sleeper_username": "hash", "email": "null", "nickname": "null"},
+            "no_such_table": "delete",
+            "rule_change_votes": "delete",
+        }))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            anonymize_db.anonymize_db(str(self.db_path), rules=str(rules))
+
+        managers = self._query("SELECT name_id, sleeper_username, email FROM managers ORDER BY id")
+        self.assertEqual([manager[0] for manager in MANAGERS], [row[0] for row in managers])
+        self.assertTrue(all(len(row[1]) == 16 and row[2] is None for row in managers))
+        self.assertEqual([], self._query("SELECT * FROM rule_change_votes"))
+        output = stdout.getvalue()
+        self.assertIn("'managers.nickname' does not exist", output)
+        self.assertIn("'no_such_table' does not exist", output)
+        self.assertIn("'keepers.trade_note' looks like PII", output)
+
+    def test_rules_are_validated(self):
+        rules = Path(self.db_path).with_name("rules.json")
+        for bad in (
+            {"managers": {"email": "scramble"}},
+            {"managers": {"email": {"strategy": "fake", "fake": "nonsense"}}},
+            {"managers": {"name_id": {"strategy": "consistent-map", "map": "manager"}}},
+        ):
+            with self.subTest(rules=bad):
+                rules.write_text(json.dumps(bad))
+                with self.assertRaises(ValueError):
+                    anonymize_db.load_rules(str(rules))
+
+    def test_snapshot_is_anonymized_and_the_source_left_untouched(self):
+        source = self.db_path.with_name("production.db")
+        self.db_path.rename(source)
+        before = dict(self._query_source(source, "SELECT id, name_id FROM team_seasons"))
+        original = source.read_bytes()
+
+        # An open read transaction on the source does not block the snapshot
+        with contextlib.closing(sqlite3.connect(source)) as reader:
+            reader.execute("BEGIN")
+            reader.execute("SELECT COUNT(*) FROM managers").fetchone()
+            with contextlib.redirect_stdout(io.StringIO()):
+                done = anonymize_db.anonymize_snapshot(str(source), str(self.db_path), pages=1)
+            reader.rollback()
+
+        self.assertTrue(done)
+        self.assertEqual(original, source.read_bytes())
+        self._assert_anonymized(before)
+        with self.assertRaises(FileExistsError):
+            anonymize_db.anonymize_snapshot(str(source), str(self.db_path))
+        with self.assertRaises(ValueError):
+            anonymize_db.anonymize_snapshot(str(source), str(source))
+
+    def test_compacted_snapshot_has_no_free_pages(self):
+        source = self.db_path.with_name("production.db")
+        self.db_path.rename(source)
+        before = dict(self._query_source(source, "SELECT id, name_id FROM team_seasons"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            anonymize_db.anonymize_snapshot(str(source), str(self.db_path), compact=True)
+
+        self._assert_anonymized(before)
+        self.assertEqual([(0,)], self._query("PRAGMA freelist_count"))
+        self.assertFalse(Path(f"{self.db_path}.snapshot").exists())
+
+    def test_interrupted_snapshot_run_resumes_without_a_new_snapshot(self):
+        source = self.db_path.with_name("production.db")
+        self.db_path.rename(source)
+        before = dict(self._query_source(source, "SELECT id, name_id FROM team_seasons"))
+
+        with unittest.mock.patch.object(anonymize_db, "rewrite_table", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    anonymize_db.anonymize_snapshot(str(source), str(self.db_path), chunk_size=2)
+        with unittest.mock.patch.object(anonymize_db, "snapshot_db") as snapshot_db:
+            with contextlib.redirect_stdout(io.StringIO()):
+                anonymize_db.anonymize_snapshot(str(source), str(self.db_path), chunk_size=2)
+
+        snapshot_db.assert_not_called()
+        self._assert_anonymized(before)
+
+    @staticmethod
+    def _query_source(path: Path, sql: str) -> list[tuple]:
+        with contextlib.closing(sqlite3.connect(path)) as conn:
+            return conn.execute(sql).fetchall()
+
+    def _assert_anonymized(self, before: dict) -> None:
+        managers = self._query(
+            "SELECT id, name_id, full_name, sleeper_username, sleeper_user_id, email, passcode "
+            "FROM managers ORDER BY id"
+        )
+        original = {value for manager in MANAGERS for value in manager if value}
+        for row in managers:
+            self.assertFalse(original & set(row[1:]), row)
+            self.assertIsNone(row[-1])
+        new_name_ids = {old: row[1] for (old, *_), row in zip(MANAGERS, managers)}
+        self.assertEqual(len(MANAGERS), len(set(new_name_ids.values())))
+
+        seasons = self._query("SELECT id, name_id, team_name, wins FROM team_seasons")
+        self.assertEqual(len(before), len(seasons))
+        for season_id, name_id, team_name, wins in seasons:
+            self.assertEqual(new_name_ids[before[season_id]], name_id)
+            self.assertNotIn("team", team_name)
+            self.assertGreaterEqual(wins, 5)
+
+        self.assertNotIn(("900",), self._query("SELECT league_id FROM league_settings"))
+        self.assertEqual([], self._query("SELECT * FROM manager_emails"))
+
+
+if __name__ == "__main__":
+    unittest.main()
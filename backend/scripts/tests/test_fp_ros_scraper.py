@@ -1,7 +1,20 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+import io
+import json
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+import unittest.mock
 
-from backend.scripts.fp_ros_scraper import FantasyProsScraper
+import requests
+
+from backend.scripts import fp_ros_scraper
+from backend.scripts.fp_ros_scraper import FantasyProsScraper, ScrapeMetrics, TokenBucket
 
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -85,5 +98,1022 @@ class FantasyProsScraperTest(unittest.TestCase):
         self.assertAlmostEqual(second["Proj. Fpts"], 110.1)
 
 
+
+class ScriptParserTest(unittest.TestCase):
+    FIXTURE_POSITIONS = {
+        "ros_dst_fixture.html": "DST",
+        "ros_wr_fixture.html": "WR",
+        "ros_wr_iife_fixture.html": "WR",
+        "ros_wr_nested_proj_fixture.html": "WR",
+    }
+
+    def test_fast_parsers_match_beautifulsoup_on_fixtures(self):
+        parsers = ["scan"]
+        if fp_ros_scraper._HAS_LXML:
+            parsers.append("lxml")
+
+        for name, position in self.FIXTURE_POSITIONS.items():
+            html = (FIXTURES / name).read_text()
+            expected = FantasyProsScraper(
+                debug=False, script_parser="bs4"
+            ).extract_player_data(html, position)
+            for parser in parsers:
+                with self.subTest(fixture=name, parser=parser):
+                    scraper = FantasyProsScraper(debug=False, script_parser=parser)
+                    self.assertEqual(expected, scraper.extract_player_data(html, position))
+
+    def test_scan_skips_commented_scripts_and_reads_type(self):
+        html = (
+            "<!-- <script>var data = {}</script> -->"
+            "<SCRIPT type='application/json'>[1]</SCRIPT>"
+            "<script src=\"x.js\"></script >"
+        )
+        self.assertEqual(
+            [("[1]", "application/json"), ("", None)],
+            list(fp_ros_scraper.iter_script_blocks(html, "scan")),
+        )
+
+
+class FieldResolutionTest(unittest.TestCase):
+    def _extract(self, scraper, players, position="WR"):
+        html = "<script>var data = %s;</script>" % json.dumps({"players": players})
+        return scraper.extract_player_data(html, position)
+
+    def test_field_priorities_are_preserved(self):
+        scraper = FantasyProsScraper(debug=False)
+        players = self._extract(
+            scraper,
+            [
+                {
+                    "stats": {"proj": "90", "ros": {"fantasy_points": "120.5"}},
+                    "meta": {"display_name": "Nested Name"},
+                    "player_name": "Direct Name",
+                    "info": {"team": {"short_name": "KC"}},
+                },
+                {
+                    "player": {"name": "Fallback Proj"},
+                    "team": "BUF",
+                    "stats": {"proj": {"raw": "77.5"}},
+                },
+            ],
+        )
+        self.assertEqual(
+            [
+                {"Player": "Direct Name", "Team": "KC", "Position": "WR", "Proj. Fpts": 120.5},
+                {"Player": "Fallback Proj", "Team": "BUF", "Position": "WR", "Proj. Fpts": 77.5},
+            ],
+            players,
+        )
+
+    def test_key_classification_is_cached_per_position(self):
+        scraper = FantasyProsScraper(debug=False)
+        html = (FIXTURES / "ros_wr_fixture.html").read_text()
+        scraper.extract_player_data(html, "WR")
+
+        families = scraper._key_families["WR"]
+        self.assertEqual(
+            ("entry_projection", "projection", "projection_any"), families["fpts"]
+        )
+        self.assertIn("name", families["display_name"])
+        self.assertNotIn("DST", scraper._key_families)
+
+    def _candidates(self, text, script_type=None, only_source=None):
+        return list(
+            fp_ros_scraper.iter_json_candidates(text, script_type, only_source)
+        )
+
+    def test_each_prefix_is_decoded_once_in_order(self):
+        text = (
+            'window.ecrDataProps = {"a": 1}; var ecrData = [{"b": "}"}];'
+            ' var ecrData = {"ignored": true};'
+        )
+        self.assertEqual(
+            [("window.ecrDataProps", {"a": 1}), ("var ecrData", [{"b": "}"}])],
+            self._candidates(text),
+        )
+
+    def test_iife_return_value_is_decoded(self):
+        text = 'window.__NUXT__ = (function (a) { return ({"players": []}); })(1);'
+        self.assertEqual([("window.__NUXT__", {"players": []})], self._candidates(text))
+
+    def test_brace_fallback_only_without_prefixed_payloads(self):
+        self.assertEqual(
+            [("braces", {"x": [1]})], self._candidates('init({"x": [1]});')
+        )
+        self.assertEqual(
+            [], self._candidates('var data = {"y": 2}; init({"x": 1});', only_source="braces")
+        )
+
+    def test_application_json_and_invalid_payloads(self):
+        self.assertEqual(
+            [("application/json", [1, 2])], self._candidates(" [1, 2] ", "application/json")
+        )
+        errors = []
+        self.assertEqual(
+            [],
+            list(fp_ros_scraper.iter_json_candidates("var data = {oops}", on_error=errors.append)),
+        )
+        self.assertTrue(errors)
+
+
+class ExtractionPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.plan_file = Path(self.tmp_dir.name) / "plans.json"
+
+    def _scraper(self) -> FantasyProsScraper:
+        return FantasyProsScraper(debug=False, plan_file=self.plan_file)
+
+    def test_learned_plan_reproduces_heuristic_output(self):
+        for name, position in ScriptParserTest.FIXTURE_POSITIONS.items():
+            with self.subTest(fixture=name):
+                html = (FIXTURES / name).read_text()
+                expected = self._scraper().extract_player_data(html, position)
+
+                scraper = self._scraper()
+                self.assertIn(position, scraper.extraction_plans)
+                # The heuristic search re-learns the plan; a plan hit never does
+                scraper._remember_plan = lambda *_: self.fail("heuristic search ran")
+                self.assertEqual(expected, scraper.extract_player_data(html, position))
+
+    def test_plan_records_list_path_and_field_keys(self):
+        html = (FIXTURES / "ros_wr_fixture.html").read_text()
+        self._scraper().extract_player_data(html, "WR")
+
+        plan = json.loads(self.plan_file.read_text())["WR"]
+        self.assertEqual("window.__NUXT__", plan["source"])
+        self.assertEqual("players", plan["list_path"][-1])
+        self.assertEqual(
+            [["player", "name"], ["player", "display_name"]], plan["fields"]["name"]
+        )
+        self.assertEqual(
+            [["stats", "ros", "proj_pts"], ["stats", "projections", "fpts"]],
+            plan["fields"]["projection"],
+        )
+
+    def test_plan_skips_a_player_without_projection(self):
+        html = (FIXTURES / "ros_wr_fixture.html").read_text()
+        self._scraper().extract_player_data(html, "WR")
+        blank_row = html.replace(
+            '"players": [',
+            '"players": [{"player": {"name": "Puka Nacua", "team": {"short_name": "LAR"}}, '
+            '"stats": {"ros": {"proj_pts": ""}}},',
+            1,
+        )
+        expected = FantasyProsScraper(debug=False).extract_player_data(blank_row, "WR")
+
+        scraper = self._scraper()
+        scraper._remember_plan = lambda *_: self.fail("heuristic search ran")
+
+        self.assertEqual(["Justin Jefferson", "CeeDee Lamb"], [p["Player"] for p in expected])
+        self.assertEqual(expected, scraper.extract_player_data(blank_row, "WR"))
+
+    def test_stale_plan_falls_back_to_search_and_is_relearned(self):
+        self._scraper().extract_player_data(
+            (FIXTURES / "ros_wr_fixture.html").read_text(), "WR"
+        )
+
+        scraper = self._scraper()
+        players = scraper.extract_player_data(
+            (FIXTURES / "ros_wr_nested_proj_fixture.html").read_text(), "WR"
+        )
+
+        self.assertEqual(["Garrett Wilson", "Chris Olave"], [p["Player"] for p in players])
+        plan = json.loads(self.plan_file.read_text())["WR"]
+        self.assertIn(["stats", "ros", "points", "value", "raw"], plan["fields"]["projection"])
+
+
+class LowMemoryExtractionTest(unittest.TestCase):
+    def test_streaming_matches_full_decoding(self):
+        for name, position in ScriptParserTest.FIXTURE_POSITIONS.items():
+            with self.subTest(fixture=name):
+                html = (FIXTURES / name).read_text()
+                full = FantasyProsScraper(debug=False)
+                streamed = FantasyProsScraper(debug=False, low_memory=True)
+                self.assertEqual(
+                    full.extract_player_data(html, position),
+                    streamed.extract_player_data(html, position),
+                )
+                self.assertEqual(full.extraction_plans, streamed.extraction_plans)
+
+    def test_iter_json_elements_decodes_small_elements_only(self):
+        text = json.dumps(
+            {"meta": {"note": "[not] {json}"}, "groups": [{"big": ["x" * 50]}, {"a": 1}]}
+        )
+
+        elements = list(fp_ros_scraper.iter_json_elements(text, 0, max_chars=30))
+
+        # groups[0] is too long to decode, so it is walked; its only child is a string
+        self.assertEqual([(("groups", 1), {"a": 1})], elements)
+
+    def _peak_rss_growth(self, page_path: Path, low_memory: bool) -> int:
+        """Bytes the process's peak RSS grew by while extracting the page,
+        measured in a fresh interpreter so native buffers count too.
+        VmHWM rather than ru_maxrss: a child inherits its parent's
+        ru_maxrss, and the test runner's is far above this page's."""
+        code = (
+            "import re\n"
+            "from backend.scripts.fp_ros_scraper import FantasyProsScraper\n"
+            "def peak_kib():\n"
+            "    status = open('/proc/self/status').read()\n"
+            "    return int(re.search(r'VmHWM:\\s+(\\d+)', status).group(1))\n"
+            f"page = open({str(page_path)!r}).read()\n"
+            f"scraper = FantasyProsScraper(debug=False, low_memory={low_memory})\n"
+            "before = peak_kib()\n"
+            "records = scraper.extract_player_data(page, 'WR')\n"
+            "print(len(records), peak_kib() - before)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[3],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        count, growth_kib = map(int, output.split())
+        self.assertEqual(20000, count)
+        return growth_kib * 1024
+
+    @unittest.skipUnless(Path("/proc/self/status").exists(), "needs Linux /proc")
+    def test_peak_rss_stays_near_one_copy_of_the_payload(self):
+        players = [
+            {
+                "player_name": f"Player {index}",
+                "player_team_id": "MIN",
+                "r2p_pts": str(100 + index % 50),
+                "stats": {"rec": [index, index + 1]},
+                "notes": "x" * 200,
+            }
+            for index in range(20000)
+        ]
+        page = "<script>var ecrData = " + json.dumps({"players": players}) + ";</script>"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            page_path = Path(tmp_dir) / "page.html"
+            page_path.write_text(page)
+            # The scanner copies the script body once and the records are
+            # kept; decoding the whole tree costs several copies on top
+            ceiling = 2 * len(page)
+
+            self.assertLess(self._peak_rss_growth(page_path, low_memory=True), ceiling)
+            self.assertGreater(self._peak_rss_growth(page_path, low_memory=False), ceiling)
+
+
+class JsonModeTest(unittest.TestCase):
+    BATCHES = [
+        [
+            {"Player": " Josh Allen ", "Team": "BUF", "Position": "QB", "Proj. Fpts": 300.25},
+            {"Player": "Jalen Hurts", "Team": None, "Position": "QB", "Proj. Fpts": "290.5"},
+            {"Player": "Josh Allen", "Team": "BUF", "Position": "QB", "Proj. Fpts": 1.0},
+            {"Player": "", "Team": "X", "Position": "QB", "Proj. Fpts": 5.0},
+        ],
+        [
+            {"Player": "Bijan Robinson", "Team": "ATL", "Position": "RB", "Proj. Fpts": 200.0},
+            {"Player": "Breece Hall", "Team": "NYJ", "Position": "RB", "Proj. Fpts": 200.0},
+            {"Player": "Nan Guy", "Team": "NYJ", "Position": "RB", "Proj. Fpts": float("nan")},
+            {"Player": "Jalen Hurts", "Team": "PHI", "Position": "RB", "Proj. Fpts": 50.0},
+        ],
+    ]
+
+    def _pandas_rows(self) -> list[dict]:
+        """The DataFrame pipeline the --json mode used before it dropped pandas"""
+        import pandas as pd
+
+        frames = []
+        for batch in self.BATCHES:
+            df = pd.DataFrame(batch)
+            df["Player"] = df["Player"].astype(str).str.strip()
+            df = df[df["Player"] != ""]
+            df["Team"] = df["Team"].fillna("").astype(str).str.strip()
+            df["Proj. Fpts"] = pd.to_numeric(df["Proj. Fpts"], errors="coerce")
+            df = df.dropna(subset=["Proj. Fpts"])
+            frames.append(df.drop_duplicates(subset=["Player"], keep="first"))
+        combined = pd.concat(frames, ignore_index=True)
+        combined = combined.drop_duplicates(subset=["Player"], keep="first")
+        combined = combined.sort_values(["Position", "Proj. Fpts"], ascending=[True, False])
+        return combined.rename(
+            columns={
+                "Player": "player_name",
+                "Team": "team",
+                "Position": "position",
+                "Proj. Fpts": "proj_pts",
+            }
+        ).to_dict(orient="records")
+
+    def test_plain_python_records_are_byte_compatible(self):
+        records = fp_ros_scraper.combine_player_records(
+            [fp_ros_scraper.clean_player_records(batch) for batch in self.BATCHES]
+        )
+        self.assertEqual(
+            json.dumps({"players": self._pandas_rows(), "failed": []}),
+            json.dumps(
+                {"players": fp_ros_scraper.records_to_json_rows(records), "failed": []}
+            ),
+        )
+
+    def test_json_mode_never_imports_pandas_or_bs4(self):
+        code = (
+            "import sys\n"
+            "from backend.scripts import fp_ros_scraper as f\n"
+            "s = f.FantasyProsScraper(debug=False)\n"
+            f"html = open({str(FIXTURES / 'ros_wr_fixture.html')!r}).read()\n"
+            "rows = f.records_to_json_rows(f.clean_player_records(s.extract_player_data(html, 'WR')))\n"
+            "assert len(rows) == 2, rows\n"
+            "print(sorted(m for m in ('pandas', 'bs4') if m in sys.modules))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[3],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        self.assertEqual("[]", output.strip())
+
+
+class _FakeResponse:
+    def __init__(self, text: str, status_code: int = 200, headers: dict | None = None):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _SlowSession:
+    """Session stand-in that serves a fixture after a fixed delay"""
+
+    def __init__(self, text: str, delay: float):
+        self.text = text
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return _FakeResponse(self.text)
+
+
+FAKE_URLS = [
+    {"url": f"https://example.test/{position.lower()}.php", "position": position}
+    for position in ("QB", "RB", "WR", "TE", "DST")
+]
+
+
+def _slow_scraper(delay: float = 0.2, **kwargs) -> tuple[FantasyProsScraper, _SlowSession]:
+    """A scraper whose every page is the WR fixture, served after ``delay``"""
+    scraper = FantasyProsScraper(debug=False, **kwargs)
+    session = _SlowSession((FIXTURES / "ros_wr_fixture.html").read_text(), delay)
+    scraper.session = session
+    return scraper, session
+
+
+class ConcurrentScrapeTest(unittest.TestCase):
+    URLS = FAKE_URLS
+
+    def _scraper(self, **kwargs) -> tuple[FantasyProsScraper, _SlowSession]:
+        return _slow_scraper(**kwargs)
+
+    def test_positions_are_fetched_in_parallel(self):
+        scraper, session = self._scraper(rate_limit=0)
+        df = scraper.scrape_all_rankings(self.URLS)
+
+        self.assertEqual(5, session.max_active)
+        self.assertEqual([], scraper.failures)
+        # Duplicate player names collapse to the first position in config order
+        self.assertEqual({"QB"}, set(df["Position"]))
+
+    def test_per_host_limit_bounds_concurrency(self):
+        scraper, session = self._scraper(per_host_limit=2, rate_limit=0)
+        scraper.scrape_all_rankings(self.URLS)
+        self.assertEqual(2, session.max_active)
+
+
+class _ConditionalSession:
+    """Session stand-in that honours If-None-Match against a fixed ETag"""
+
+    def __init__(self, text: str, etag: str | None):
+        self.text = text
+        self.etag = etag
+        self.requests: list[dict] = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        response_headers = {"ETag": self.etag} if self.etag else {}
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return _FakeResponse("", 304, response_headers)
+        return _FakeResponse(self.text, 200, response_headers)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    URL = "https://example.test/ros-wr.php"
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.html = (FIXTURES / "ros_wr_fixture.html").read_text()
+
+    def _scraper(self, session) -> FantasyProsScraper:
+        scraper = FantasyProsScraper(debug=False, cache_dir=self.cache_dir.name)
+        scraper.session = session
+        return scraper
+
+    def test_not_modified_reuses_cached_players(self):
+        session = _ConditionalSession(self.html, '"v1"')
+        first = self._scraper(session).fetch_players(self.URL, "WR")
+
+        scraper = self._scraper(session)
+        scraper.extract_player_data = lambda *_: self.fail("page was re-parsed")
+        second = scraper.fetch_players(self.URL, "WR")
+
+        self.assertEqual(first, second)
+        self.assertEqual('"v1"', session.requests[-1]["If-None-Match"])
+        self.assertEqual({"hits": 1, "misses": 0}, scraper.cache_stats)
+
+    def test_unchanged_body_without_validators_is_a_hit(self):
+        session = _ConditionalSession(self.html, None)
+        first_scraper = self._scraper(session)
+        first = first_scraper.fetch_players(self.URL, "WR")
+        self.assertEqual({"hits": 0, "misses": 1}, first_scraper.cache_stats)
+
+        scraper = self._scraper(session)
+        scraper.extract_player_data = lambda *_: self.fail("page was re-parsed")
+        self.assertEqual(first, scraper.fetch_players(self.URL, "WR"))
+        self.assertEqual({"hits": 1, "misses": 0}, scraper.cache_stats)
+
+    def test_changed_body_is_re_extracted(self):
+        self._scraper(_ConditionalSession(self.html, None)).fetch_players(self.URL, "WR")
+
+        changed = self.html.replace("230.5", "231.5")
+        scraper = self._scraper(_ConditionalSession(changed, None))
+        players = scraper.fetch_players(self.URL, "WR")
+
+        self.assertAlmostEqual(231.5, players[0]["Proj. Fpts"])
+        self.assertEqual({"hits": 0, "misses": 1}, scraper.cache_stats)
+
+    def test_changed_only_parses_only_changed_pages(self):
+        pages = {
+            "https://example.test/wr.php": _ConditionalSession(self.html, None),
+            "https://example.test/dst.php": _ConditionalSession(
+                (FIXTURES / "ros_dst_fixture.html").read_text(), '"d1"'
+            ),
+        }
+        session = unittest.mock.Mock()
+        session.get = lambda url, **kwargs: pages[url].get(url, **kwargs)
+        urls = [
+            {"url": "https://example.test/wr.php", "position": "WR"},
+            {"url": "https://example.test/dst.php", "position": "DST"},
+        ]
+        db_path = Path(self.cache_dir.name) / "ros.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(ROS_RANKINGS_SCHEMA)
+
+        # Nothing is fingerprinted yet, so the first run parses every page
+        first = self._scraper(session)
+        fp_ros_scraper.sync_rankings_to_db(db_path, first.scrape_all_records(urls, True))
+        self.assertEqual([], first.unchanged)
+
+        pages["https://example.test/wr.php"].text = self.html.replace("230.5", "231.5")
+        scraper = self._scraper(session)
+        extract = scraper.extract_player_data
+        parsed = []
+        scraper.extract_player_data = lambda html, position: parsed.append(position) or extract(
+            html, position
+        )
+        records = scraper.scrape_all_records(urls, changed_only=True)
+
+        self.assertEqual(["WR"], parsed)
+        self.assertEqual({"DST", "WR"}, {record["Position"] for record in records})
+        self.assertEqual(
+            {"WR"},
+            {
+                record["Position"]
+                for record in fp_ros_scraper._changed_records(records, urls, scraper.unchanged)
+            },
+        )
+        self.assertEqual([], scraper.failures)
+        self.assertEqual(["DST"], [page["position"] for page in scraper.unchanged])
+        self.assertIsNotNone(scraper.unchanged[0]["changed_at"])
+        self.assertEqual(
+            {"added": 0, "changed": 1, "removed": 0},
+            fp_ros_scraper.sync_rankings_to_db(db_path, records),
+        )
+        with sqlite3.connect(db_path) as conn:
+            counts = dict(
+                conn.execute("SELECT position, COUNT(*) FROM ros_rankings GROUP BY position")
+            )
+        self.assertEqual({"DST": 2, "WR": 2}, counts)
+
+    def test_mixed_changed_only_run_snapshots_and_refreshes_the_whole_state(self):
+        pages = {
+            "https://example.test/wr.php": _ConditionalSession(self.html, None),
+            "https://example.test/dst.php": _ConditionalSession(
+                (FIXTURES / "ros_dst_fixture.html").read_text(), '"d1"'
+            ),
+        }
+        session = unittest.mock.Mock()
+        session.get = lambda url, **kwargs: pages[url].get(url, **kwargs)
+        urls = [
+            {"url": "https://example.test/wr.php", "position": "WR", "formats": ["half"]},
+            {"url": "https://example.test/dst.php", "position": "DST", "formats": ["half"]},
+        ]
+        db_path = Path(self.cache_dir.name) / "ros.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(ROS_RANKINGS_SCHEMA)
+        snapshots = fp_ros_scraper.SnapshotStore(Path(self.cache_dir.name) / "snapshots")
+        state = {"scrapes": 0, "cache": {"hits": 0, "misses": 0}}
+
+        def scrape(identity=None):
+            scraper = self._scraper(session)
+            scraper.identity = identity
+            return fp_ros_scraper._handle_command(
+                scraper, {"cmd": "scrape", "changed_only": True}, state, db_path, snapshots, urls
+            )
+
+        scrape()
+        # WR changes while DST answers 304; DST's player ids are new this run
+        pages["https://example.test/wr.php"].text = self.html.replace("230.5", "231.5")
+        identity = unittest.mock.Mock()
+        identity.annotate = lambda records: [
+            record.update({"Player ID": f"id-{record['Player']}"}) for record in records
+        ]
+        mixed = scrape(identity)
+
+        identity.reload.assert_called_once_with()
+        self.assertEqual(["DST"], [page["position"] for page in mixed["unchanged"]])
+        self.assertEqual({"WR"}, {row["position"] for row in mixed["players"]})
+        self.assertEqual(4, mixed["snapshot"]["count"])
+        with sqlite3.connect(db_path) as conn:
+            dst_ids = {
+                player_id
+                for (player_id,) in conn.execute(
+                    "SELECT player_id FROM ros_rankings WHERE position = 'DST'"
+                )
+            }
+        self.assertEqual({"id-San Francisco 49ers", "id-Buffalo Bills"}, dst_ids)
+
+        # Once nothing changed, a snapshot would only repeat the last one
+        unchanged = scrape()
+        self.assertEqual([], unchanged["players"])
+        self.assertNotIn("snapshot", unchanged)
+        self.assertEqual(2, len(snapshots.runs()))
+
+class ServeTest(unittest.TestCase):
+    def test_worker_answers_commands_with_a_warm_scraper(self):
+        scraper, _ = _slow_scraper(delay=0, rate_limit=0)
+        commands = [
+            {"id": 1, "cmd": "scrape", "position": "WR"},
+            {"id": 2, "cmd": "scrape", "position": "K"},
+            {"id": 3, "cmd": "stats"},
+            {"cmd": "shutdown"},
+            {"id": 4, "cmd": "stats"},
+        ]
+        stdin = io.StringIO("".join(json.dumps(c) + "\n" for c in commands) + "\n")
+        stdout = io.StringIO()
+
+        with unittest.mock.patch.object(fp_ros_scraper, "ROS_RANKINGS_URLS", FAKE_URLS):
+            fp_ros_scraper.serve(scraper, stdin, stdout)
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(4, len(responses))
+
+        scrape, unknown, stats, shutdown = responses
+        self.assertEqual(1, scrape["id"])
+        self.assertEqual(
+            ["Justin Jefferson", "CeeDee Lamb"],
+            [row["player_name"] for row in scrape["players"]],
+        )
+        self.assertEqual({"id": 2, "ok": False, "error": "Unknown position: K"}, unknown)
+        self.assertEqual(1, stats["scrapes"])
+        self.assertEqual(["WR"], stats["plans"])
+        self.assertEqual({"ok": True}, shutdown)
+
+
+class _PageSession:
+    """Session stand-in serving a fixture per URL after a per-URL delay"""
+
+    def __init__(self, pages: dict[str, tuple[str, float]]):
+        self.pages = pages
+
+    def get(self, url, timeout=None, **kwargs):
+        fixture, delay = self.pages[url]
+        time.sleep(delay)
+        if fixture is None:
+            return _FakeResponse("", 503)
+        return _FakeResponse((FIXTURES / fixture).read_text())
+
+
+class NdjsonStreamTest(unittest.TestCase):
+    def test_positions_stream_in_config_order_with_summary(self):
+        urls = [
+            {"url": "https://example.test/wr.php", "position": "WR"},
+            {"url": "https://example.test/dst.php", "position": "DST"},
+            {"url": "https://example.test/te.php", "position": "TE"},
+        ]
+        scraper = FantasyProsScraper(debug=False, rate_limit=0, retries=0)
+        scraper.session = _PageSession(
+            {
+                "https://example.test/wr.php": ("ros_wr_fixture.html", 0.3),
+                "https://example.test/dst.php": ("ros_dst_fixture.html", 0.0),
+                "https://example.test/te.php": (None, 0.1),
+            }
+        )
+        stdout = io.StringIO()
+
+        with unittest.mock.patch.object(fp_ros_scraper, "ROS_RANKINGS_URLS", urls):
+            fp_ros_scraper.stream_ndjson(scraper, stdout)
+
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        # WR finishes last but comes first in the config, so it holds the rest back
+        self.assertEqual(
+            ["WR", "DST", "TE", None], [line.get("position") for line in lines]
+        )
+        self.assertEqual(
+            ["San Francisco 49ers", "Buffalo Bills"],
+            [row["player_name"] for row in lines[1]["players"]],
+        )
+        self.assertEqual([], lines[2]["players"])
+
+        summary = lines[-1]
+        self.assertEqual("summary", summary["type"])
+        self.assertEqual(4, summary["player_count"])
+        self.assertEqual({"DST": 2, "TE": 0, "WR": 2}, summary["position_counts"])
+        self.assertEqual(1, len(summary["failed"]))
+        self.assertTrue(summary["failed"][0].startswith("TE:"))
+
+
+    def test_shared_players_sync_to_the_same_position_whatever_finishes_first(self):
+        urls = [
+            {"url": "https://example.test/wr.php", "position": "WR"},
+            {"url": "https://example.test/flex.php", "position": "TE"},
+        ]
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db_path = Path(tmp_dir.name) / "ros.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(ROS_RANKINGS_SCHEMA)
+            conn.execute(
+                "INSERT INTO ros_rankings (player_name, team, position, proj_pts) "
+                "VALUES ('Travis Kelce', 'KC', 'TE', 150.0)"
+            )
+
+        def stream(wr_delay: float, flex_delay: float) -> list[dict]:
+            # Both pages list the same players
+            scraper = FantasyProsScraper(debug=False, rate_limit=0, retries=0)
+            scraper.session = _PageSession(
+                {
+                    "https://example.test/wr.php": ("ros_wr_fixture.html", wr_delay),
+                    "https://example.test/flex.php": ("ros_wr_fixture.html", flex_delay),
+                }
+            )
+            stdout = io.StringIO()
+            fp_ros_scraper.stream_ndjson(scraper, stdout, db_path, urls_config=urls)
+            return [json.loads(line) for line in stdout.getvalue().splitlines()][:-1]
+
+        first = stream(0.2, 0.0)
+        second = stream(0.0, 0.2)
+
+        self.assertEqual({"added": 2, "changed": 0, "removed": 0}, first[0]["db"])
+        # Every name on the TE page was already written; its stale row still goes
+        self.assertEqual([], first[1]["players"])
+        self.assertEqual({"added": 0, "changed": 0, "removed": 1}, first[1]["db"])
+        self.assertEqual(
+            [{"added": 0, "changed": 0, "removed": 0}] * 2, [line["db"] for line in second]
+        )
+        with sqlite3.connect(db_path) as conn:
+            positions = conn.execute("SELECT DISTINCT position FROM ros_rankings").fetchall()
+        self.assertEqual([("WR",)], positions)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_paced(self):
+        now = [0.0]
+        waits: list[float] = []
+
+        def fake_sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(2.0, 3, clock=lambda: now[0], sleep=fake_sleep)
+        for _ in range(3):
+            self.assertEqual(0.0, bucket.acquire())
+        self.assertAlmostEqual(0.5, bucket.acquire())
+        self.assertAlmostEqual(0.5, bucket.acquire())
+        self.assertEqual(2, len(waits))
+
+    def test_zero_rate_disables_pacing(self):
+        bucket = TokenBucket(0, 1, sleep=lambda _: self.fail("should not sleep"))
+        for _ in range(10):
+            self.assertEqual(0.0, bucket.acquire())
+
+
+ROS_RANKINGS_SCHEMA = """
+CREATE TABLE ros_rankings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    team TEXT,
+    position TEXT,
+    proj_pts REAL,
+    sos_season INTEGER,
+    sos_playoffs INTEGER,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _record(player: str, team: str, position: str, proj: float) -> dict:
+    return {"Player": player, "Team": team, "Position": position, "Proj. Fpts": proj}
+
+
+class DbModeTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "ros.db"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(ROS_RANKINGS_SCHEMA)
+
+    def _rows(self) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT player_name, position, team, proj_pts, updated_at FROM ros_rankings"
+            ).fetchall()
+        return {(name, pos): (team, proj, updated) for name, pos, team, proj, updated in rows}
+
+    def test_json_rows_carry_sos_ranks(self):
+        ranked = dict(_record("Puka Nacua", "LAR", "WR", 210.0), **{"SOS Season": 4, "SOS Playoffs": 30})
+
+        row = fp_ros_scraper.records_to_json_rows([ranked])[0]
+
+        self.assertEqual(
+            {"sos_season": 4, "sos_playoffs": 30},
+            {key: value for key, value in row.items() if key.startswith("sos")},
+        )
+
+    def test_json_mode_reports_db_changes_and_snapshot(self):
+        scraper, _ = _slow_scraper(delay=0)
+        page = (FIXTURES / "ros_wr_fixture.html").read_text()
+        scraper.fetch_players = lambda url, position: scraper.extract_player_data(page, "WR")
+        stdout = io.StringIO()
+        with unittest.mock.patch.object(fp_ros_scraper, "FantasyProsScraper", return_value=scraper), \
+                unittest.mock.patch.object(sys, "argv", [
+                    "fp_ros_scraper.py", "--json", "--db", str(self.db_path),
+                    "--snapshot-dir", str(self.db_path.parent / "snapshots"),
+                ]), \
+                unittest.mock.patch.object(sys, "stdout", stdout):
+            fp_ros_scraper.main()
+
+        payload = json.loads(stdout.getvalue())
+        self.assertEqual({"added": 2, "changed": 0, "removed": 0}, payload["db"])
+        self.assertEqual(2, len(self._rows()))
+        self.assertEqual(2, payload["snapshot"]["count"])
+        store = fp_ros_scraper.SnapshotStore(self.db_path.parent / "snapshots")
+        self.assertEqual(1, len(store.player_series("Justin Jefferson")))
+
+
+class ScrapeMetricsTest(unittest.TestCase):
+    def test_stage_timings_and_counters_per_position(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metrics_file = Path(tmp_dir) / "ros.prom"
+            scraper, session = _slow_scraper(delay=0, rate_limit=0, metrics_file=metrics_file)
+            scraper.scrape_all_records(FAKE_URLS[:2])
+            prometheus = metrics_file.read_text()
+
+        metrics = scraper.metrics.as_dict()
+        self.assertEqual({"QB", "RB"}, set(metrics["positions"]))
+        qb = metrics["positions"]["QB"]
+        self.assertEqual(1, qb["counts"]["script_tags"])
+        self.assertEqual(1, qb["counts"]["candidates_tried"])
+        self.assertEqual(len(session.text.encode("utf-8")), qb["counts"]["bytes"])
+        self.assertEqual(2, qb["counts"]["players"])
+        self.assertEqual(set(fp_ros_scraper.ScrapeMetrics.STAGES), set(qb["seconds"]))
+        self.assertGreater(qb["seconds"]["total"], 0)
+        self.assertEqual(4, metrics["totals"]["counts"]["players"])
+        self.assertIn('fp_ros_scraper_stage_seconds{position="QB",stage="json_decode"}', prometheus)
+        self.assertIn('fp_ros_scraper_count{position="RB",counter="players"} 2', prometheus)
+
+    def test_counts_json_decode_failures(self):
+        stats = fp_ros_scraper.ScrapeMetrics.new_stats()
+        list(fp_ros_scraper.iter_json_candidates('var ecrData = {"a": [1, 2};', stats=stats))
+        self.assertGreaterEqual(stats["json_decode_failures"], 1)
+        self.assertEqual(stats["json_decode_failures"], stats["candidates_tried"])
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Serves the WR fixture, following a per-path script of (delay, status)
+    steps; "reset" drops the connection without a response and "block"
+    answers only once the test sets ``server.release``"""
+
+    def do_GET(self):
+        steps = self.server.steps.setdefault(self.path, [])
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+            step = steps.pop(0) if len(steps) > 1 else (steps[0] if steps else (0, 200))
+        if step == "reset":
+            self.connection.close()
+            return
+        if step == "block":
+            self.server.release.wait(10)
+            step = (0, 200)
+        delay, status = step
+        time.sleep(delay)
+        body = (FIXTURES / "ros_wr_fixture.html").read_bytes() if status == 200 else b"error"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchResilienceTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.daemon_threads = True
+        self.server.steps = {}
+        self.server.hits = {}
+        self.server.lock = threading.Lock()
+        self.server.release = threading.Event()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self.server.release.set)
+
+    def _url(self, path: str, *steps) -> str:
+        self.server.steps[path] = list(steps)
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def _scraper(self, **kwargs) -> FantasyProsScraper:
+        scraper = FantasyProsScraper(debug=False, rate_limit=0, **kwargs)
+        scraper._sleep = lambda seconds: None
+        return scraper
+
+    def test_retries_errors_and_resets_then_succeeds(self):
+        url = self._url("/wr", "reset", (0, 503), (0, 200))
+        scraper = self._scraper(retries=2)
+
+        records = scraper.scrape_all_records([{"url": url, "position": "WR"}])
+
+        self.assertEqual(2, len(records))
+        self.assertEqual([], scraper.failures)
+        self.assertEqual(3, self.server.hits["/wr"])
+        self.assertEqual(2, scraper.metrics.as_dict()["positions"]["WR"]["counts"]["retries"])
+
+    def test_client_errors_are_not_retried(self):
+        url = self._url("/missing", (0, 404))
+        scraper = self._scraper(retries=3)
+
+        scraper.scrape_all_records([{"url": url, "position": "WR"}])
+
+        self.assertEqual(1, self.server.hits["/missing"])
+        self.assertEqual(1, len(scraper.failures))
+
+    def test_hedged_request_beats_a_slow_first_attempt(self):
+        url = self._url("/slow", "block", (0, 200))
+        scraper = self._scraper(retries=0, hedge_after=0.05)
+
+        records = scraper.scrape_all_records([{"url": url, "position": "WR"}])
+
+        # The first attempt is still held by the server, so the hedge won
+        self.assertFalse(self.server.release.is_set())
+        self.assertEqual(2, self.server.hits["/slow"])
+        self.assertEqual(2, len(records))
+        self.assertEqual(1, scraper.metrics.as_dict()["positions"]["WR"]["counts"]["hedges"])
+
+    def test_losing_retryable_responses_are_closed(self):
+        scraper = self._scraper(retries=0, hedge_after=0.01)
+        hedged = threading.Event()
+        responses = [_FakeResponse("busy", 429), _FakeResponse("down", 503)]
+        calls = []
+
+        def attempt(url, headers, timeout):
+            calls.append(url)
+            if len(calls) == 1:
+                # The first attempt answers only once the hedge has gone out
+                hedged.wait(10)
+                return responses[0], ScrapeMetrics.new_stats()
+            hedged.set()
+            return responses[1], ScrapeMetrics.new_stats()
+
+        scraper._attempt = attempt
+        with self.assertRaises(requests.HTTPError) as raised:
+            scraper.fetch("https://example.test/wr.php")
+
+        winner = raised.exception.response
+        self.assertFalse(winner.closed)
+        self.assertEqual([True], [r.closed for r in responses if r is not winner])
+
+    def test_deadline_stops_waiting_on_stalled_hedged_attempts(self):
+        scraper = self._scraper(retries=0, hedge_after=0.01)
+        stalled = threading.Event()
+        self.addCleanup(stalled.set)
+        attempts = []
+
+        def attempt(url, headers, timeout):
+            # A response that keeps dripping bytes never trips the read timeout
+            response = _FakeResponse("late")
+            attempts.append(response)
+            stalled.wait(10)
+            return response, ScrapeMetrics.new_stats()
+
+        scraper._attempt = attempt
+        scraper._deadline_at = time.monotonic() + 0.2
+        with self.assertRaises(fp_ros_scraper.DeadlineExceeded):
+            scraper.fetch("https://example.test/wr.php")
+
+        self.assertFalse(stalled.is_set())
+        self.assertEqual(2, len(attempts))
+        # Once they do finish, the abandoned attempts are closed
+        stalled.set()
+        for _ in range(500):
+            if all(response.closed for response in attempts):
+                break
+            time.sleep(0.01)
+        self.assertEqual([True, True], [response.closed for response in attempts])
+
+    def test_rate_limited_response_is_reported_as_such(self):
+        scraper = self._scraper(retries=0)
+        scraper._attempt = lambda *_: (_FakeResponse("busy", 429), ScrapeMetrics.new_stats())
+
+        with self.assertRaisesRegex(requests.HTTPError, "^429 Too Many Requests for url"):
+            scraper.fetch("https://example.test/wr.php")
+
+    def test_hedge_delay_tracks_latency_percentile(self):
+        scraper = self._scraper(hedge_percentile=0.9, hedge_after=0.25)
+        url = "https://example.test/wr.php"
+        self.assertEqual(0.25, scraper._hedge_delay(url))
+        for seconds in (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+            scraper._record_latency(url, seconds)
+        self.assertEqual(1.0, scraper._hedge_delay(url))
+        scraper.hedge_percentile = 0.1
+        self.assertEqual(0.25, scraper._hedge_delay(url))
+
+    def test_deadline_bounds_the_run(self):
+        url = self._url("/hang", "block")
+        scraper = self._scraper(retries=5, deadline=0.2)
+
+        records = scraper.scrape_all_records([{"url": url, "position": "WR"}])
+
+        # The run gave up while the server was still holding the request
+        self.assertFalse(self.server.release.is_set())
+        self.assertEqual([], records)
+        self.assertEqual(1, len(scraper.failures))
+
+
+class ScoringFormatMatrixTest(unittest.TestCase):
+    def test_shared_pages_appear_once_per_run(self):
+        configs = fp_ros_scraper.build_rankings_matrix(("standard", "half", "ppr"))
+
+        self.assertEqual(11, len(configs))
+        self.assertEqual(len(configs), len({config["url"] for config in configs}))
+        by_position = {}
+        for config in configs:
+            by_position.setdefault(config["position"], []).append(config["formats"])
+        self.assertEqual([["standard", "half", "ppr"]], by_position["QB"])
+        self.assertEqual([["standard"], ["half"], ["ppr"]], by_position["WR"])
+        self.assertIn(
+            "https://www.fantasypros.com/nfl/rankings/ros-ppr-wr.php",
+            {config["url"] for config in configs},
+        )
+        with self.assertRaises(ValueError):
+            fp_ros_scraper.build_rankings_matrix(("superflex",))
+        with self.assertRaises(ValueError):
+            fp_ros_scraper.build_rankings_matrix(positions=("K",))
+
+    def test_one_pass_fetches_each_page_once_and_tags_formats(self):
+        scraper, session = _slow_scraper(delay=0, rate_limit=0)
+        fetched = []
+        get = session.get
+        session.get = lambda url, **kwargs: fetched.append(url) or get(url, **kwargs)
+        configs = fp_ros_scraper.build_rankings_matrix(("half", "ppr"), positions=("QB", "WR"))
+
+        records = scraper.scrape_all_records(configs)
+
+        self.assertEqual(sorted(config["url"] for config in configs), sorted(fetched))
+        # Every page is the WR fixture, so the shared QB page's players win
+        # both formats and the WR pages are deduplicated away
+        self.assertEqual(
+            [("half", "QB"), ("half", "QB"), ("ppr", "QB"), ("ppr", "QB")],
+            sorted((record["Scoring"], record["Position"]) for record in records),
+        )
+        rows = fp_ros_scraper.records_to_json_rows(records)
+        self.assertEqual({"half", "ppr"}, {row["scoring_format"] for row in rows})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.scripts.player_identity import PlayerIndex, PlayerResolver, normalize_name
+
+
+class NormalizeNameTest(unittest.TestCase):
+    def test_drops_punctuation_accents_and_suffixes(self):
+        self.assertEqual("amon ra st brown", normalize_name("Amon-Ra St. Brown"))
+        self.assertEqual("aj brown", normalize_name("A.J. Brown"))
+        self.assertEqual("jamarr chase", normalize_name("Ja'Marr Chase"))
+        self.assertEqual("marvin harrison", normalize_name("Marvin Harrison Jr."))
+        self.assertEqual("kenneth walker", normalize_name("Kenneth Walker III"))
+        self.assertEqual("nico collins", normalize_name("Nico Collíns"))
+
+
+class PlayerIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PlayerIndex()
+        self.index.add("7547", "Amon-Ra St. Brown", "WR", "DET")
+        self.index.add("9509", "Bijan Robinson", "RB", "ATL")
+        self.index.add("4981", "Calvin Ridley", "WR", "TEN")
+        self.index.add("100", "Mike Williams", "WR", "PIT")
+        self.index.add("200", "Mike Williams", "RB", "FA")
+        self.index.add("300", "Mike Williams", "WR", "LAC")
+
+    def test_exact_match_after_normalization(self):
+        self.assertEqual("7547", self.index.lookup("Amon-Ra St. Brown"))
+        self.assertEqual("7547", self.index.lookup("Amon Ra St Brown Jr", "WR"))
+
+    def test_fuzzy_match_within_trigram_blocks(self):
+        self.assertEqual("9509", self.index.lookup("Bijan Robinsen", "RB"))
+        self.assertEqual("4981", self.index.lookup("Calvin Ridly"))
+        self.assertIsNone(self.index.lookup("Calvin Johnson"))
+
+    def test_position_and_team_break_ties(self):
+        self.assertEqual("200", self.index.lookup("Mike Williams", "RB"))
+        self.assertEqual("300", self.index.lookup("Mike Williams", "WR", "LAC"))
+        self.assertEqual("300", self.index.lookup("Mike Williams", "WR", "San Diego Chargers"))
+        self.assertIsNone(self.index.lookup("Mike Williams", "WR"))
+
+    def test_defenses_resolve_to_team_codes(self):
+        self.assertEqual("JAX", self.index.lookup("Jacksonville Jaguars", "DST"))
+        self.assertEqual("SF", self.index.lookup("49ers D/ST", "DST", ""))
+
+
+class PlayerResolverTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self.db_path = self.root / "league.db"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE keepers (year INTEGER, player_id TEXT, player_name TEXT)")
+            conn.executemany(
+                "INSERT INTO keepers VALUES (?, ?, ?)",
+                [(2023, "7547", "Amon-Ra St. Brown"), (2024, "7547", "Amon-Ra St. Brown")],
+            )
+        self.sleeper = self.root / "players.json"
+        self.sleeper.write_text(
+            json.dumps(
+                {
+                    "9509": {"full_name": "Bijan Robinson", "position": "RB", "team": "ATL"},
+                    "BUF": {"first_name": "Buffalo", "last_name": "Bills", "position": "DEF"},
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    def test_annotates_records_and_persists_matches(self):
+        map_path = self.root / "ids.json"
+        resolver = PlayerResolver.build(self.db_path, self.sleeper, map_path)
+        records = [
+            {"Player": "Amon-Ra St. Brown", "Team": "DET", "Position": "WR"},
+            {"Player": "Bijan Robinson", "Team": "ATL", "Position": "RB"},
+            {"Player": "Buffalo Bills", "Team": "", "Position": "DST"},
+            {"Player": "Nobody Special", "Team": "", "Position": "TE"},
+        ]
+
+        resolver.annotate(records)
+        resolver.save()
+
+        self.assertEqual(["7547", "9509", "BUF", None], [record["Player ID"] for record in records])
+        saved = json.loads(map_path.read_text(encoding="utf-8"))
+        self.assertEqual("7547", saved["WR:Amon-Ra St. Brown"])
+        self.assertNotIn("TE:Nobody Special", saved)
+
+        # A later run answers from the map without an index
+        cached = PlayerResolver(PlayerIndex(), map_path)
+        self.assertEqual("9509", cached.resolve("Bijan Robinson", "RB"))
+
+    def test_reload_picks_up_keepers_added_since_build(self):
+        resolver = PlayerResolver.build(self.db_path, self.sleeper)
+        self.assertIsNone(resolver.resolve("Puka Nacua", "WR"))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO keepers VALUES (2025, '9493', 'Puka Nacua')")
+        resolver.reload()
+
+        self.assertEqual("9493", resolver.resolve("Puka Nacua", "WR"))
+        self.assertEqual("9509", resolver.resolve("Bijan Robinson", "RB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.scripts.ros_db import sync_rankings_to_db
+
+ROS_RANKINGS_SCHEMA = """
+CREATE TABLE ros_rankings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    team TEXT,
+    position TEXT,
+    proj_pts REAL,
+    sos_season INTEGER,
+    sos_playoffs INTEGER,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _record(player: str, team: str, position: str, proj: float) -> dict:
+    return {"Player": player, "Team": team, "Position": position, "Proj. Fpts": proj}
+
+
+class SyncRankingsTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "ros.db"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(ROS_RANKINGS_SCHEMA)
+
+    def _rows(self) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT player_name, position, team, proj_pts, updated_at FROM ros_rankings"
+            ).fetchall()
+        return {(name, pos): (team, proj, updated) for name, pos, team, proj, updated in rows}
+
+    def test_applies_only_the_diff(self):
+        first = [
+            _record("Justin Jefferson", "MIN", "WR", 230.5),
+            _record("CeeDee Lamb", "DAL", "WR", 220.0),
+            _record("Josh Allen", "BUF", "QB", 300.0),
+        ]
+        self.assertEqual({"added": 3, "changed": 0, "removed": 0}, sync_rankings_to_db(self.db_path, first))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE ros_rankings SET updated_at = '2000-01-01 00:00:00'")
+
+        second = [
+            _record("Justin Jefferson", "MIN", "WR", 230.5),
+            _record("Josh Allen", "BUF", "QB", 310.0),
+            _record("Puka Nacua", "LAR", "WR", 210.0),
+        ]
+        self.assertEqual({"added": 1, "changed": 1, "removed": 1}, sync_rankings_to_db(self.db_path, second))
+
+        rows = self._rows()
+        self.assertEqual({("Justin Jefferson", "WR"), ("Josh Allen", "QB"), ("Puka Nacua", "WR")}, set(rows))
+        self.assertEqual("2000-01-01 00:00:00", rows[("Justin Jefferson", "WR")][2])
+        self.assertEqual(310.0, rows[("Josh Allen", "QB")][1])
+        self.assertNotEqual("2000-01-01 00:00:00", rows[("Josh Allen", "QB")][2])
+
+    def test_missing_positions_keep_their_rows(self):
+        sync_rankings_to_db(
+            self.db_path,
+            [_record("Josh Allen", "BUF", "QB", 300.0), _record("Bills", "BUF", "DST", 120.0)],
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO ros_rankings (player_name, team, position, proj_pts) "
+                "VALUES ('Josh Allen', 'BUF', 'QB', 300.0)"
+            )
+
+        counts = sync_rankings_to_db(self.db_path, [_record("Jalen Hurts", "PHI", "QB", 290.0)])
+
+        self.assertEqual({"added": 1, "changed": 0, "removed": 1}, counts)
+        self.assertEqual({("Jalen Hurts", "QB"), ("Bills", "DST")}, set(self._rows()))
+
+    def test_scoring_formats_are_synced_independently(self):
+        half = dict(_record("Puka Nacua", "LAR", "WR", 210.0), Scoring="half")
+        ppr = dict(_record("Puka Nacua", "LAR", "WR", 240.0), Scoring="ppr")
+        self.assertEqual({"added": 2, "changed": 0, "removed": 0}, sync_rankings_to_db(self.db_path, [half, ppr]))
+
+        counts = sync_rankings_to_db(self.db_path, [dict(half, **{"Proj. Fpts": 205.0})])
+
+        self.assertEqual({"added": 0, "changed": 1, "removed": 0}, counts)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT scoring_format, proj_pts FROM ros_rankings ORDER BY scoring_format"
+            ).fetchall()
+        self.assertEqual([("half", 205.0), ("ppr", 240.0)], rows)
+
+    def test_pages_missing_from_records_keep_their_rows(self):
+        pages = [
+            dict(_record(name, "LAR", position, 200.0), Scoring=fmt)
+            for name, position in (("Kyren Williams", "RB"), ("Puka Nacua", "WR"))
+            for fmt in ("half", "ppr")
+        ]
+        sync_rankings_to_db(self.db_path, pages)
+
+        counts = sync_rankings_to_db(
+            self.db_path,
+            [
+                dict(_record("Kyren Williams", "LAR", "RB", 200.0), Scoring="half"),
+                dict(_record("Cooper Kupp", "LAR", "WR", 190.0), Scoring="ppr"),
+            ],
+        )
+
+        self.assertEqual({"added": 1, "changed": 0, "removed": 1}, counts)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = set(
+                conn.execute("SELECT player_name, scoring_format FROM ros_rankings").fetchall()
+            )
+        self.assertEqual(
+            {
+                ("Kyren Williams", "half"),
+                ("Kyren Williams", "ppr"),
+                ("Puka Nacua", "half"),
+                ("Cooper Kupp", "ppr"),
+            },
+            rows,
+        )
+
+    def test_sos_ranks_are_written_only_when_present(self):
+        ranked = dict(_record("Puka Nacua", "LAR", "WR", 210.0), **{"SOS Season": 4, "SOS Playoffs": 30})
+        sync_rankings_to_db(self.db_path, [ranked])
+
+        self.assertEqual(
+            {"added": 0, "changed": 1, "removed": 0},
+            sync_rankings_to_db(self.db_path, [dict(ranked, **{"SOS Playoffs": 12})]),
+        )
+        self.assertEqual(
+            {"added": 0, "changed": 0, "removed": 0},
+            sync_rankings_to_db(self.db_path, [_record("Puka Nacua", "LAR", "WR", 210.0)]),
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT sos_season, sos_playoffs FROM ros_rankings").fetchall()
+        self.assertEqual([(4, 12)], rows)
+
+    def test_player_ids_are_written_to_legacy_tables(self):
+        sync_rankings_to_db(self.db_path, [_record("Puka Nacua", "LAR", "WR", 210.0)])
+
+        resolved = dict(_record("Puka Nacua", "LAR", "WR", 210.0), **{"Player ID": "9493"})
+        counts = sync_rankings_to_db(self.db_path, [resolved])
+
+        self.assertEqual({"added": 0, "changed": 1, "removed": 0}, counts)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT player_name, player_id FROM ros_rankings").fetchall()
+        self.assertEqual([("Puka Nacua", "9493")], rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+import tempfile
+import unittest
+import unittest.mock
+
+from backend.scripts import ros_snapshots
+from backend.scripts.ros_snapshots import SnapshotStore
+
+
+def _record(player: str, team: str, position: str, proj: float) -> dict:
+    return {"Player": player, "Team": team, "Position": position, "Proj. Fpts": proj}
+
+
+def _run_at(day: int) -> datetime:
+    return datetime(2024, 10, day, 12, tzinfo=timezone.utc)
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        store = SnapshotStore(self.root)
+        store.append(
+            [
+                _record("Justin Jefferson", "MIN", "WR", 230.5),
+                _record("Josh Allen", "BUF", "QB", 300.0),
+            ],
+            run_at=_run_at(1),
+        )
+        store.append(
+            [
+                _record("Justin Jefferson", "MIN", "WR", 221.3),
+                _record("Puka Nacua", "LAR", "WR", 210.0),
+            ],
+            run_at=_run_at(8),
+        )
+
+    def test_player_series_spans_runs(self):
+        series = SnapshotStore(self.root).player_series("Justin Jefferson")
+        self.assertEqual(
+            [
+                {"run": "2024-10-01T12:00:00+00:00", "team": "MIN", "position": "WR", "proj_pts": 230.5},
+                {"run": "2024-10-08T12:00:00+00:00", "team": "MIN", "position": "WR", "proj_pts": 221.3},
+            ],
+            series,
+        )
+        self.assertEqual([], SnapshotStore(self.root).player_series("Nobody"))
+
+    def test_position_series_streams_runs_in_small_chunks(self):
+        with unittest.mock.patch.object(ros_snapshots, "CHUNK_ROWS", 1):
+            series = list(SnapshotStore(self.root).position_series("WR"))
+            qb = list(SnapshotStore(self.root).position_series("QB"))
+
+        self.assertEqual(
+            [
+                ("2024-10-01T12:00:00+00:00", {"Justin Jefferson": 230.5}),
+                ("2024-10-08T12:00:00+00:00", {"Justin Jefferson": 221.3, "Puka Nacua": 210.0}),
+            ],
+            series,
+        )
+        self.assertEqual([("2024-10-01T12:00:00+00:00", {"Josh Allen": 300.0})], qb)
+
+    def test_strings_are_stored_once(self):
+        store = SnapshotStore(self.root)
+        store.append([_record("Josh Allen", "BUF", "QB", 305.0)], run_at=_run_at(15))
+        dictionary = (store.root / "dictionary.jsonl").read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(dictionary), len(set(dictionary)))
+        self.assertEqual(20, (store.root / "proj.f32").stat().st_size)
+
+    def test_uncommitted_rows_are_ignored_and_replaced(self):
+        store = SnapshotStore(self.root)
+        with (store.root / "proj.f32").open("ab") as handle:
+            handle.write(b"\0" * 12)
+        self.assertEqual(2, len(store.runs()))
+
+        entry = store.append([_record("Josh Allen", "BUF", "QB", 305.0)], run_at=_run_at(15))
+
+        self.assertEqual(4, entry["offset"])
+        self.assertEqual(20, (store.root / "proj.f32").stat().st_size)
+        self.assertEqual(
+            [300.0, 305.0],
+            [point["proj_pts"] for point in store.player_series("Josh Allen", "QB")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
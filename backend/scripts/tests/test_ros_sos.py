@@ -0,0 +1,119 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from backend.scripts import ros_sos
+from backend.scripts.nfl_teams import TEAMS, team_code
+from backend.scripts.ros_sos import SosTable, compute_sos
+
+
+def _index(team: str) -> int:
+    return TEAMS.index(team)
+
+
+def _round_robin_schedule(weeks: int = 18, seed: int = 7) -> np.ndarray:
+    """Random full schedule with one bye week per team"""
+    rng = np.random.default_rng(seed)
+    opponents = np.full((len(TEAMS), weeks), -1, dtype=np.int16)
+    for week in range(weeks):
+        order = rng.permutation(len(TEAMS))
+        resting = set(order[:2]) if week % 9 else set()
+        playing = [team for team in order if team not in resting]
+        for home, away in zip(playing[::2], playing[1::2]):
+            opponents[home, week] = away
+            opponents[away, week] = home
+    return opponents
+
+
+class ComputeSosTest(unittest.TestCase):
+    def test_matches_a_per_team_loop(self):
+        opponents = _round_robin_schedule()
+        allowed = np.random.default_rng(3).uniform(10, 30, size=(4, len(TEAMS)))
+
+        season, playoffs = compute_sos(opponents, allowed, from_week=6)
+
+        for position in range(allowed.shape[0]):
+            for window, ranks in ((range(6, 19), season), (range(15, 18), playoffs)):
+                means = []
+                for team in range(len(TEAMS)):
+                    faced = [
+                        allowed[position, opponents[team, week - 1]]
+                        for week in window
+                        if opponents[team, week - 1] >= 0
+                    ]
+                    means.append(sum(faced) / len(faced))
+                expected = np.argsort(np.argsort(-np.array(means), kind="stable"), kind="stable") + 1
+                np.testing.assert_array_equal(expected, ranks[position])
+
+    def test_softest_schedule_ranks_first_and_byes_are_skipped(self):
+        opponents = np.full((len(TEAMS), 18), -1, dtype=np.int16)
+        buf, mia, kc, nyj = (_index(team) for team in ("BUF", "MIA", "KC", "NYJ"))
+        for week, home, away in ((1, buf, mia), (15, buf, kc), (16, nyj, mia)):
+            opponents[home, week - 1] = away
+            opponents[away, week - 1] = home
+        allowed = np.full((1, len(TEAMS)), np.nan)
+        allowed[0, [buf, mia, kc, nyj]] = [10.0, 30.0, 20.0, 25.0]
+
+        season, playoffs = compute_sos(opponents, allowed)
+
+        # BUF faces MIA (30) and KC (20); NYJ only MIA (30); MIA faces BUF and NYJ
+        self.assertEqual(1, season[0, nyj])
+        self.assertEqual(2, season[0, buf])
+        self.assertEqual(0, season[0, _index("DAL")])
+        # Weeks 15-17: NYJ faces MIA (30), MIA faces NYJ (25), BUF faces KC (20)
+        self.assertEqual(1, playoffs[0, nyj])
+        self.assertEqual(3, playoffs[0, buf])
+        self.assertEqual(0, playoffs[0, _index("DAL")])
+
+
+class SosTableTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        root = Path(tmp_dir.name)
+        self.schedule = root / "schedule.csv"
+        self.schedule.write_text(
+            "week,home,away\n1,JAC,Buffalo Bills\n15,BUF,MIA\n16,Dolphins,JAX\n",
+            encoding="utf-8",
+        )
+        self.points_allowed = root / "allowed.json"
+        self.points_allowed.write_text(
+            json.dumps({"WR": {"BUF": 20.0, "JAX": 30.0, "MIA": 25.0}, "D/ST": {"BUF": 5.0, "JAX": 9.0}}),
+            encoding="utf-8",
+        )
+
+    def test_annotates_records_by_position_and_team(self):
+        table = SosTable.from_files(self.schedule, self.points_allowed)
+        records = [
+            {"Player": "Brian Thomas Jr.", "Team": "JAC", "Position": "WR", "Proj. Fpts": 150.0},
+            {"Player": "Buffalo Bills", "Team": "", "Position": "DST", "Proj. Fpts": 110.0},
+            {"Player": "Nobody", "Team": "FA", "Position": "WR", "Proj. Fpts": 1.0},
+        ]
+
+        table.annotate(records)
+
+        # BUF faces JAX and MIA (27.5), MIA faces BUF and JAX (25), JAX faces
+        # BUF and MIA (22.5); in the playoffs all three average 25 and tie
+        self.assertEqual((3, 2), (records[0]["SOS Season"], records[0]["SOS Playoffs"]))
+        self.assertEqual(1, table.lookup("WR", "Buffalo Bills")[0])
+        self.assertEqual((1, None), (records[1]["SOS Season"], records[1]["SOS Playoffs"]))
+        self.assertEqual((None, None), (records[2]["SOS Season"], records[2]["SOS Playoffs"]))
+
+    def test_rejects_unknown_teams(self):
+        self.schedule.write_text("week,home,away\n1,BUF,Springfield\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "Springfield"):
+            SosTable.from_files(self.schedule, self.points_allowed)
+
+    def test_team_aliases(self):
+        self.assertEqual("WAS", team_code("WSH"))
+        self.assertEqual("LV", team_code("Las Vegas Raiders"))
+        self.assertEqual("SF", team_code("49ers D/ST"))
+        self.assertIsNone(team_code("FA"))
+        self.assertEqual((15, 16, 17, 18), ros_sos.parse_weeks("15-17,18"))
+
+
+if __name__ == "__main__":
+    unittest.main()
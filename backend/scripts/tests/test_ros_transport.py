@@ -0,0 +1,99 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.scripts.fp_ros_scraper import FantasyProsScraper
+from backend.scripts.ros_transport import RecordingAdapter, ReplayAdapter, save_response
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.hits += 1
+        body = self.server.page
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordReplayTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name) / "recordings"
+        self.page = (FIXTURES / "ros_wr_fixture.html").read_bytes()
+
+    def _scraper(self, transport, **kwargs) -> FantasyProsScraper:
+        return FantasyProsScraper(debug=False, rate_limit=0, transport=transport, **kwargs)
+
+    def test_records_live_responses_and_replays_them_offline(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+        server.daemon_threads = True
+        server.page = self.page
+        server.hits = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/ros-wr.php"
+        config = [{"url": url, "position": "WR"}]
+        try:
+            recorded = self._scraper(RecordingAdapter(self.root)).scrape_all_records(config)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        replayer = self._scraper(ReplayAdapter(self.root))
+        replayed = replayer.scrape_all_records(config)
+
+        self.assertEqual(1, server.hits)
+        self.assertEqual(2, len(replayed))
+        self.assertEqual(recorded, replayed)
+        response = replayer.session.get(url)
+        self.assertEqual(self.page, response.content)
+        self.assertEqual('"v1"', response.headers["ETag"])
+        revalidated = replayer.session.get(url, headers={"If-None-Match": '"v1"'})
+        self.assertEqual(304, revalidated.status_code)
+        counts = replayer.metrics.as_dict()["positions"]["WR"]["counts"]
+        self.assertLess(counts["wire_bytes"], counts["bytes"])
+
+    def test_unrecorded_urls_fail_without_the_network(self):
+        save_response(self.root, "GET", "https://example.test/ros-wr.php", 200, self.page)
+        scraper = self._scraper(ReplayAdapter(self.root), retries=0)
+
+        records = scraper.scrape_all_records(
+            [
+                {"url": "https://example.test/ros-wr.php", "position": "WR"},
+                {"url": "https://example.test/ros-te.php", "position": "TE"},
+            ]
+        )
+
+        self.assertEqual(2, len(records))
+        self.assertEqual(1, len(scraper.failures))
+        self.assertIn("404", scraper.failures[0])
+
+    def test_latency_and_bandwidth_are_injected(self):
+        body = os.urandom(20_000)  # incompressible, so the cap sees every byte
+        save_response(self.root, "GET", "https://example.test/big", 200, body)
+        adapter = ReplayAdapter(self.root, latency=0.05, bandwidth=200_000)
+        scraper = self._scraper(adapter)
+
+        started = time.perf_counter()
+        response = scraper.session.get("https://example.test/big")
+        self.assertEqual(body, response.content)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05 + 20_000 / 200_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
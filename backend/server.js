@@ -479,10 +479,35 @@ db.serialize(() => {
       proj_pts REAL,
       sos_season INTEGER,
       sos_playoffs INTEGER,
+      scoring_format TEXT NOT NULL DEFAULT 'half',
+      player_id TEXT,
       updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
     )
   `);
 
+  // Ensure scoring_format column exists for legacy databases
+  db.run(
+    `ALTER TABLE ros_rankings ADD COLUMN scoring_format TEXT NOT NULL DEFAULT 'half'`,
+    err => {
+      if (err && !err.message.includes('duplicate column name')) {
+        logger.error('Error adding scoring_format column', { error: err.message });
+      }
+    }
+  );
+
+  db.run(
+    'CREATE INDEX IF NOT EXISTS idx_ros_rankings_format_position ON ros_rankings(scoring_format, position)'
+  );
+
+  // Ensure player_id column exists for legacy databases
+  db.run(`ALTER TABLE ros_rankings ADD COLUMN player_id TEXT`, err => {
+    if (err && !err.message.includes('duplicate column name')) {
+      logger.error('Error adding player_id column', { error: err.message });
+    } else {
+      db.run('CREATE INDEX IF NOT EXISTS idx_ros_rankings_player_id ON ros_rankings(player_id)');
+    }
+  });
+
   // Table for manually entered trades not tied to keepers
   db.run(`
     CREATE TABLE IF NOT EXISTS manual_trades (
@@ -1081,26 +1106,40 @@ const refreshCachedPreview = async () => {
   return summary;
 };
 
-const refreshRosRankings = async () => {
+const refreshRosRankings = async ({ changedOnly = false } = {}) => {
   try {
-    const { players = [], failed = [] } = await fantasyProsService.scrapeRosRankings();
+    const {
+      players = [],
+      failed = [],
+      unchanged = [],
+      db: dbChanges,
+      metrics
+    } = await fantasyProsService.scrapeRosRankings({
+      dbPath,
+      formats: fantasyProsService.getScoringFormats(),
+      changedOnly
+    });
 
-    if (!players.length) {
+    // Pages skipped as unchanged keep their rows, so an empty changed-only
+    // run is a successful no-op rather than a failed scrape
+    if (!players.length && !unchanged.length) {
       logger.warn('No ROS rankings retrieved', { failedCount: failed.length });
       const error = new Error('No ROS rankings retrieved.');
       error.failed = failed;
       throw error;
     }
 
-    await runAsync('DELETE FROM ros_rankings');
-    const stmt = db.prepare(
-      'INSERT INTO ros_rankings (player_name, team, position, proj_pts, sos_season, sos_playoffs) VALUES (?, ?, ?, ?, ?, ?)'
-    );
-    players.forEach(p => {
-      stmt.run(p.player_name, p.team, p.position, p.proj_pts, p.sos_season, p.sos_playoffs);
+    // The scraper applies its diff to ros_rankings in one transaction; a
+    // result without that report means nothing was written
+    if (players.length && !dbChanges) {
+      throw new Error('ROS scraper did not report writing ros_rankings.');
+    }
+    logger.info('Updated ROS rankings', {
+      playerCount: players.length,
+      unchangedPages: unchanged.length || undefined,
+      ...dbChanges,
+      metrics
     });
-    stmt.finalize();
-    logger.info('Updated ROS rankings', { playerCount: players.length });
 
     const lastUpdatedRow = await getAsync('SELECT MAX(updated_at) AS last_updated FROM ros_rankings');
     const lastUpdated = normalizeSqliteTimestamp(lastUpdatedRow?.last_updated) || new Date().toISOString();
@@ -1112,7 +1151,7 @@ const refreshRosRankings = async () => {
       });
     }
 
-    return { updated: players.length, failed, lastUpdated };
+    return { updated: players.length, failed, unchanged, lastUpdated };
   } catch (err) {
     const failureDetails = Array.isArray(err?.failed) ? err.failed : [];
     logger.error('Failed to refresh ROS rankings', {
@@ -1410,14 +1449,19 @@ app.get('/api/managers', async (req, res) => {
 // Get ROS rankings
 app.get('/api/ros-rankings', async (req, res) => {
   try {
+    const scoringFormat = req.query.format || fantasyProsService.DEFAULT_SCORING_FORMAT;
     const [rows, lastUpdatedRow] = await Promise.all([
       allAsync(
-        'SELECT player_name, team, position, proj_pts, sos_season, sos_playoffs FROM ros_rankings ORDER BY player_name'
+        'SELECT player_name, player_id, team, position, proj_pts, sos_season, sos_playoffs FROM ros_rankings WHERE scoring_format = ? ORDER BY player_name',
+        [scoringFormat]
       ),
-      getAsync('SELECT MAX(updated_at) AS last_updated FROM ros_rankings')
+      getAsync(
+        'SELECT MAX(updated_at) AS last_updated FROM ros_rankings WHERE scoring_format = ?',
+        [scoringFormat]
+      )
     ]);
     const lastUpdated = normalizeSqliteTimestamp(lastUpdatedRow?.last_updated);
-    res.json({ rankings: rows, lastUpdated });
+    res.json({ rankings: rows, lastUpdated, scoringFormat });
   } catch (err) {
     res.status(500).json({ error: err.message });
   }
@@ -2487,6 +2531,8 @@ module.exports = app;
 process.on('SIGINT', () => {
   logger.info('Shutting down gracefully...');
 
+  fantasyProsService.stopRosScraperWorker();
+
   // Close WebSocket connections
   if (io) {
     io.close(() => {
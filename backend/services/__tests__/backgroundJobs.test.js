@@ -12,6 +12,7 @@ test('schedules recurring jobs and triggers initial refresh', async () => {
   };
 
   let rosRefreshCount = 0;
+  const rosRefreshOptions = [];
   let sleeperSyncCount = 0;
   let summaryRefreshCount = 0;
   let previewRefreshCount = 0;
@@ -19,8 +20,9 @@ test('schedules recurring jobs and triggers initial refresh', async () => {
   const logger = { error: () => {} };
 
   scheduleBackgroundJobs({
-    refreshRosRankings: async () => {
+    refreshRosRankings: async options => {
       rosRefreshCount += 1;
+      rosRefreshOptions.push(options);
     },
     syncCurrentSeasonFromSleeper: async () => {
       sleeperSyncCount += 1;
@@ -38,11 +40,15 @@ test('schedules recurring jobs and triggers initial refresh', async () => {
   // Allow the initial invocation to run
   await new Promise(setImmediate);
   assert.strictEqual(rosRefreshCount, 1);
+  assert.deepStrictEqual(rosRefreshOptions, [{ changedOnly: true }]);
   assert.deepStrictEqual(
     scheduled.map(job => job.expression),
     ['0 3 * * *', '55 3 * * 2', '0 4 * * 2']
   );
 
+  await scheduled[0].task();
+  assert.deepStrictEqual(rosRefreshOptions, [{ changedOnly: true }, { changedOnly: true }]);
+
   await scheduled[1].task();
   assert.strictEqual(sleeperSyncCount, 1);
 
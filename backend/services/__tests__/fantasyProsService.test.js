@@ -0,0 +1,102 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('node:fs');
+const os = require('node:os');
+const path = require('node:path');
+const { RosScraperWorker, getScoringFormats, scrapeRosRankings } = require('../fantasyProsService');
+
+// Stand-in for `fp_ros_scraper.py --serve` that answers on stdout
+const FAKE_WORKER = `
+const readline = require('readline');
+let scrapes = 0;
+readline.createInterface({ input: process.stdin }).on('line', line => {
+  const request = JSON.parse(line);
+  let response;
+  if (request.cmd === 'scrape') {
+    scrapes += 1;
+    response = {
+      ok: true,
+      players: [{
+        player_name: 'P' + scrapes,
+        pid: process.pid,
+        formats: request.formats,
+        positions: request.positions
+      }],
+      unchanged: request.changed_only ? [{ position: 'DST', changed_at: '2025-10-01T07:00:00+00:00' }] : undefined,
+      failed: []
+    };
+  } else if (request.cmd === 'crash') {
+    process.exit(3);
+  } else {
+    response = { ok: false, error: 'Unknown command: ' + request.cmd };
+  }
+  process.stdout.write(JSON.stringify({ id: request.id, ...response }) + '\\n');
+});
+`;
+
+function createWorker(t) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'ros-worker-'));
+  const script = path.join(dir, 'worker.js');
+  fs.writeFileSync(script, FAKE_WORKER);
+  const worker = new RosScraperWorker({
+    python: process.execPath,
+    script,
+    logger: { error: () => {} }
+  });
+  t.after(() => {
+    worker.stop();
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+  return worker;
+}
+
+test('reuses one worker process across scrapes', async t => {
+  const worker = createWorker(t);
+
+  const first = await scrapeRosRankings({ worker });
+  const second = await scrapeRosRankings({ worker });
+
+  assert.strictEqual(first.players[0].player_name, 'P1');
+  assert.strictEqual(second.players[0].player_name, 'P2');
+  assert.strictEqual(first.players[0].pid, second.players[0].pid);
+  assert.deepStrictEqual(second.failed, []);
+});
+
+test('rejects failed commands and restarts after the worker exits', async t => {
+  const worker = createWorker(t);
+
+  await assert.rejects(worker.request({ cmd: 'bogus' }), /Unknown command: bogus/);
+  await assert.rejects(worker.request({ cmd: 'crash' }), /exited \(code 3/);
+
+  const { players } = await scrapeRosRankings({ worker });
+  assert.strictEqual(players[0].player_name, 'P1');
+});
+
+test('sends the requested scoring formats with each scrape', async t => {
+  const worker = createWorker(t);
+
+  const { players } = await scrapeRosRankings({ worker, formats: ['half', 'ppr'] });
+  assert.deepStrictEqual(players[0].formats, ['half', 'ppr']);
+});
+
+test('sends a position subset and changed-only flag with each scrape', async t => {
+  const worker = createWorker(t);
+
+  const full = await scrapeRosRankings({ worker });
+  assert.strictEqual(full.players[0].positions, undefined);
+  assert.deepStrictEqual(full.unchanged, []);
+
+  const { players, unchanged } = await scrapeRosRankings({
+    worker,
+    positions: ['WR', 'DST'],
+    changedOnly: true
+  });
+  assert.deepStrictEqual(players[0].positions, ['WR', 'DST']);
+  assert.deepStrictEqual(unchanged.map(page => page.position), ['DST']);
+});
+
+test('parses ROS_SCORING_FORMATS and falls back to half PPR', () => {
+  assert.deepStrictEqual(getScoringFormats('PPR, standard,ppr,bogus'), ['ppr', 'standard']);
+  assert.deepStrictEqual(getScoringFormats(''), ['half']);
+  assert.deepStrictEqual(getScoringFormats(undefined), ['half']);
+});
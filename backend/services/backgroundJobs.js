@@ -37,13 +37,16 @@ function scheduleBackgroundJobs({
   };
 
   if (typeof refreshRosRankings === 'function') {
+    // Unattended refreshes only re-scrape pages whose content changed
+    const refreshChangedRosRankings = () => refreshRosRankings({ changedOnly: true });
+
     if (runInitialRosRefresh) {
-      safeInvoke(refreshRosRankings, 'Initial ROS rankings refresh failed');
+      safeInvoke(refreshChangedRosRankings, 'Initial ROS rankings refresh failed');
     }
 
     const rosJob = resolvedScheduler.schedule(
       '0 3 * * *',
-      () => safeInvoke(refreshRosRankings, 'Scheduled ROS rankings refresh failed'),
+      () => safeInvoke(refreshChangedRosRankings, 'Scheduled ROS rankings refresh failed'),
       { timezone }
     );
     jobs.push(rosJob);
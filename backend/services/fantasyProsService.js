@@ -1,12 +1,154 @@
-const { execFile } = require('child_process');
+const { execFile, spawn } = require('child_process');
 const path = require('path');
+const readline = require('readline');
+const { ROS_RANKINGS } = require('../utils/constants');
 
 const PYTHON = process.env.PYTHON || 'python3';
+const SCRIPT = path.join(__dirname, '..', 'scripts', 'fp_ros_scraper.py');
+const REQUEST_TIMEOUT_MS = 300000;
+const { SCORING_FORMATS, DEFAULT_SCORING_FORMAT } = ROS_RANKINGS;
 
-async function scrapeRosRankings() {
-  const script = path.join(__dirname, '..', 'scripts', 'fp_ros_scraper.py');
+/**
+ * Scoring formats to refresh, from ROS_SCORING_FORMATS (e.g. "half,ppr").
+ * Unknown entries are dropped; an empty result falls back to half PPR.
+ */
+function getScoringFormats(value = process.env.ROS_SCORING_FORMATS) {
+  const formats = (value || '')
+    .split(',')
+    .map(format => format.trim().toLowerCase())
+    .filter(format => SCORING_FORMATS.includes(format));
+  return formats.length ? [...new Set(formats)] : [DEFAULT_SCORING_FORMAT];
+}
+
+/**
+ * Long-lived `fp_ros_scraper.py --serve` process. Interpreter startup,
+ * imports, the HTTP connection pool and learned extraction plans are paid
+ * for once, so a refresh only costs network time. Commands and responses
+ * are newline-delimited JSON matched up by id.
+ */
+class RosScraperWorker {
+  constructor({
+    python = PYTHON,
+    script = SCRIPT,
+    args = [],
+    timeoutMs = REQUEST_TIMEOUT_MS,
+    logger = console
+  } = {}) {
+    this.python = python;
+    this.script = script;
+    this.args = args;
+    this.timeoutMs = timeoutMs;
+    this.logger = logger;
+    this.child = null;
+    this.nextId = 0;
+    this.pending = new Map();
+  }
+
+  start() {
+    if (this.child) {
+      return;
+    }
+
+    const child = spawn(this.python, [this.script, '--serve', ...this.args], {
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    this.child = child;
+
+    readline.createInterface({ input: child.stdout }).on('line', line => this.handleLine(line));
+    child.stderr.on('data', chunk => {
+      this.logger.error?.('ROS scraper worker:', chunk.toString().trim());
+    });
+    child.on('error', err => this.handleExit(err));
+    child.on('exit', (code, signal) => {
+      this.handleExit(new Error(`ROS scraper worker exited (code ${code}, signal ${signal})`));
+    });
+  }
+
+  handleLine(line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (err) {
+      this.logger.error?.('Failed to parse ROS scraper worker output:', line);
+      return;
+    }
+
+    const entry = this.pending.get(response.id);
+    if (!entry) {
+      return;
+    }
+    this.pending.delete(response.id);
+    clearTimeout(entry.timer);
+
+    if (response.ok) {
+      entry.resolve(response);
+    } else {
+      entry.reject(new Error(response.error || 'ROS scraper worker command failed'));
+    }
+  }
+
+  handleExit(error) {
+    if (!this.child) {
+      return;
+    }
+    this.child = null;
+    for (const { reject, timer } of this.pending.values()) {
+      clearTimeout(timer);
+      reject(error);
+    }
+    this.pending.clear();
+  }
+
+  request(command) {
+    this.start();
+    const id = ++this.nextId;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`ROS scraper worker timed out after ${this.timeoutMs}ms`));
+        // A hung worker cannot be trusted with the next command
+        this.stop();
+      }, this.timeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      this.child.stdin.write(`${JSON.stringify({ ...command, id })}\n`);
+    });
+  }
+
+  stop() {
+    const { child } = this;
+    if (!child) {
+      return;
+    }
+    this.handleExit(new Error('ROS scraper worker stopped'));
+    child.stdin.end();
+    child.kill();
+  }
+}
+
+let sharedWorker = null;
+
+function getWorker(args = []) {
+  if (sharedWorker && sharedWorker.args.join('\0') !== args.join('\0')) {
+    stopRosScraperWorker();
+  }
+  if (!sharedWorker) {
+    sharedWorker = new RosScraperWorker({ args });
+  }
+  return sharedWorker;
+}
+
+function stopRosScraperWorker() {
+  if (sharedWorker) {
+    sharedWorker.stop();
+    sharedWorker = null;
+  }
+}
+
+function scrapeRosRankingsOnce(args = []) {
   return new Promise((resolve, reject) => {
-    execFile(PYTHON, [script, '--json'], { timeout: 300000 }, (err, stdout, stderr) => {
+    execFile(PYTHON, [SCRIPT, '--json', ...args], { timeout: REQUEST_TIMEOUT_MS }, (err, stdout, stderr) => {
       if (err) {
         console.error('ROS scraper failed:', stderr.toString());
         reject(err);
@@ -16,7 +158,8 @@ async function scrapeRosRankings() {
         const data = JSON.parse(stdout.toString());
         const players = Array.isArray(data.players) ? data.players : [];
         const failed = Array.isArray(data.failed) ? data.failed : [];
-        resolve({ players, failed });
+        const unchanged = Array.isArray(data.unchanged) ? data.unchanged : [];
+        resolve({ players, failed, unchanged, db: data.db, metrics: data.metrics });
       } catch (parseErr) {
         console.error('Failed to parse ROS scraper output:', parseErr);
         reject(parseErr);
@@ -25,4 +168,85 @@ async function scrapeRosRankings() {
   });
 }
 
-module.exports = { scrapeRosRankings };
+/**
+ * Scrape ROS rankings for every format in `formats` in one pass; each player
+ * row carries its `scoring_format`. With `dbPath` the Python side also syncs
+ * ros_rankings in one transaction and `db` holds its { added, changed,
+ * removed } counts.
+ * Setting ROS_SNAPSHOT_DIR also appends every run to the snapshot history.
+ * ROS_SCHEDULE_FILE plus ROS_POINTS_ALLOWED_FILE fill sos_season and
+ * sos_playoffs (ROS_SOS_FROM_WEEK drops weeks already played). Player ids
+ * are resolved against keepers in `dbPath`, plus ROS_SLEEPER_PLAYERS_FILE
+ * when set, and cached in ROS_IDENTITY_MAP.
+ * `positions` limits the scrape to a subset (all positions by default).
+ * With `changedOnly`, pages whose fingerprint in ROS_CACHE_DIR still holds
+ * are skipped and keep their rows; they come back in `unchanged` with the
+ * time they last changed, and `players` only holds the changed pages.
+ * `metrics` carries per-position stage timings and counters.
+ */
+async function scrapeRosRankings({
+  worker,
+  dbPath,
+  formats = [DEFAULT_SCORING_FORMAT],
+  positions,
+  changedOnly = false
+} = {}) {
+  const args = ['--formats', formats.join(',')];
+  if (dbPath) {
+    args.push('--db', dbPath);
+  }
+  if (process.env.ROS_CACHE_DIR) {
+    args.push('--cache-dir', process.env.ROS_CACHE_DIR);
+  }
+  if (process.env.ROS_SNAPSHOT_DIR) {
+    args.push('--snapshot-dir', process.env.ROS_SNAPSHOT_DIR);
+  }
+  if (process.env.ROS_SLEEPER_PLAYERS_FILE) {
+    args.push('--sleeper-players', process.env.ROS_SLEEPER_PLAYERS_FILE);
+  }
+  if (process.env.ROS_IDENTITY_MAP) {
+    args.push('--identity-map', process.env.ROS_IDENTITY_MAP);
+  }
+  if (process.env.ROS_SCHEDULE_FILE && process.env.ROS_POINTS_ALLOWED_FILE) {
+    args.push(
+      '--schedule', process.env.ROS_SCHEDULE_FILE,
+      '--points-allowed', process.env.ROS_POINTS_ALLOWED_FILE
+    );
+    if (process.env.ROS_SOS_FROM_WEEK) {
+      args.push('--sos-from-week', process.env.ROS_SOS_FROM_WEEK);
+    }
+  }
+  if (!worker && process.env.ROS_SCRAPER_WORKER === 'false') {
+    const runArgs = [...args];
+    if (positions?.length) {
+      runArgs.push('--positions', positions.join(','));
+    }
+    if (changedOnly) {
+      runArgs.push('--changed-only');
+    }
+    return scrapeRosRankingsOnce(runArgs);
+  }
+
+  const command = { cmd: 'scrape', formats };
+  if (positions?.length) {
+    command.positions = positions;
+  }
+  if (changedOnly) {
+    command.changed_only = true;
+  }
+  const data = await (worker || getWorker(args)).request(command);
+  const players = Array.isArray(data.players) ? data.players : [];
+  const failed = Array.isArray(data.failed) ? data.failed : [];
+  const unchanged = Array.isArray(data.unchanged) ? data.unchanged : [];
+  return { players, failed, unchanged, db: data.db, metrics: data.metrics };
+}
+
+module.exports = {
+  DEFAULT_SCORING_FORMAT,
+  SCORING_FORMATS,
+  RosScraperWorker,
+  getScoringFormats,
+  scrapeRosRankings,
+  scrapeRosRankingsOnce,
+  stopRosScraperWorker
+};
@@ -48,6 +48,12 @@ const FANTASY = {
   DEFAULT_POLLING_INTERVAL_MS: 30000 // 30 seconds for live updates
 };
 
+// ROS Rankings (FantasyPros scoring formats scraped into ros_rankings)
+const ROS_RANKINGS = {
+  SCORING_FORMATS: ['standard', 'half', 'ppr'],
+  DEFAULT_SCORING_FORMAT: 'half'
+};
+
 // Database
 const DATABASE = {
   MAX_RETRIES: 3,
@@ -94,6 +100,7 @@ module.exports = {
   SLEEPER,
   ESPN,
   FANTASY,
+  ROS_RANKINGS,
   DATABASE,
   UPLOAD,
   HTTP_STATUS,